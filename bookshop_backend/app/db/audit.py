@@ -0,0 +1,276 @@
+"""
+Audit trail for ORM writes.
+
+A before_flush listener on every Session diffs new, dirty and deleted tenant-scoped
+objects into AuditLog rows. The rows are held on the session until its transaction
+commits (dropped on rollback), then handed to AuditWriter, which inserts them in
+multi-row batches from a background task. Request paths never wait on the audit insert.
+
+Core statements (update(), insert().on_conflict..., delete()) bypass the ORM unit of
+work, so the repositories that issue them record their writes with audit_core_write,
+which queues entries the same way.
+"""
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Union
+import asyncio
+import os
+import uuid
+
+from sqlalchemy import Table, event, inspect as sa_inspect
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .base import async_session_maker
+from .models.audit_logs import AuditLog
+from .models.tenants import Tenant
+
+logger = getLogger(__name__)
+
+# Flush when this many entries are buffered, or this long after the first one arrived
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_MS = int(os.getenv("AUDIT_FLUSH_MS", "500"))
+
+# Set per request by AuditContextMiddleware; None for system writes
+audit_user_id: ContextVar[Optional[uuid.UUID]] = ContextVar("audit_user_id", default=None)
+
+PENDING_KEY = "audit_pending"
+
+# Credentials are recorded as changed but never copied into the log
+REDACTED_COLUMNS = {"password", "otp", "code_hash", "totp_secret", "public_key", "credential_id"}
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _snapshot_value(key: str, value: Any) -> Any:
+    return "[redacted]" if key in REDACTED_COLUMNS else _json_value(value)
+
+
+def _log_row(tenant_id: Optional[uuid.UUID], table_name: str, record_id: uuid.UUID, action: str,
+             changed: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "user_id": audit_user_id.get(),
+        "table_name": table_name,
+        "record_id": record_id,
+        "action": action,
+        "changed_data": changed or None,
+        "created_at": datetime.now(),
+    }
+
+
+def _audit_entry(obj: Any, action: str) -> Optional[Dict[str, Any]]:
+    """
+    AuditLog row for one instance, or None if it is not tenant-scoped or its key does not
+    start with a UUID. Partitioned tables key on (id, created_at); the id is recorded.
+    """
+    if isinstance(obj, AuditLog):
+        return None
+    tenant_id = obj.id if isinstance(obj, Tenant) else getattr(obj, "tenant_id", None)
+    state = sa_inspect(obj)
+    identity = state.mapper.primary_key_from_instance(obj)
+    if tenant_id is None or not isinstance(identity[0], uuid.UUID):
+        return None
+
+    changed: Dict[str, Any] = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        redacted = attr.key in REDACTED_COLUMNS
+        if action == "update":
+            if history.has_changes():
+                old = history.deleted[0] if history.deleted else None
+                new = history.added[0] if history.added else None
+                changed[attr.key] = "[redacted]" if redacted else {"old": _json_value(old), "new": _json_value(new)}
+        elif attr.key in state.dict:
+            # Snapshot of what was inserted or deleted; never triggers a load
+            changed[attr.key] = _snapshot_value(attr.key, state.dict[attr.key])
+    if action == "update" and not changed:
+        return None
+
+    return _log_row(tenant_id, state.mapper.local_table.name, identity[0], action, changed)
+
+
+def audit_core_write(
+    session: Union[Session, AsyncSession],
+    table: Table,
+    tenant_id: uuid.UUID,
+    record_id: uuid.UUID,
+    action: str,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Record a write made with a Core statement, which the before_flush listener never
+    sees. An update is logged as the columns of `new` that differ from `old` (nothing if
+    none do), a delete as `old` and anything else as `new`. The entry is held and
+    released with the session's transaction like captured ones.
+    """
+    if action == "update":
+        old = old or {}
+        changed = {
+            key: "[redacted]" if key in REDACTED_COLUMNS else {"old": _json_value(old.get(key)), "new": _json_value(value)}
+            for key, value in (new or {}).items() if old.get(key) != value
+        }
+        if not changed:
+            return
+    else:
+        snapshot = (old if action == "delete" else new) or {}
+        changed = {key: _snapshot_value(key, value) for key, value in snapshot.items()}
+    session.info.setdefault(PENDING_KEY, []).append(_log_row(tenant_id, table.name, record_id, action, changed))
+
+
+def _capture_changes(session: Session, flush_context, instances) -> None:
+    pending: List[Dict[str, Any]] = session.info.setdefault(PENDING_KEY, [])
+    # A deleted tenant and the rows deleted with it are logged without the tenant, which
+    # the log's foreign key could no longer point at; the snapshot still has its id
+    deleted_tenants = {obj.id for obj in session.deleted if isinstance(obj, Tenant)}
+    for action, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if action == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            entry = _audit_entry(obj, action)
+            if entry is not None:
+                if entry["tenant_id"] in deleted_tenants:
+                    entry["tenant_id"] = None
+                pending.append(entry)
+
+
+def _release_pending(session: Session) -> None:
+    entries = session.info.pop(PENDING_KEY, None)
+    if entries:
+        audit_writer.enqueue(entries)
+
+
+def _discard_pending(session: Session, *args) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+def register_audit_events() -> None:
+    if not event.contains(Session, "before_flush", _capture_changes):
+        event.listen(Session, "before_flush", _capture_changes)
+        event.listen(Session, "after_commit", _release_pending)
+        event.listen(Session, "after_rollback", _discard_pending)
+
+
+class AuditWriter:
+    """Buffers audit rows in an asyncio queue and inserts them in batches"""
+
+    def __init__(self, batch_size: int = AUDIT_BATCH_SIZE, flush_ms: int = AUDIT_FLUSH_MS):
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: List[Dict[str, Any]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        register_audit_events()
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, entries: List[Dict[str, Any]]) -> None:
+        # Called from after_commit on the event loop thread; a no-op when the writer is
+        # not running (scripts, tests)
+        if self.queue is None:
+            return
+        for entry in entries:
+            self.queue.put_nowait(entry)
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        # Collected straight into _inflight so a cancelled wait loses nothing
+        batch = self._inflight = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _insert(self, batch: List[Dict[str, Any]]) -> None:
+        async with async_session_maker() as session:
+            await session.execute(pg_insert(AuditLog.__table__).values(batch).on_conflict_do_nothing())
+            await session.commit()
+
+    async def _insert_or_drop(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch. If the database rejects its contents, which no retry will change,
+        insert it row by row and drop the rows that are still rejected.
+        """
+        try:
+            await self._insert(batch)
+        except (IntegrityError, DataError) as e:
+            if len(batch) == 1:
+                logger.error(f"Dropping audit entry {batch[0]['id']} rejected by the database: {e}")
+                return
+            logger.error(f"Audit batch of {len(batch)} entries rejected, writing them one by one: {e}")
+            for entry in batch:
+                await self._insert_or_drop([entry])
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch, retrying with backoff; inserts are idempotent on the entry id"""
+        delay = 0.5
+        while True:
+            try:
+                await self._insert_or_drop(batch)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} audit entries, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def _run(self) -> None:
+        while True:
+            self._inflight = await self._next_batch()
+            await self._write(self._inflight)
+            self._inflight = []
+
+    async def stop(self) -> None:
+        """Stop the background task and write everything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # A batch interrupted mid-write is written again; duplicates are ignored
+        remaining, self._inflight = self._inflight, []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        for start in range(0, len(remaining), self.batch_size):
+            try:
+                await self._insert_or_drop(remaining[start:start + self.batch_size])
+            except Exception as e:
+                logger.error(f"Failed to drain {len(remaining) - start} audit entries on shutdown: {e}")
+                break
+        self.queue = None
+
+
+audit_writer = AuditWriter()
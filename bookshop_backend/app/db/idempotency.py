@@ -0,0 +1,145 @@
+"""
+Idempotency keys for POSTs that clients retry (sales from tills, payment intents).
+
+A client sends an Idempotency-Key header; the first request under that key runs and its
+result is stored with the key, later ones get the stored result back without running
+again. Keys live in the idempotencykey table rather than Redis so that claiming the key,
+the operation's writes and the stored result commit in one transaction: a retry can
+never see a sale without its key, or a key whose sale was rolled back.
+
+Claiming is a single INSERT ... ON CONFLICT on the primary key. A concurrent retry blocks
+on the row until the first request commits, then finds the stored result; if the first
+request fails its transaction rolls back, the key with it, and the retry runs afresh.
+Failed results are therefore never replayed. Keys expire after IDEMPOTENCY_TTL_HOURS and
+are purged periodically; an expired key that has not been purged yet is reclaimed.
+"""
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Optional
+import hashlib
+import json
+import os
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import delete, null
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from . import models
+from .unit_of_work import UnitOfWork
+from ..utils.date_ranges import utc_now
+from ..utils.result import ServiceResult
+
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+KEY_REUSED_ERROR = "Idempotency key was already used for a different request"
+
+
+def request_hash(payload: Any) -> str:
+    """
+    Stable digest of a request body, so a key reused for another request is caught.
+    Parsed models only contribute the fields the client sent: server-filled defaults
+    such as a sale_date of now differ between a request and its retry.
+    """
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def claim(self, tenant_id: uuid.UUID, scope: str, key: str, digest: str) -> Optional[models.IdempotencyKey]:
+        """
+        Take the key for this request. Returns None if it was free (or expired), otherwise
+        the existing record holding the earlier request's hash and result.
+        """
+        now = utc_now()
+        table = models.IdempotencyKey.__table__
+        stmt = pg_insert(table).values(
+            tenant_id=tenant_id, scope=scope, key=key, request_hash=digest,
+            created_at=now, expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.tenant_id, table.c.scope, table.c.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "response": null(),
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=table.c.expires_at < now
+        ).returning(table.c.key)
+        result = await self.db.execute(stmt)
+        if result.first() is not None:
+            return None
+
+        result = await self.db.execute(
+            select(models.IdempotencyKey).where(
+                models.IdempotencyKey.tenant_id == tenant_id,
+                models.IdempotencyKey.scope == scope,
+                models.IdempotencyKey.key == key
+            )
+        )
+        return result.scalar_one()
+
+    async def save_response(self, tenant_id: uuid.UUID, scope: str, key: str, response: Any) -> None:
+        table = models.IdempotencyKey.__table__
+        await self.db.execute(
+            table.update().where(
+                table.c.tenant_id == tenant_id,
+                table.c.scope == scope,
+                table.c.key == key
+            ).values(response=jsonable_encoder(response))
+        )
+
+    async def purge_expired(self) -> int:
+        result = await self.db.execute(
+            delete(models.IdempotencyKey).where(models.IdempotencyKey.expires_at < utc_now())
+        )
+        return result.rowcount
+
+
+async def run_idempotent(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    scope: str,
+    key: Optional[str],
+    payload: Any,
+    operation: Callable[[], Awaitable[ServiceResult]]
+) -> ServiceResult:
+    """
+    Run `operation` at most once per key. The operation's own unit of work joins this
+    one, so its writes commit together with the stored result. A replayed result comes
+    back with message "replayed".
+    """
+    if key is None:
+        return await operation()
+
+    store = IdempotencyStore(db)
+    digest = request_hash(payload)
+    async with UnitOfWork(db) as uow:
+        existing = await store.claim(tenant_id, scope, key, digest)
+        if existing is not None:
+            if existing.request_hash != digest:
+                uow.rollback_on_exit()
+                return ServiceResult(success=False, error=KEY_REUSED_ERROR)
+            return ServiceResult(success=True, data=existing.response, message="replayed")
+
+        result = await operation()
+        if not result.success:
+            uow.rollback_on_exit()
+            return result
+        await store.save_response(tenant_id, scope, key, result.data)
+        return result
+
+
+async def purge_idempotency_keys(session_maker) -> None:
+    async with session_maker() as session:
+        await IdempotencyStore(session).purge_expired()
+        await session.commit()
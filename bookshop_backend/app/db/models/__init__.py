@@ -19,6 +19,7 @@ from .books import Book
 from .book_editions import BookEdition
 from .inventory import Inventory
 from .receipt_templates import ReceiptTemplates
+from .supplier_catalog import SupplierCatalog
 
 # Import transaction-related models
 from .sales import Sales
@@ -26,6 +27,10 @@ from .sale_items import SaleItems
 from .purchase_orders import PurchaseOrder
 from .purchase_order_items import PurchaseOrderItems
 from .monthly_sales_summary import MonthlySalesSummary
+from .tenant_metrics import TenantMetrics
+from .tenant_metrics_deltas import TenantMetricsDelta
+from .idempotency_keys import IdempotencyKey
+from .payment_intents import PaymentIntent
 
 # Import authentication-related models
 from .webauthn_credentials import WebAuthnCredential
@@ -49,11 +54,16 @@ __all__ = [
     "BookEdition",
     "Inventory",
     "ReceiptTemplates",
+    "SupplierCatalog",
     "Sales",
     "SaleItems",
     "PurchaseOrder",
     "PurchaseOrderItems",
     "MonthlySalesSummary",
+    "TenantMetrics",
+    "TenantMetricsDelta",
+    "IdempotencyKey",
+    "PaymentIntent",
     "WebAuthnCredential",
     "OtpCode",
     "BackUpCodes",
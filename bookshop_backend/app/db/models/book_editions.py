@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index, text
 from typing import Optional, List, TYPE_CHECKING
 import uuid
 from datetime import datetime, date
@@ -30,5 +31,12 @@ class BookEdition(SQLModel, table=True):
     monthly_sales_summaries: List["MonthlySalesSummary"] = Relationship(back_populates="edition")
     purchase_order_items: List["PurchaseOrderItems"] = Relationship(back_populates="edition")
 
+    __table_args__ = (
+        Index("ix_bookedition_isbn_trgm", "isbn_number", postgresql_using="gin", postgresql_ops={"isbn_number": "gin_trgm_ops"}),
+        Index("ix_bookedition_publisher_trgm", "publisher", postgresql_using="gin", postgresql_ops={"publisher": "gin_trgm_ops"}),
+        # Supplier price lists join on this (see supplier_catalog_repository.NORMALISED_ISBN)
+        Index("ix_bookedition_isbn_normalised", text("replace(upper(isbn_number), '-', '')")),
+    )
+
     def __repr__(self):
         return f"BookEdition(id={self.edition_id}, isbn_number={self.isbn_number}, format={self.format})"
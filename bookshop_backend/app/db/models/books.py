@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index, text
 from typing import Optional, List, TYPE_CHECKING
 import uuid
 from datetime import datetime
@@ -13,7 +14,7 @@ class Book(SQLModel, table=True):
     author: str = Field(max_length=255, index=True, nullable=False)
     description: Optional[str] = Field(default=None)
     language: str = Field(max_length=50, default="English")
-    category_id: Optional[uuid.UUID] = Field(default=None, foreign_key="category.category_id")
+    category_id: Optional[uuid.UUID] = Field(default=None, foreign_key="category.category_id", index=True)
     created_at: datetime = Field(default_factory=datetime.now, index=True)
     updated_at: datetime = Field(default_factory=datetime.now, index=True)
 
@@ -21,6 +22,13 @@ class Book(SQLModel, table=True):
     category: Optional["Category"] = Relationship(back_populates="books")
     editions: List["BookEdition"] = Relationship(back_populates="book")
 
+    __table_args__ = (
+        # Full-text and trigram indexes backing /books/search
+        Index("ix_book_search_vector", text("to_tsvector('simple', title || ' ' || author)"), postgresql_using="gin"),
+        Index("ix_book_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_book_author_trgm", "author", postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}),
+    )
+
     def __repr__(self):
         return f"Book(id={self.id}, title={self.title}, author={self.author})"
 
@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import JSON, DateTime
+from datetime import datetime
+import uuid
+from typing import Any, Dict, Optional
+from ...utils.date_ranges import utc_now
+
+class IdempotencyKey(SQLModel, table=True):
+    """Result of a retried POST, replayed by key until it expires (see app/db/idempotency.py)"""
+    tenant_id: uuid.UUID = Field(primary_key=True, foreign_key="tenant.id", ondelete="CASCADE")
+    scope: str = Field(primary_key=True, max_length=50)  # sales, payment_intents
+    key: str = Field(primary_key=True, max_length=255)  # Idempotency-Key header sent by the client
+    request_hash: str = Field(max_length=64, nullable=False)  # sha256 of the request body
+    response: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    created_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True)
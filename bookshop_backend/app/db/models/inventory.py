@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index, UniqueConstraint, text
 from typing import Optional, TYPE_CHECKING
 import uuid
 from datetime import datetime
@@ -28,6 +29,15 @@ class Inventory(SQLModel, table=True):
 
     # Unique constraint on tenant_id and edition_id combination
     __table_args__ = (
+        UniqueConstraint("tenant_id", "edition_id", name="uq_inventory_tenant_edition"),
+        # Keyset pages of GET /books sorted on stock and price; each expression must match
+        # the one BookRepository.list_tenant_books sorts on for the planner to use the index
+        Index("ix_inventory_tenant_available", "tenant_id", text("(quantity_on_hand - quantity_reserved)"), "edition_id"),
+        Index("ix_inventory_tenant_sale_price", "tenant_id", text("(cost_price * (1 + profit) * (1 - discount))"), "edition_id"),
+        Index(
+            "ix_inventory_tenant_stock_value", "tenant_id",
+            text("((quantity_on_hand - quantity_reserved) * cost_price * (1 + profit) * (1 - discount))"), "edition_id"
+        ),
         {"sqlite_autoincrement": True},
     )
 
@@ -0,0 +1,24 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import DateTime, Index
+from datetime import datetime
+import uuid
+from typing import Optional
+from decimal import Decimal
+from ...utils.date_ranges import utc_now
+
+class PaymentIntent(SQLModel, table=True):
+    """A customer payment the till has asked for, before the provider confirms it"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    tenant_id: uuid.UUID = Field(foreign_key="tenant.id", ondelete="CASCADE", nullable=False)
+    provider: str = Field(max_length=20, default="mpesa_qr")
+    amount: Decimal = Field(max_digits=10, decimal_places=2, gt=0)
+    phone_number: str = Field(max_length=15)
+    status: str = Field(max_length=20, default="pending")  # pending, paid, failed, expired
+    # Not a foreign key: superadmins creating intents have no user row
+    created_by: Optional[uuid.UUID] = Field(default=None)
+    created_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
+    updated_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_paymentintent_tenant_created_at", "tenant_id", "created_at"),
+    )
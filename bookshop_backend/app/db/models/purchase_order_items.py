@@ -1,6 +1,7 @@
 from sqlmodel import Field, SQLModel, Relationship
 from typing import Optional, TYPE_CHECKING
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
 if TYPE_CHECKING:
@@ -9,10 +10,12 @@ if TYPE_CHECKING:
 
 class PurchaseOrderItems(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    po_id: uuid.UUID = Field(foreign_key="purchaseorder.id", nullable=False)
+    po_id: uuid.UUID = Field(foreign_key="purchaseorder.id", nullable=False, index=True)
     edition_id: uuid.UUID = Field(foreign_key="bookedition.edition_id", nullable=False)
     quantity_ordered: int = Field(gt=0, nullable=False)
+    quantity_received: int = Field(default=0, ge=0, nullable=False)  # Running total across partial receipts
     unit_cost: Decimal = Field(max_digits=10, decimal_places=2, gt=0, nullable=False)
+    received_at: Optional[datetime] = Field(default=None)  # Latest delivery against this line
 
     # Relationships
     purchase_order: Optional["PurchaseOrder"] = Relationship(back_populates="purchase_order_items")
@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index
 from datetime import datetime, timedelta
 from typing import Optional, List, TYPE_CHECKING
 import uuid
@@ -16,8 +17,10 @@ class PurchaseOrder(SQLModel, table=True):
     order_number: str = Field(max_length=20, nullable=False, index=True, unique=True)  # Format: A0001, A0002, etc.
     order_date: datetime = Field(default_factory=datetime.now, index=True)
     expected_delivery_date: datetime = Field(default_factory=lambda: datetime.now() + timedelta(days=5), index=True)
-    status: str = Field(max_length=20, default="pending")  # pending, received, cancelled, partial, completed
+    status: str = Field(max_length=20, default="pending")  # draft, pending, received, cancelled, partial, completed
     total_amount: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2, ge=0)
+    first_received_at: Optional[datetime] = Field(default=None)  # First delivery against the order
+    received_at: Optional[datetime] = Field(default=None)  # Delivery that completed the order
     created_at: datetime = Field(default_factory=datetime.now, index=True)
     updated_at: datetime = Field(default_factory=datetime.now, index=True)
 
@@ -26,5 +29,10 @@ class PurchaseOrder(SQLModel, table=True):
     supplier: Optional["Supplier"] = Relationship(back_populates="purchase_orders")
     purchase_order_items: List["PurchaseOrderItems"] = Relationship(back_populates="purchase_order", cascade_delete=True)
 
+    __table_args__ = (
+        # Supplier performance and purchase history over a trailing window
+        Index("ix_purchaseorder_tenant_order_date", "tenant_id", "order_date"),
+    )
+
     def __repr__(self):
         return f"PurchaseOrder(id={self.id}, order_number={self.order_number}, tenant_id={self.tenant_id}, supplier_id={self.supplier_id}, status={self.status})"
\ No newline at end of file
@@ -1,6 +1,8 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import DateTime, ForeignKeyConstraint
 from typing import Optional, TYPE_CHECKING
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
 if TYPE_CHECKING:
@@ -9,7 +11,9 @@ if TYPE_CHECKING:
 
 class SaleItems(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    sale_id: uuid.UUID = Field(foreign_key="sales.id", nullable=False)
+    sale_id: uuid.UUID = Field(nullable=False, index=True)
+    # The parent sale's created_at: lines are partitioned by it, alongside their sale
+    sale_created_at: datetime = Field(primary_key=True, sa_type=DateTime(timezone=True))
     edition_id: uuid.UUID = Field(foreign_key="bookedition.edition_id", nullable=False)
     isbn: str = Field(max_length=20, nullable=False)
     title: str = Field(max_length=255, nullable=False)
@@ -24,5 +28,13 @@ class SaleItems(SQLModel, table=True):
     sale: "Sales" = Relationship(back_populates="sale_items")
     edition: "BookEdition" = Relationship(back_populates="sale_items")
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["sale_id", "sale_created_at"], ["sales.id", "sales.created_at"],
+            name="saleitems_sale_fkey", ondelete="CASCADE"
+        ),
+        {"postgresql_partition_by": "RANGE (sale_created_at)"},
+    )
+
     def __repr__(self):
         return f"SaleItems(id={self.id}, sale_id={self.sale_id}, edition_id={self.edition_id}, quantity_sold={self.quantity_sold})"
\ No newline at end of file
@@ -1,8 +1,10 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import DateTime, Index
 from typing import Optional, List, TYPE_CHECKING
 import uuid
 from datetime import datetime
 from decimal import Decimal
+from ...utils.date_ranges import utc_now
 
 if TYPE_CHECKING:
     from .tenants import Tenant
@@ -11,7 +13,7 @@ if TYPE_CHECKING:
 class Sales(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(foreign_key="tenant.id", nullable=False)
-    sale_date: datetime = Field(default_factory=datetime.now, index=True)
+    sale_date: datetime = Field(default_factory=utc_now, index=True, sa_type=DateTime(timezone=True))
     payment_method: str = Field(max_length=50, default="cash")  # cash, card, mpesa
     amount_received: Optional[Decimal] = Field(default=None, max_digits=10, decimal_places=2, ge=0)
     change_given: Optional[Decimal] = Field(default=None, max_digits=10, decimal_places=2, ge=0)
@@ -20,12 +22,21 @@ class Sales(SQLModel, table=True):
     customer_name: Optional[str] = Field(default=None, max_length=100)
     customer_phone: Optional[str] = Field(default=None, max_length=15)
     customer_email: Optional[str] = Field(default=None, max_length=100)
-    created_at: datetime = Field(default_factory=datetime.now, index=True)
-    updated_at: datetime = Field(default_factory=datetime.now, index=True)
+    # Partition key (monthly ranges), so it is part of the primary key
+    created_at: datetime = Field(default_factory=utc_now, primary_key=True, index=True, sa_type=DateTime(timezone=True))
+    updated_at: datetime = Field(default_factory=utc_now, index=True, sa_type=DateTime(timezone=True))
 
     # Relationships
     tenant: "Tenant" = Relationship(back_populates="sales")
     sale_items: List["SaleItems"] = Relationship(back_populates="sale", cascade_delete=True)
+
+    __table_args__ = (
+        # Keyset scans of a tenant's sales by date (ledger export, reports)
+        Index("ix_sales_tenant_sale_date", "tenant_id", "sale_date", "id"),
+        # Latest sale per tenant for the tenant metrics reconcile
+        Index("ix_sales_tenant_created_at", "tenant_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     def __repr__(self):
         return f"Sales(id={self.id}, tenant_id={self.tenant_id}, sale_date={self.sale_date}, total_amount={self.total_amount})"
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlmodel import SQLModel, Field, Relationship
+from datetime import datetime
+import uuid
+from typing import TYPE_CHECKING, Optional
+from decimal import Decimal
+
+if TYPE_CHECKING:
+    from .suppliers import Supplier
+
+class SupplierCatalog(SQLModel, table=True):
+    """
+    A supplier's current price list as loaded by one tenant (see SupplierCatalogRepository).
+    Suppliers are shared between tenants, but each tenant loads the prices it is quoted.
+    """
+    tenant_id: uuid.UUID = Field(primary_key=True, foreign_key="tenant.id", ondelete="CASCADE")
+    supplier_id: uuid.UUID = Field(primary_key=True, foreign_key="supplier.id", ondelete="CASCADE")
+    edition_id: uuid.UUID = Field(primary_key=True, foreign_key="bookedition.edition_id", ondelete="CASCADE")
+    unit_cost: Decimal = Field(max_digits=10, decimal_places=2, gt=0, nullable=False)
+    in_stock: bool = Field(default=True, nullable=False)
+    quantity_available: Optional[int] = Field(default=None, ge=0)  # when the price list gives a count
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    # Relationships
+    supplier: Optional["Supplier"] = Relationship(back_populates="catalog")
+
+    def __repr__(self):
+        return f"SupplierCatalog(tenant_id={self.tenant_id}, supplier_id={self.supplier_id}, edition_id={self.edition_id}, unit_cost={self.unit_cost})"
@@ -9,6 +9,7 @@ from .tenant_supplier import TenantSupplier
 if TYPE_CHECKING:
     from .tenants import Tenant
     from .purchase_orders import PurchaseOrder
+    from .supplier_catalog import SupplierCatalog
 
 class Supplier(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -28,6 +29,7 @@ class Supplier(SQLModel, table=True):
     tenants: List["Tenant"] = Relationship(back_populates="suppliers", link_model=TenantSupplier, sa_relationship_kwargs={"viewonly": True})
     supplier_tenants: List["TenantSupplier"] = Relationship(back_populates="supplier")
     purchase_orders: List["PurchaseOrder"] = Relationship(back_populates="supplier")
+    catalog: List["SupplierCatalog"] = Relationship(back_populates="supplier", cascade_delete=True)
 
     def __repr__(self):
         return f"Supplier(id={self.id}, name={self.name})"
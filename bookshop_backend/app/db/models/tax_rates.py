@@ -1,4 +1,6 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from datetime import datetime
 import uuid
 
@@ -16,4 +18,18 @@ class TaxRates(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.now, index=True)
 
     # Relationship
-    tenant: "Tenant" = Relationship(back_populates="tax_rates")
\ No newline at end of file
+    tenant: "Tenant" = Relationship(back_populates="tax_rates")
+
+    __table_args__ = (
+        # At most one default per tenant. This is a partial unique index on (tenant_id)
+        # WHERE "default", written as a deferred exclusion constraint so a single UPDATE
+        # that moves the default between rows is checked once, at commit
+        ExcludeConstraint(
+            ("tenant_id", "="),
+            name="taxrates_one_default_per_tenant",
+            using="btree",
+            where=text('"default"'),
+            deferrable=True,
+            initially="DEFERRED"
+        ),
+    )
\ No newline at end of file
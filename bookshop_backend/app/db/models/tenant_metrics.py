@@ -0,0 +1,24 @@
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DateTime
+from datetime import datetime
+import uuid
+from typing import TYPE_CHECKING, Optional
+from decimal import Decimal
+from ...utils.date_ranges import utc_now
+
+if TYPE_CHECKING:
+    from .tenants import Tenant
+
+class TenantMetrics(SQLModel, table=True):
+    """Precomputed per-tenant figures for the superadmin overview (see TenantMetricsRepository)"""
+    tenant_id: uuid.UUID = Field(primary_key=True, foreign_key="tenant.id", ondelete="CASCADE")
+    sku_count: int = Field(default=0, nullable=False)
+    stock_value: Decimal = Field(max_digits=14, decimal_places=2, default=0.00, nullable=False)  # on hand at cost
+    revenue_30d: Decimal = Field(max_digits=14, decimal_places=2, default=0.00, nullable=False)
+    active_users: int = Field(default=0, nullable=False)  # logged in within the last 30 days
+    last_sale_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    reconciled_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    updated_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
+
+    # Relationships
+    tenant: "Tenant" = Relationship(back_populates="metrics")
@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import DateTime
+from datetime import datetime
+import uuid
+from typing import Optional
+from decimal import Decimal
+from ...utils.date_ranges import utc_now
+
+class TenantMetricsDelta(SQLModel, table=True):
+    """Change to a tenant's metrics not yet folded into tenantmetrics (see TenantMetricsRepository)"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    tenant_id: uuid.UUID = Field(foreign_key="tenant.id", ondelete="CASCADE", nullable=False)
+    sku_count: int = Field(default=0, nullable=False)
+    stock_value: Decimal = Field(max_digits=14, decimal_places=2, default=0.00, nullable=False)
+    revenue_30d: Decimal = Field(max_digits=14, decimal_places=2, default=0.00, nullable=False)
+    last_sale_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    created_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
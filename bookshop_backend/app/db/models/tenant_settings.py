@@ -7,8 +7,8 @@ from .tenants import Tenant
 
 class Settings(SQLModel, table=True):
     tenant_id: uuid.UUID = Field(foreign_key="tenant.id", primary_key=True, ondelete="CASCADE")
-    time_zone: str = Field(max_length=50, default='eat')
-    currency: str = Field(max_length=10, default='ksh')
+    time_zone: str = Field(max_length=50, default='Africa/Nairobi')  # IANA name; legacy rows may hold 'eat'
+    currency: str = Field(max_length=10, default='KES')
     email_notifications: bool = Field(default=True)
     sms_notification: bool = Field(default=False)
 
@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index, text
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 import uuid
@@ -18,11 +19,12 @@ if TYPE_CHECKING:
     from .monthly_sales_summary import MonthlySalesSummary
     from .tax_rates import TaxRates
     from .audit_logs import AuditLog
+    from .tenant_metrics import TenantMetrics
 
 
 class Tenant(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    name: str = Field(max_length=100, index=True, unique=True, nullable=False)
+    name: str = Field(max_length=100, index=True, nullable=False)
     contact_email: str = Field(max_length=100, index=True)
     contact_phone: Optional[str] = Field(default=None, max_length=15, index=True)
     address: Optional[str] = Field(default=None, max_length=255)
@@ -40,6 +42,15 @@ class Tenant(SQLModel, table=True):
     monthly_sales_summaries: List["MonthlySalesSummary"] = Relationship(back_populates="tenant", cascade_delete=True, passive_deletes=True)
     tax_rates: List["TaxRates"] = Relationship(back_populates="tenant", cascade_delete=True, passive_deletes=True)
     audit_logs: List["AuditLog"] = Relationship(back_populates="tenant", cascade_delete=True, passive_deletes=True)
+    metrics: Optional["TenantMetrics"] = Relationship(back_populates="tenant", cascade_delete=True, passive_deletes=True)
+
+    __table_args__ = (
+        # Names are unique regardless of case; also serves exact availability checks
+        Index("uq_tenant_name_lower", text("lower(name)"), unique=True),
+        # Substring and similarity search (pg_trgm)
+        Index("ix_tenant_name_trgm", text("lower(name) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_tenant_contact_email_trgm", text("lower(contact_email) gin_trgm_ops"), postgresql_using="gin"),
+    )
 
     def __repr__(self):
         return f"Tenant(id={self.id}, name={self.name}, contact_email={self.contact_email})"
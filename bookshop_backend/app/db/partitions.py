@@ -0,0 +1,177 @@
+"""
+Monthly range partitions.
+
+auditlog and sales are partitioned by month of created_at, and saleitems by month of its
+parent sale's created_at (sale_created_at), so a sale and its lines always land in the
+same month. Partitions are named <table>_yYYYYmMM with UTC month bounds; anything outside
+the created months falls into <table>_default, which is kept empty by creating months
+ahead of time.
+
+Sales are reported by sale_date rather than created_at, which the planner cannot prune
+on. A sale is never recorded before it happened, give or take a till clock running ahead
+(create_sale refuses sale dates more than SALE_DATE_LEEWAY in the future), so queries
+bounded below on sale_date add the created_at bound from earliest_created_at and skip
+older partitions. No upper bound follows: a sale rung up offline may be recorded later.
+
+The maintenance loop creates partitions MONTHS_AHEAD months into the future and moves audit
+partitions older than AUDIT_RETENTION_MONTHS out of the live table: they are detached and
+moved to the ARCHIVE_SCHEMA schema, where they can be dumped or dropped.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from logging import getLogger
+from typing import List, Optional, Tuple
+import os
+import re
+
+from sqlalchemy import text
+
+logger = getLogger(__name__)
+
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "12"))
+ARCHIVE_SCHEMA = os.getenv("AUDIT_ARCHIVE_SCHEMA", "audit_archive")
+MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# How far ahead of the server clock a sale_date may be
+SALE_DATE_LEEWAY = timedelta(minutes=15)
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    name: str
+    column: str
+    # timestamptz keys get explicit UTC bounds; naive timestamp keys get naive bounds
+    timezone_aware: bool
+
+
+PARTITIONED_TABLES = (
+    PartitionedTable("auditlog", "created_at", timezone_aware=False),
+    PartitionedTable("sales", "created_at", timezone_aware=True),
+    PartitionedTable("saleitems", "sale_created_at", timezone_aware=True),
+)
+
+PARTITION_NAME = re.compile(r"^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$")
+
+Month = Tuple[int, int]
+
+
+def add_months(month: Month, count: int) -> Month:
+    index = month[0] * 12 + month[1] - 1 + count
+    return index // 12, index % 12 + 1
+
+
+def partition_name(table: str, month: Month) -> str:
+    return f"{table}_y{month[0]:04d}m{month[1]:02d}"
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[str, Month]]:
+    """(table, month) for a monthly partition name, None for anything else (e.g. the default)"""
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return match["table"], (int(match["year"]), int(match["month"]))
+
+
+def partition_bounds(table: PartitionedTable, month: Month) -> Tuple[str, str]:
+    """FROM/TO literals of a month's partition; the upper bound is exclusive"""
+    suffix = "+00" if table.timezone_aware else ""
+    following = add_months(month, 1)
+    return (
+        f"{month[0]:04d}-{month[1]:02d}-01 00:00:00{suffix}",
+        f"{following[0]:04d}-{following[1]:02d}-01 00:00:00{suffix}",
+    )
+
+
+def create_partition_sql(table: PartitionedTable, month: Month) -> str:
+    lower, upper = partition_bounds(table, month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table.name, month)} "
+        f"PARTITION OF {table.name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+
+
+def partitions_for_range(table: str, start: datetime, end: datetime) -> List[str]:
+    """
+    Monthly partitions a half-open UTC range [start, end) touches: the partitions a
+    query filtering the partition key on that range is pruned to.
+    """
+    start, end = start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+    last = (end.year, end.month)
+    if end == datetime(end.year, end.month, 1, tzinfo=timezone.utc):
+        last = add_months(last, -1)
+    names, month = [], (start.year, start.month)
+    while month <= last:
+        names.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return names
+
+
+def earliest_created_at(sale_date_from: datetime) -> datetime:
+    """Lower bound on created_at of the sales (and sale_created_at of their lines) dated `sale_date_from` or later"""
+    return sale_date_from - SALE_DATE_LEEWAY
+
+
+def current_month(today: Optional[date] = None) -> Month:
+    today = today or datetime.now(timezone.utc).date()
+    return today.year, today.month
+
+
+def expired_partitions(names: List[str], table: str, retain_months: int, today: Optional[date] = None) -> List[str]:
+    """
+    Monthly partitions of `table` lying entirely before the retention window: with 12
+    months retained in October 2026, everything up to and including September 2025.
+    """
+    cutoff = add_months(current_month(today), -retain_months)
+    expired = []
+    for name in names:
+        parsed = parse_partition_name(name)
+        if parsed is not None and parsed[0] == table and parsed[1] < cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+async def ensure_future_partitions(db, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None) -> None:
+    """Create this month's and the next `months_ahead` months' partitions where missing"""
+    start = current_month(today)
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            await db.execute(text(create_partition_sql(table, add_months(start, offset))))
+
+
+async def list_partitions(db, table: str) -> List[str]:
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table}
+    )
+    return [row[0] for row in result.all()]
+
+
+async def archive_audit_partitions(
+    db,
+    retain_months: int = AUDIT_RETENTION_MONTHS,
+    today: Optional[date] = None
+) -> List[str]:
+    """Detach audit partitions past retention and move them to the archive schema"""
+    expired = expired_partitions(await list_partitions(db, "auditlog"), "auditlog", retain_months, today)
+    if expired:
+        await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for name in expired:
+        await db.execute(text(f"ALTER TABLE auditlog DETACH PARTITION {name}"))
+        await db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+    return expired
+
+
+async def run_partition_maintenance(session_maker) -> None:
+    async with session_maker() as session:
+        await ensure_future_partitions(session)
+        archived = await archive_audit_partitions(session)
+        await session.commit()
+    if archived:
+        logger.info(f"Archived audit partitions to {ARCHIVE_SCHEMA}: {', '.join(archived)}")
+
@@ -0,0 +1,77 @@
+"""
+Unit of work: one transaction per service operation.
+
+Repositories only add and flush. A service method marked @transactional is the
+boundary: it commits once if it returns a successful ServiceResult and rolls back if it
+returns a failed one or raises. Units of work nest on the same session, so a
+transactional method called from another (SalesService -> InventoryService) joins the
+caller's transaction and only the outermost one commits.
+
+Work that must only happen once the data is durable (caching new ids, invalidating
+caches) is registered with after_commit and dropped if the transaction rolls back.
+"""
+from functools import wraps
+from typing import Awaitable, Callable, List, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..utils.result import ServiceResult
+
+DEPTH_KEY = "uow_depth"
+CALLBACKS_KEY = "uow_after_commit"
+
+R = TypeVar("R")
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run `callback` when the enclosing unit of work commits, or now if there is none"""
+    if session.info.get(DEPTH_KEY):
+        session.info.setdefault(CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
+
+
+class UnitOfWork:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._rollback = False
+
+    def rollback_on_exit(self) -> None:
+        """Discard the transaction at the boundary instead of committing it"""
+        self._rollback = True
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.session.info[DEPTH_KEY] = self.session.info.get(DEPTH_KEY, 0) + 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        depth = self.session.info[DEPTH_KEY] - 1
+        self.session.info[DEPTH_KEY] = depth
+        if depth > 0:
+            # The outer unit of work decides; it sees the exception or the failed result
+            return False
+        callbacks: List[Callable[[], None]] = self.session.info.pop(CALLBACKS_KEY, [])
+        if exc_type is not None or self._rollback:
+            await self.session.rollback()
+            return False
+        try:
+            # Deferred constraints are checked here, so the commit itself can fail
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        for callback in callbacks:
+            callback()
+        return False
+
+
+def transactional(method: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Run a service method (on a service with a `db` session) as one unit of work"""
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs) -> R:
+        async with UnitOfWork(self.db) as uow:
+            result = await method(self, *args, **kwargs)
+            if isinstance(result, ServiceResult) and not result.success:
+                uow.rollback_on_exit()
+            return result
+    return wrapper
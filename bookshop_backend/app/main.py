@@ -6,6 +6,37 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.modules import api_router
 
 from .middleware.auth_middleware import AuthMiddleware
+from .middleware.audit_middleware import AuditContextMiddleware
+from .db.audit import audit_writer
+from .db.base import async_session_maker
+from .db.partitions import MAINTENANCE_INTERVAL_SECONDS, run_partition_maintenance
+from .db.idempotency import PURGE_INTERVAL_SECONDS, purge_idempotency_keys
+from .modules.tenants.tenant_metrics_repository import (
+    FOLD_INTERVAL_SECONDS, RECONCILE_INTERVAL_SECONDS, fold_tenant_metrics, reconcile_tenant_metrics
+)
+from .utils.periodic import PeriodicTask
+from functools import partial
+
+partition_maintainer = PeriodicTask(
+    "Partition maintenance",
+    partial(run_partition_maintenance, async_session_maker),
+    MAINTENANCE_INTERVAL_SECONDS
+)
+metrics_reconciler = PeriodicTask(
+    "Tenant metrics reconcile",
+    partial(reconcile_tenant_metrics, async_session_maker),
+    RECONCILE_INTERVAL_SECONDS
+)
+metrics_folder = PeriodicTask(
+    "Tenant metrics fold",
+    partial(fold_tenant_metrics, async_session_maker),
+    FOLD_INTERVAL_SECONDS
+)
+idempotency_purger = PeriodicTask(
+    "Idempotency key purge",
+    partial(purge_idempotency_keys, async_session_maker),
+    PURGE_INTERVAL_SECONDS
+)
 
 app = FastAPI(
     title="Bookshop flow api",
@@ -38,6 +69,8 @@ def custom_openapi_auth():
     app.openapi_schema = openapi_schema
     return app.openapi_schema
 
+app.add_middleware(AuditContextMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -47,14 +80,32 @@ app.add_middleware(
     ], 
     allow_credentials=True,
     allow_methods=["GET", "POST", "HEAD", "OPTIONS", "PUT", "DELETE", "PATCH"],
-    allow_headers=["Access-Control-Allow-Headers", "Content-Type", "Authorization", "Access-Control-Allow-Origin", "Set-Cookie", "Cookie"],
+    allow_headers=["Access-Control-Allow-Headers", "Content-Type", "Authorization", "Access-Control-Allow-Origin", "Set-Cookie", "Cookie", "Idempotency-Key"],
+    expose_headers=["Idempotent-Replayed"],
 )
 
 app.include_router(api_router)
 
 @app.on_event("startup")
 async def on_startup():
-    pass
+    await audit_writer.start()
+    # Creates upcoming monthly partitions and archives expired audit partitions
+    await partition_maintainer.start()
+    # Settles precomputed tenant metrics (30-day window, logins) against the source tables
+    await metrics_reconciler.start()
+    # Adds metric deltas appended by sales and stock moves to the tenant rows
+    await metrics_folder.start()
+    # Drops idempotency keys past their TTL
+    await idempotency_purger.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Drain buffered audit entries before the process exits
+    await idempotency_purger.stop()
+    await metrics_folder.stop()
+    await metrics_reconciler.stop()
+    await partition_maintainer.stop()
+    await audit_writer.stop()
 
 @app.get("/")
 async def root():
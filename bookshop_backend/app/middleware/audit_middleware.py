@@ -0,0 +1,29 @@
+# app/middleware/audit_middleware.py
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+import uuid
+
+from app.db.audit import audit_user_id
+from app.utils.tokens import decode_access_token
+
+
+class AuditContextMiddleware(BaseHTTPMiddleware):
+    """Records the acting user for audit entries written while handling the request"""
+
+    async def dispatch(self, request: Request, call_next):
+        user_id = None
+        authorization = request.headers.get("Authorization")
+        if authorization and authorization.startswith("Bearer "):
+            payload = decode_access_token(authorization.split(" ", 1)[1])
+            # Superadmins live in their own table, which AuditLog.user_id does not reference
+            if payload and payload.get("user_id") and payload.get("role") != "superadmin":
+                try:
+                    user_id = uuid.UUID(str(payload["user_id"]))
+                except ValueError:
+                    user_id = None
+
+        token = audit_user_id.set(user_id)
+        try:
+            return await call_next(request)
+        finally:
+            audit_user_id.reset(token)
@@ -9,6 +9,8 @@ from .purchase_orders.purchase_order_controller import router as purchase_order_
 from .inventory.inventory_controller import router as inventory_router
 from .sales.sales_controller import router as sales_router
 from .payments.payment_controller import router as payment_router
+from .replenishment.replenishment_controller import router as replenishment_router
+from .analytics.analytics_controller import router as analytics_router
 
 
 api_router = APIRouter()
@@ -83,3 +85,17 @@ api_router.include_router(
     tags=["Payments"],
     responses={404: {"description": "Not found"}},
 )
+
+api_router.include_router(
+    replenishment_router,
+    prefix="/replenishment",
+    tags=["Replenishment"],
+    responses={404: {"description": "Not found"}},
+)
+
+api_router.include_router(
+    analytics_router,
+    prefix="/analytics",
+    tags=["Analytics"],
+    responses={404: {"description": "Not found"}},
+)
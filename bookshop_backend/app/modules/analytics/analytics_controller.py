@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from ...db.session import SessionDep
+from .analytics_service import AnalyticsService
+from .analytics_model import MarginWindow
+from ...utils.auth import (
+    require_role,
+    CurrentUser,
+    UserRole
+)
+
+
+router = APIRouter()
+
+@router.get("/margins")
+async def get_margin_report(
+    db: SessionDep,
+    days: MarginWindow = MarginWindow.MONTH,
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """
+    Realised vs list margin, discount leakage and profitability per category and
+    publisher over the last 30, 90 or 365 days. Results are cached for five minutes.
+    Requires: Admin or Manager role
+    """
+    service = AnalyticsService(db)
+    result = await service.get_margin_report(user.tenant_id, days)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.error
+        )
+    return result.data
+
+
+@router.get("/suppliers")
+async def get_supplier_performance(
+    db: SessionDep,
+    days: MarginWindow = MarginWindow.QUARTER,
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """
+    Lead time (average, median, p90), on-time rate and fill rate per supplier for
+    purchase orders placed in the last 30, 90 or 365 days. Cached for five minutes.
+    Requires: Admin or Manager role
+    """
+    service = AnalyticsService(db)
+    result = await service.get_supplier_performance(user.tenant_id, days)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.error
+        )
+    return result.data
@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from decimal import Decimal
+from datetime import datetime
+from enum import IntEnum
+import uuid
+
+
+class MarginWindow(IntEnum):
+    """Trailing periods the margin report is available for"""
+    MONTH = 30
+    QUARTER = 90
+    YEAR = 365
+
+
+class MarginBreakdown(BaseModel):
+    name: Optional[str] = Field(None, description="Category or publisher; empty for the overall totals")
+    units_sold: int
+    revenue: Decimal = Field(..., description="Realised line totals net of tax")
+    cost: Decimal = Field(..., description="Units sold at current inventory cost price")
+    gross_profit: Decimal
+    list_revenue: Decimal = Field(..., description="Units sold at list price (cost marked up by profit, before discount)")
+    discount_leakage: Decimal = Field(..., description="List revenue not realised at the till")
+    recorded_discounts: Decimal = Field(..., description="Sum of discount_amount entered on sale lines")
+    realised_margin: Optional[float] = Field(None, description="Gross profit over revenue")
+    list_margin: Optional[float] = Field(None, description="Margin had every unit sold at list price")
+
+
+class MarginReport(BaseModel):
+    days: int
+    period_start: datetime
+    generated_at: datetime
+    totals: MarginBreakdown
+    by_category: List[MarginBreakdown]
+    by_publisher: List[MarginBreakdown]
+
+
+class SupplierPerformance(BaseModel):
+    supplier_id: uuid.UUID
+    supplier_name: str
+    delivered_orders: int = Field(..., description="Orders with at least one delivery")
+    on_time_rate: Optional[float] = Field(None, description="Share of delivered orders first received by the expected date")
+    avg_lead_time_days: Optional[float] = Field(None, description="Days from order to first delivery")
+    min_lead_time_days: Optional[float] = None
+    p50_lead_time_days: Optional[float] = None
+    p90_lead_time_days: Optional[float] = None
+    max_lead_time_days: Optional[float] = None
+    due_orders: int = Field(..., description="Closed orders and partial orders past their expected date")
+    units_ordered: int
+    units_received: int
+    fill_rate: Optional[float] = Field(None, description="Units received over units ordered on due orders")
+    line_fill_rate: Optional[float] = Field(None, description="Share of due order lines received in full")
+
+
+class SupplierPerformanceReport(BaseModel):
+    days: int
+    period_start: datetime
+    generated_at: datetime
+    suppliers: List[SupplierPerformance]
@@ -0,0 +1,186 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, and_, case, cast, distinct, extract, literal_column, or_, tuple_
+from sqlmodel import select, func
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import uuid
+from ...db import models
+from ...db.partitions import earliest_created_at
+from ...utils.date_ranges import naive_local, utc_now
+
+# Sale statuses that never turned into revenue
+EXCLUDED_SALE_STATUSES = ["cancelled", "refunded"]
+
+# Purchase orders closed out, whether or not every unit arrived
+CLOSED_PO_STATUSES = ["received", "completed"]
+
+
+def supplier_lead_times(tenant_id: uuid.UUID, since: datetime):
+    """
+    Per-supplier lead-time distribution, in days from order to first delivery, for
+    orders placed since `since`. Percentiles are computed by PostgreSQL in the same pass.
+    """
+    since = naive_local(since)
+    po = models.PurchaseOrder
+    lead_days = extract("epoch", po.first_received_at - po.order_date) / 86400
+    return select(
+        po.supplier_id,
+        func.count().label("delivered_orders"),
+        func.avg(lead_days).label("avg_lead_time_days"),
+        func.min(lead_days).label("min_lead_time_days"),
+        func.max(lead_days).label("max_lead_time_days"),
+        func.percentile_cont(0.5).within_group(lead_days).label("p50_lead_time_days"),
+        func.percentile_cont(0.9).within_group(lead_days).label("p90_lead_time_days"),
+        func.count().filter(po.first_received_at <= po.expected_delivery_date).label("on_time_orders")
+    ).where(
+        po.tenant_id == tenant_id,
+        po.order_date >= since,
+        po.first_received_at.is_not(None)
+    ).group_by(po.supplier_id).subquery()
+
+
+class AnalyticsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_margin_rows(self, tenant_id: uuid.UUID, since: datetime) -> List[Dict[str, Any]]:
+        """
+        Realised vs list margin for sale lines since `since`, aggregated in one statement
+        with GROUPING SETS: overall, per category and per publisher.
+
+        Each row carries a `grouping` of "total", "category" or "publisher".
+        Cost uses the current inventory cost price, since sale lines do not record cost.
+        """
+        quantity = models.SaleItems.quantity_sold
+        cost_price = func.coalesce(models.Inventory.cost_price, 0)
+        list_price = cost_price * (1 + func.coalesce(models.Inventory.profit, 0))
+        revenue = func.sum(models.SaleItems.total_price - func.coalesce(models.SaleItems.tax_amount, 0))
+        cost = func.sum(quantity * cost_price)
+        list_revenue = func.sum(quantity * list_price)
+        category = models.Category.name
+        publisher = models.BookEdition.publisher
+
+        stmt = select(
+            func.grouping(category).label("by_category"),
+            func.grouping(publisher).label("by_publisher"),
+            category.label("category"),
+            publisher.label("publisher"),
+            func.coalesce(func.sum(quantity), 0).label("units_sold"),
+            func.coalesce(revenue, 0).label("revenue"),
+            func.coalesce(cost, 0).label("cost"),
+            func.coalesce(list_revenue, 0).label("list_revenue"),
+            func.coalesce(func.sum(models.SaleItems.discount_amount), 0).label("recorded_discounts"),
+            cast((revenue - cost) / func.nullif(revenue, 0), Float).label("realised_margin"),
+            cast((list_revenue - cost) / func.nullif(list_revenue, 0), Float).label("list_margin")
+        ).select_from(
+            models.SaleItems
+        ).join(
+            models.Sales, and_(
+                models.SaleItems.sale_id == models.Sales.id,
+                models.SaleItems.sale_created_at == models.Sales.created_at
+            )
+        ).join(
+            models.BookEdition, models.SaleItems.edition_id == models.BookEdition.edition_id
+        ).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).outerjoin(
+            models.Category, models.Book.category_id == models.Category.category_id
+        ).outerjoin(
+            models.Inventory, and_(
+                models.Inventory.tenant_id == models.Sales.tenant_id,
+                models.Inventory.edition_id == models.SaleItems.edition_id
+            )
+        ).where(
+            models.Sales.tenant_id == tenant_id,
+            models.Sales.created_at >= earliest_created_at(since),
+            models.SaleItems.sale_created_at >= earliest_created_at(since),
+            models.Sales.sale_date >= since,
+            models.Sales.sale_status.notin_(EXCLUDED_SALE_STATUSES)
+        ).group_by(
+            func.grouping_sets(literal_column("()"), tuple_(category), tuple_(publisher))
+        ).order_by(
+            (revenue - cost).desc()
+        )
+
+        result = await self.db.execute(stmt)
+        rows = []
+        for row in result.all():
+            data = dict(row._mapping)
+            by_category, by_publisher = data.pop("by_category"), data.pop("by_publisher")
+            category_name, publisher_name = data.pop("category"), data.pop("publisher")
+            # grouping() is 0 for the column a grouping set is keyed on
+            if by_category == 0:
+                data["grouping"], data["name"] = "category", category_name
+            elif by_publisher == 0:
+                data["grouping"], data["name"] = "publisher", publisher_name
+            else:
+                data["grouping"], data["name"] = "total", None
+            rows.append(data)
+        return rows
+
+    async def get_supplier_performance(self, tenant_id: uuid.UUID, since: datetime,
+                                       now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Lead-time distribution, on-time deliveries and fill rate per supplier for orders
+        placed since `since`, in one statement.
+
+        Fill rate counts orders that are due: closed orders, and partially received
+        orders past their expected delivery date. Open orders not yet due are left out
+        so they do not drag the rate down.
+        """
+        # Purchase order timestamps are naive server-local times
+        now = naive_local(now or utc_now())
+        since = naive_local(since)
+        po = models.PurchaseOrder
+        item = models.PurchaseOrderItems
+        lead_times = supplier_lead_times(tenant_id, since)
+
+        is_due = or_(
+            po.status.in_(CLOSED_PO_STATUSES),
+            and_(po.status == "partial", po.expected_delivery_date < now)
+        )
+        fill = select(
+            po.supplier_id,
+            func.count(distinct(po.id)).label("due_orders"),
+            func.sum(item.quantity_ordered).label("units_ordered"),
+            func.sum(func.least(item.quantity_received, item.quantity_ordered)).label("units_received"),
+            func.count().label("lines"),
+            func.count().filter(item.quantity_received >= item.quantity_ordered).label("lines_filled")
+        ).join(
+            item, item.po_id == po.id
+        ).where(
+            po.tenant_id == tenant_id,
+            po.order_date >= since,
+            is_due
+        ).group_by(po.supplier_id).subquery()
+
+        supplier_id = func.coalesce(lead_times.c.supplier_id, fill.c.supplier_id)
+        stmt = select(
+            supplier_id.label("supplier_id"),
+            models.Supplier.name.label("supplier_name"),
+            func.coalesce(lead_times.c.delivered_orders, 0).label("delivered_orders"),
+            func.coalesce(lead_times.c.on_time_orders, 0).label("on_time_orders"),
+            cast(lead_times.c.avg_lead_time_days, Float).label("avg_lead_time_days"),
+            cast(lead_times.c.min_lead_time_days, Float).label("min_lead_time_days"),
+            cast(lead_times.c.max_lead_time_days, Float).label("max_lead_time_days"),
+            lead_times.c.p50_lead_time_days,
+            lead_times.c.p90_lead_time_days,
+            func.coalesce(fill.c.due_orders, 0).label("due_orders"),
+            func.coalesce(fill.c.units_ordered, 0).label("units_ordered"),
+            func.coalesce(fill.c.units_received, 0).label("units_received"),
+            case(
+                (fill.c.lines > 0, cast(fill.c.lines_filled, Float) / fill.c.lines),
+                else_=None
+            ).label("line_fill_rate")
+        ).select_from(
+            lead_times
+        ).join(
+            fill, fill.c.supplier_id == lead_times.c.supplier_id, full=True
+        ).join(
+            models.Supplier, models.Supplier.id == supplier_id
+        ).order_by(
+            models.Supplier.name, supplier_id
+        )
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
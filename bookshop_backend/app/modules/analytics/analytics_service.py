@@ -0,0 +1,129 @@
+from ...db.session import SessionDep
+from ...utils.result import ServiceResult
+from ...utils.cache import BoundedCache
+from ...utils.date_ranges import utc_now
+from .analytics_repository import AnalyticsRepository
+from .analytics_model import (
+    MarginBreakdown, MarginReport, MarginWindow, SupplierPerformance, SupplierPerformanceReport
+)
+from datetime import timedelta
+from decimal import Decimal
+from typing import Optional
+import uuid
+
+# Reports are keyed by (tenant, window) and recomputed at most every few minutes
+margin_cache: BoundedCache[MarginReport] = BoundedCache(maxsize=1024, ttl=300)
+supplier_performance_cache: BoundedCache[SupplierPerformanceReport] = BoundedCache(maxsize=1024, ttl=300)
+
+
+def ratio(numerator, denominator) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def days(value) -> Optional[float]:
+    return round(float(value), 2) if value is not None else None
+
+
+def to_breakdown(row: dict) -> MarginBreakdown:
+    revenue = Decimal(row["revenue"]).quantize(Decimal("0.01"))
+    cost = Decimal(row["cost"]).quantize(Decimal("0.01"))
+    list_revenue = Decimal(row["list_revenue"]).quantize(Decimal("0.01"))
+    return MarginBreakdown(
+        name=row["name"],
+        units_sold=row["units_sold"],
+        revenue=revenue,
+        cost=cost,
+        gross_profit=revenue - cost,
+        list_revenue=list_revenue,
+        discount_leakage=max(list_revenue - revenue, Decimal("0.00")),
+        recorded_discounts=Decimal(row["recorded_discounts"]).quantize(Decimal("0.01")),
+        realised_margin=round(row["realised_margin"], 4) if row["realised_margin"] is not None else None,
+        list_margin=round(row["list_margin"], 4) if row["list_margin"] is not None else None
+    )
+
+
+class AnalyticsService:
+    def __init__(self, db: SessionDep):
+        self.db = db
+        self.repository = AnalyticsRepository(db)
+
+    async def get_margin_report(self, tenant_id: uuid.UUID, window: MarginWindow) -> ServiceResult:
+        """Realised vs list margin, discount leakage and profitability by category and publisher"""
+        try:
+            key = (tenant_id, int(window))
+            report = margin_cache.get(key)
+            if report is None:
+                now = utc_now()
+                since = now - timedelta(days=int(window))
+                rows = await self.repository.get_margin_rows(tenant_id, since)
+
+                totals = next((row for row in rows if row["grouping"] == "total"), None)
+                report = MarginReport(
+                    days=int(window),
+                    period_start=since,
+                    generated_at=now,
+                    totals=to_breakdown(totals) if totals else MarginBreakdown(
+                        units_sold=0, revenue=Decimal("0.00"), cost=Decimal("0.00"),
+                        gross_profit=Decimal("0.00"), list_revenue=Decimal("0.00"),
+                        discount_leakage=Decimal("0.00"), recorded_discounts=Decimal("0.00")
+                    ),
+                    by_category=[to_breakdown(row) for row in rows if row["grouping"] == "category"],
+                    by_publisher=[to_breakdown(row) for row in rows if row["grouping"] == "publisher"]
+                )
+                margin_cache.set(key, report)
+
+            return ServiceResult(
+                data=report,
+                message="Margin report generated successfully",
+                success=True
+            )
+        except Exception as e:
+            return ServiceResult(
+                error=f"Failed to generate margin report: {e}",
+                success=False
+            )
+
+    async def get_supplier_performance(self, tenant_id: uuid.UUID, window: MarginWindow) -> ServiceResult:
+        """Lead-time distribution, on-time rate and fill rate per supplier from purchase order history"""
+        try:
+            key = (tenant_id, int(window))
+            report = supplier_performance_cache.get(key)
+            if report is None:
+                now = utc_now()
+                since = now - timedelta(days=int(window))
+                rows = await self.repository.get_supplier_performance(tenant_id, since, now)
+                report = SupplierPerformanceReport(
+                    days=int(window),
+                    period_start=since,
+                    generated_at=now,
+                    suppliers=[
+                        SupplierPerformance(
+                            supplier_id=row["supplier_id"],
+                            supplier_name=row["supplier_name"],
+                            delivered_orders=row["delivered_orders"],
+                            on_time_rate=ratio(row["on_time_orders"], row["delivered_orders"]),
+                            avg_lead_time_days=days(row["avg_lead_time_days"]),
+                            min_lead_time_days=days(row["min_lead_time_days"]),
+                            p50_lead_time_days=days(row["p50_lead_time_days"]),
+                            p90_lead_time_days=days(row["p90_lead_time_days"]),
+                            max_lead_time_days=days(row["max_lead_time_days"]),
+                            due_orders=row["due_orders"],
+                            units_ordered=row["units_ordered"],
+                            units_received=row["units_received"],
+                            fill_rate=ratio(row["units_received"], row["units_ordered"]),
+                            line_fill_rate=round(row["line_fill_rate"], 4) if row["line_fill_rate"] is not None else None
+                        ) for row in rows
+                    ]
+                )
+                supplier_performance_cache.set(key, report)
+
+            return ServiceResult(
+                data=report,
+                message="Supplier performance generated successfully",
+                success=True
+            )
+        except Exception as e:
+            return ServiceResult(
+                error=f"Failed to generate supplier performance: {e}",
+                success=False
+            )
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Union
+from datetime import datetime
 from ...db import models
 
 class AuthRepository:
@@ -21,4 +22,7 @@ class AuthRepository:
         stmt = select(models.SuperAdmin).where(models.SuperAdmin.email == email)
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
-    
+
+    async def record_login(self, user: models.User, at: datetime) -> None:
+        user.last_login = at
+        await self.db_session.flush()
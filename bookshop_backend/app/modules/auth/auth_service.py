@@ -5,6 +5,8 @@ from ...utils.password_manager import verify_password
 from ...utils.password_manager import hash_password, verify_password
 from ...utils.tokens import create_access_token, create_refresh_token, verify_refresh_token
 from ...db import models
+from ...db.unit_of_work import transactional
+from datetime import datetime
 
 class AuthService:
     def __init__(self, db: SessionDep):
@@ -24,8 +26,12 @@ class AuthService:
             error="Invalid email or password"
         )
 
+    @transactional
     async def login_user(self, user: models.User) -> ServiceResult:
         tenant_id = getattr(user, "tenant_id", None)
+        if isinstance(user, models.User):
+            # Feeds the active user count in tenant metrics
+            await self.auth_repo.record_login(user, datetime.now())
         access_token: str = create_access_token({
             "email": user.email,
             "role": user.role,
@@ -1,9 +1,9 @@
 import uuid
-from fastapi import APIRouter, Body, HTTPException, status, Response, Depends
-from .book_model import CSVBookCreate
+from fastapi import APIRouter, Body, HTTPException, status, Response, Depends, Query
+from .book_model import CSVBookCreate, BookSortField, SortOrder
 from ...db.session import SessionDep
 from .book_service import BookService
-from typing import List
+from typing import List, Optional, Annotated
 from ...utils.auth import (
     get_current_user, 
     require_role, 
@@ -77,20 +77,29 @@ async def get_book_by_isbn(
 @router.get('', status_code=status.HTTP_200_OK)
 async def get_all_books(
     db: SessionDep,
-    skip: int = 0,
-    limit: int = 100,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None,
+    sort_by: BookSortField = BookSortField.TITLE,
+    order: SortOrder = SortOrder.ASC,
+    category: Optional[str] = None,
+    low_stock: bool = False,
     user: CurrentUser = Depends(require_permission(Permission.READ_BOOKS))
 ):
     """
-    Get all books for the current tenant.
+    List the current tenant's books with stock, sale price and stock value.
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page.
     Requires: Read books permission
     """
     try:
         service = BookService(db)
         result = await service.get_books_by_tenant(
             tenant_id=user.tenant_id,
-            skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            sort_by=sort_by,
+            order=order,
+            category=category,
+            low_stock=low_stock
         )
         
         if not result.success:
@@ -101,6 +110,8 @@ async def get_all_books(
         
         return result.data
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -248,13 +259,16 @@ async def bulk_import_books(
 # Search endpoint - available to all authenticated users
 @router.get('/search', status_code=status.HTTP_200_OK)
 async def search_books(
-    q: str,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
     db: SessionDep,
-    limit: int = 50,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None,
     user: CurrentUser = Depends(get_current_user)
 ):
     """
-    Search books by title, author, or ISBN.
+    Search the tenant's books by title, author, ISBN or publisher.
+    Matches are ranked, prefix-matched and tolerate typos. Pass `next_cursor`
+    from the previous response as `cursor` to fetch the next page.
     Available to all authenticated users.
     """
     try:
@@ -262,7 +276,8 @@ async def search_books(
         result = await service.search_books(
             query=q,
             tenant_id=user.tenant_id,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
         
         if not result.success:
@@ -273,8 +288,37 @@ async def search_books(
         
         return result.data
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
+
+@router.get('/suggest', status_code=status.HTTP_200_OK)
+async def suggest_books(
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    db: SessionDep,
+    limit: Annotated[int, Query(ge=1, le=25)] = 10,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Type-ahead suggestions by title, author or ISBN prefix.
+    Served from an in-memory index, so it is safe to call on every keystroke.
+    Available to all authenticated users.
+    """
+    service = BookService(db)
+    result = await service.suggest_books(
+        query=q,
+        tenant_id=user.tenant_id,
+        limit=limit
+    )
+
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.error
+        )
+
+    return result.data
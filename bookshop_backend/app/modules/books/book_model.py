@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
+from enum import Enum
 from decimal import Decimal
 from datetime import date
 import uuid
@@ -308,6 +309,20 @@ class BookSearchFilters(BaseModel):
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
 
+class BookSortField(str, Enum):
+    """Columns GET /books can be sorted by"""
+    TITLE = "title"
+    AUTHOR = "author"
+    ISBN = "isbn_number"
+    CATEGORY = "category"
+    STOCK = "available_quantity"
+    SALE_PRICE = "sale_price"
+    STOCK_VALUE = "stock_value"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
 class BookSearchResponse(BaseModel):
     """Response model for book search"""
     books: List[BookEditionInventoryResponse]
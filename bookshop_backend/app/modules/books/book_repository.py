@@ -1,27 +1,78 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, Numeric, and_, cast, case, distinct, literal, literal_column, or_, tuple_, union
 from sqlmodel import select, func
+from datetime import datetime
+import re
 import uuid
-from .book_model import BookCreateBase, BookEditionCreateBase
+from .book_model import BookCreateBase, BookEditionCreateBase, BookSortField, SortOrder
 from ...db import models
-from typing import Union, Dict
+from ...db.unit_of_work import after_commit
+from ...utils.cache import BoundedCache
+from typing import Any, Union, Dict, List, Optional, Tuple
+from functools import partial
+
+# Catalogue rows are global and never renamed, so their ids can be shared by every tenant
+# in the process. Sized for a few hundred thousand editions.
+isbn_cache: BoundedCache[uuid.UUID] = BoundedCache(maxsize=200_000)
+book_cache: BoundedCache[uuid.UUID] = BoundedCache(maxsize=100_000)
+category_cache: BoundedCache[uuid.UUID] = BoundedCache(maxsize=5_000)
+
+# Keys per IN (...) list when warming, well under asyncpg's bind parameter limit
+WARM_BATCH_SIZE = 5_000
+
+# Text search configuration; "simple" avoids stemming author names and titles
+SEARCH_CONFIG = literal_column("'simple'")
+
+# Computed inventory columns GET /books sorts on. Each matches an expression index on
+# (tenant_id, expression, edition_id) in models.Inventory, so the constants are inlined
+# rather than bound: the planner only uses the index for the identical expression.
+_ONE = literal_column("1", Numeric)
+AVAILABLE_QUANTITY = models.Inventory.quantity_on_hand - models.Inventory.quantity_reserved
+SALE_PRICE = models.Inventory.cost_price * (_ONE + models.Inventory.profit) * (_ONE - models.Inventory.discount)
+STOCK_VALUE = AVAILABLE_QUANTITY * SALE_PRICE
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """
+    Turn free text into a prefix tsquery, e.g. "harry pot" -> "harry:* & pot:*".
+    Only word characters survive, so the result is always valid to_tsquery input.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
 
 class BookRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
     
     async def create_book_category(self, book_category: str) -> uuid.UUID:
+        cached = category_cache.get(book_category)
+        if cached:
+            return cached
+
         stmt = select(models.Category).where(models.Category.name == book_category)
         result = await self.db.execute(stmt)
         existing_category = result.scalar_one_or_none()
         
         if existing_category:
+            # The row may have been flushed earlier in this same transaction, so it is
+            # only shared once committed
+            after_commit(self.db, partial(category_cache.set, book_category, existing_category.category_id))
             return existing_category.category_id
-        else:
-            new_category = models.Category(name=book_category)
-            await self.save(new_category)
-            return new_category.category_id
+
+        new_category = models.Category(name=book_category)
+        await self.save(new_category)
+        # New ids are cached only once committed, so a rolled-back import leaves no trace
+        after_commit(self.db, partial(category_cache.set, book_category, new_category.category_id))
+        return new_category.category_id
 
     async def create_book(self, book: BookCreateBase) -> uuid.UUID:
+        key = (book.title, book.author, book.category_id)
+        cached = book_cache.get(key)
+        if cached:
+            return cached
+
         # Check if book already exists
         stmt = select(models.Book).where(
             models.Book.title == book.title, 
@@ -32,25 +83,84 @@ class BookRepository:
         existing_book = result.scalar_one_or_none()
         
         if existing_book:
+            after_commit(self.db, partial(book_cache.set, key, existing_book.id))
             return existing_book.id
-        else:
-            new_book = models.Book(**book.dict())
-            await self.save(new_book)
-            return new_book.id
+
+        new_book = models.Book(**book.dict())
+        await self.save(new_book)
+        after_commit(self.db, partial(book_cache.set, key, new_book.id))
+        return new_book.id
 
     async def create_book_edition(self, book_edition: BookEditionCreateBase) -> uuid.UUID:
+        cached = isbn_cache.get(book_edition.isbn_number)
+        if cached:
+            return cached
+
         # Check if edition already exists
         stmt = select(models.BookEdition).where(models.BookEdition.isbn_number == book_edition.isbn_number)
         result = await self.db.execute(stmt)
         existing_edition = result.scalar_one_or_none()
         
         if existing_edition:
+            after_commit(self.db, partial(isbn_cache.set, book_edition.isbn_number, existing_edition.edition_id))
             return existing_edition.edition_id
-        else:
-            new_book_edition = models.BookEdition(**book_edition.dict())
-            await self.save(new_book_edition)
-            return new_book_edition.edition_id
-        
+
+        new_book_edition = models.BookEdition(**book_edition.dict())
+        await self.save(new_book_edition)
+        after_commit(self.db, partial(isbn_cache.set, book_edition.isbn_number, new_book_edition.edition_id))
+        return new_book_edition.edition_id
+
+    async def warm_catalogue_cache(
+        self,
+        isbns: List[str],
+        category_names: List[str],
+        titles: List[Tuple[str, str]]
+    ) -> None:
+        """
+        Prefetch catalogue ids for an import in a handful of queries, so the per-row
+        create_* calls only touch the database for rows that are genuinely new.
+        `titles` holds the (title, author) of each row in `isbns`, in the same order.
+        Keys already cached are skipped.
+        """
+        missing_isbns = list({isbn for isbn in isbns if isbn not in isbn_cache})
+        for start in range(0, len(missing_isbns), WARM_BATCH_SIZE):
+            stmt = select(
+                models.BookEdition.isbn_number,
+                models.BookEdition.edition_id,
+                models.Book.id,
+                models.Book.title,
+                models.Book.author,
+                models.Book.category_id
+            ).join(
+                models.Book, models.BookEdition.book_id == models.Book.id
+            ).where(models.BookEdition.isbn_number.in_(missing_isbns[start:start + WARM_BATCH_SIZE]))
+            result = await self.db.execute(stmt)
+            for row in result.all():
+                isbn_cache.set(row.isbn_number, row.edition_id)
+                book_cache.set((row.title, row.author, row.category_id), row.id)
+
+        missing_categories = list({name for name in category_names if name not in category_cache})
+        if missing_categories:
+            stmt = select(models.Category.name, models.Category.category_id).where(
+                models.Category.name.in_(missing_categories)
+            )
+            result = await self.db.execute(stmt)
+            for row in result.all():
+                category_cache.set(row.name, row.category_id)
+
+        # New editions may still belong to a book that is already catalogued
+        missing_titles = list({title for isbn, title in zip(isbns, titles) if isbn not in isbn_cache})
+        for start in range(0, len(missing_titles), WARM_BATCH_SIZE):
+            stmt = select(
+                models.Book.title,
+                models.Book.author,
+                models.Book.category_id,
+                models.Book.id
+            ).where(tuple_(models.Book.title, models.Book.author).in_(missing_titles[start:start + WARM_BATCH_SIZE]))
+            result = await self.db.execute(stmt)
+            for row in result.all():
+                book_cache.set((row.title, row.author, row.category_id), row.id)
+
     async def get_book_with_inventory(self, isbn: str, tenant_id: uuid.UUID) -> Union[Dict, None]:
         stmt = select(
             models.Book.title,
@@ -84,14 +194,211 @@ class BookRepository:
             }
         return None
 
-    async def count_books(self) -> int:
-        stmt = select(func.count()).select_from(models.Book)
+    async def search_books(
+        self,
+        query: str,
+        tenant_id: uuid.UUID,
+        limit: int,
+        after: Optional[Tuple[float, uuid.UUID]] = None
+    ) -> List[Dict]:
+        """
+        Ranked search over title, author, ISBN and publisher, limited to editions the tenant stocks.
+
+        Candidates come from a UNION of index-friendly branches (tsvector prefix match, trigram
+        word similarity, ISBN prefix) so each branch can use its own GIN index. Results are
+        ordered by rank then edition_id; `after` is the (rank, edition_id) of the last row seen.
+        Returns up to limit + 1 rows so the caller can tell whether another page exists.
+        """
+        tsquery = build_prefix_tsquery(query)
+        if tsquery is None:
+            return []
+
+        search_vector = func.to_tsvector(SEARCH_CONFIG, models.Book.title + literal_column("' '") + models.Book.author)
+        ts_query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        term = literal(query.strip())
+
+        book_match = select(models.BookEdition.edition_id).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).where(
+            or_(
+                search_vector.op("@@")(ts_query),
+                term.op("<%")(models.Book.title),
+                term.op("<%")(models.Book.author)
+            )
+        )
+        edition_conditions = [term.op("<%")(models.BookEdition.publisher)]
+        digits = re.sub(r"[\s-]", "", query)
+        isbn_prefix = digits.isdigit() and len(digits) >= 3
+        if isbn_prefix:
+            edition_conditions.append(models.BookEdition.isbn_number.like(f"{digits}%"))
+        edition_match = select(models.BookEdition.edition_id).where(or_(*edition_conditions))
+        candidates = union(book_match, edition_match).subquery()
+
+        score = func.ts_rank(search_vector, ts_query) + func.greatest(
+            func.word_similarity(term, models.Book.title),
+            func.word_similarity(term, models.Book.author),
+            func.word_similarity(term, models.BookEdition.publisher) * 0.5
+        )
+        if isbn_prefix:
+            # A scanned or typed ISBN should beat any text match
+            score = score + case((models.BookEdition.isbn_number.like(f"{digits}%"), 1.0), else_=0.0)
+        rank = cast(score, Float).label("rank")
+
+        stmt = select(
+            models.BookEdition.edition_id,
+            models.Book.id.label("book_id"),
+            models.Book.title,
+            models.Book.author,
+            models.BookEdition.isbn_number,
+            models.BookEdition.publisher,
+            models.BookEdition.format,
+            (models.Inventory.quantity_on_hand - models.Inventory.quantity_reserved).label("available_quantity"),
+            (models.Inventory.cost_price * (1 + models.Inventory.profit) * (1 - models.Inventory.discount)).label("sale_price"),
+            rank
+        ).select_from(
+            candidates
+        ).join(
+            models.BookEdition, models.BookEdition.edition_id == candidates.c.edition_id
+        ).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).join(
+            models.Inventory, and_(
+                models.Inventory.edition_id == models.BookEdition.edition_id,
+                models.Inventory.tenant_id == tenant_id
+            )
+        )
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(
+                or_(
+                    rank < after_rank,
+                    and_(rank == after_rank, models.BookEdition.edition_id > after_id)
+                )
+            )
+        stmt = stmt.order_by(rank.desc(), models.BookEdition.edition_id).limit(limit + 1)
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def list_tenant_books(
+        self,
+        tenant_id: uuid.UUID,
+        limit: int,
+        sort_by: BookSortField = BookSortField.TITLE,
+        order: SortOrder = SortOrder.ASC,
+        after: Optional[Tuple[Any, uuid.UUID]] = None,
+        category: Optional[str] = None,
+        low_stock: bool = False
+    ) -> List[Dict]:
+        """
+        One page of the tenant's catalogue with stock and pricing.
+
+        Sorting and filtering happen in SQL; pages are keyset-paginated on
+        (sort column, edition_id) via `after`. Returns up to limit + 1 rows.
+        Stock and price sorts walk the tenant's inventory indexes on those expressions.
+        """
+        category_name = func.coalesce(models.Category.name, "")
+        sort_columns = {
+            BookSortField.TITLE: models.Book.title,
+            BookSortField.AUTHOR: models.Book.author,
+            BookSortField.ISBN: models.BookEdition.isbn_number,
+            BookSortField.CATEGORY: category_name,
+            BookSortField.STOCK: AVAILABLE_QUANTITY,
+            BookSortField.SALE_PRICE: SALE_PRICE,
+            BookSortField.STOCK_VALUE: STOCK_VALUE,
+        }
+        sort_column = sort_columns[sort_by]
+
+        stmt = select(
+            models.BookEdition.edition_id,
+            models.Book.id.label("book_id"),
+            models.Book.title,
+            models.Book.author,
+            models.BookEdition.isbn_number,
+            models.BookEdition.format,
+            category_name.label("category"),
+            AVAILABLE_QUANTITY.label("available_quantity"),
+            models.Inventory.reorder_level,
+            models.Inventory.cost_price,
+            SALE_PRICE.label("sale_price"),
+            STOCK_VALUE.label("stock_value"),
+            sort_column.label("sort_key")
+        ).select_from(
+            models.Inventory
+        ).join(
+            models.BookEdition, models.Inventory.edition_id == models.BookEdition.edition_id
+        ).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).outerjoin(
+            models.Category, models.Book.category_id == models.Category.category_id
+        ).where(
+            models.Inventory.tenant_id == tenant_id
+        )
+
+        if category:
+            stmt = stmt.where(models.Category.name == category.lower().strip())
+        if low_stock:
+            stmt = stmt.where(AVAILABLE_QUANTITY <= models.Inventory.reorder_level)
+
+        # Tie-break on inventory's own edition_id so the whole key is in the index
+        key = tuple_(sort_column, models.Inventory.edition_id)
+        if order == SortOrder.DESC:
+            if after is not None:
+                stmt = stmt.where(key < tuple_(*after))
+            stmt = stmt.order_by(sort_column.desc(), models.Inventory.edition_id.desc())
+        else:
+            if after is not None:
+                stmt = stmt.where(key > tuple_(*after))
+            stmt = stmt.order_by(sort_column.asc(), models.Inventory.edition_id.asc())
+
+        result = await self.db.execute(stmt.limit(limit + 1))
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_suggest_entries(
+        self,
+        tenant_id: uuid.UUID,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Title, author and ISBN of every edition the tenant stocks, for the type-ahead index.
+        With `since`, only inventory rows created after that time; best-stocked editions first.
+        """
+        stmt = select(
+            models.BookEdition.edition_id,
+            models.Book.title,
+            models.Book.author,
+            models.BookEdition.isbn_number
+        ).select_from(
+            models.Inventory
+        ).join(
+            models.BookEdition, models.Inventory.edition_id == models.BookEdition.edition_id
+        ).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).where(
+            models.Inventory.tenant_id == tenant_id
+        )
+        if since is not None:
+            stmt = stmt.where(models.Inventory.created_at > since)
+        stmt = stmt.order_by(models.Inventory.quantity_on_hand.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def count_books(self, tenant_id: uuid.UUID) -> int:
+        """Distinct books the tenant stocks; the catalogue itself is shared by all tenants"""
+        stmt = select(func.count(distinct(models.BookEdition.book_id))).select_from(
+            models.Inventory
+        ).join(
+            models.BookEdition, models.Inventory.edition_id == models.BookEdition.edition_id
+        ).where(models.Inventory.tenant_id == tenant_id)
         result = await self.db.execute(stmt)
-        return result.scalar()
+        return result.scalar() or 0
 
     async def save(self, model: Union[models.Book, models.BookEdition, models.Category]) -> None:
         self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
+        await self.db.flush()
 
 
@@ -1,10 +1,15 @@
 from ...utils.result import ServiceResult
+from ...utils.pagination import encode_cursor, decode_cursor
 from ...db.session import SessionDep
+from functools import partial
+from ...db.unit_of_work import after_commit, transactional
 from .book_repository import BookRepository
-from .book_model import CSVBookCreate, BookCreateBase, BookEditionCreateBase
+from .book_suggest_index import suggest_indexes
+from .book_model import CSVBookCreate, BookCreateBase, BookEditionCreateBase, BookSortField, SortOrder
 from ..inventory.inventory_service import InventoryService
 from ..inventory.inventory_model import InventoryCreateBase
-from typing import List
+from typing import List, Optional
+from decimal import Decimal
 import uuid
 
 class BookService:
@@ -13,8 +18,15 @@ class BookService:
         self.repository = BookRepository(db)
         self.inventory_service = InventoryService(db)
 
+    @transactional
     async def add_bulk_books(self, books: List[CSVBookCreate], tenant_id: uuid.UUID) -> ServiceResult:
         try:
+            # Known ISBNs, books and categories resolve from the shared cache after this
+            await self.repository.warm_catalogue_cache(
+                isbns=[book.isbn_number for book in books],
+                category_names=[book.category.lower().strip() for book in books],
+                titles=[(book.title, book.author) for book in books]
+            )
             for book in books:
                 # create category if it doesn't exist
                 category_name = book.category.lower().strip()
@@ -55,6 +67,7 @@ class BookService:
                         success=False,
                         error=f"Failed to create inventory for book {book.title}: {inventory_item.error}"
                     )
+            after_commit(self.db, partial(suggest_indexes.mark_stale, tenant_id))
             return ServiceResult(
                 success=True,
                 data={
@@ -93,6 +106,115 @@ class BookService:
         except Exception as e:
             raise Exception(f"Database error while searching for book: {str(e)}")
         
+    async def get_books_by_tenant(
+        self,
+        tenant_id: uuid.UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort_by: BookSortField = BookSortField.TITLE,
+        order: SortOrder = SortOrder.ASC,
+        category: Optional[str] = None,
+        low_stock: bool = False
+    ) -> ServiceResult:
+        try:
+            after = None
+            if cursor:
+                values = decode_cursor(cursor)
+                if values.get("sort_by") != sort_by.value:
+                    raise ValueError("Cursor does not match sort order")
+                sort_key = values["key"]
+                if sort_by == BookSortField.STOCK:
+                    sort_key = int(sort_key)
+                elif sort_by in (BookSortField.SALE_PRICE, BookSortField.STOCK_VALUE):
+                    sort_key = Decimal(sort_key)
+                after = (sort_key, uuid.UUID(values["edition_id"]))
+
+            rows = await self.repository.list_tenant_books(
+                tenant_id, limit, sort_by, order, after, category, low_stock
+            )
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor({
+                    "sort_by": sort_by.value,
+                    "key": last["sort_key"],
+                    "edition_id": last["edition_id"]
+                })
+
+            return ServiceResult(
+                success=True,
+                data={
+                    "books": [{key: value for key, value in row.items() if key != "sort_key"} for row in rows],
+                    "next_cursor": next_cursor
+                },
+                message=f"{len(rows)} books retrieved"
+            )
+        except (ValueError, KeyError, TypeError, ArithmeticError):
+            return ServiceResult(
+                success=False,
+                error="Invalid pagination cursor"
+            )
+        except Exception as e:
+            return ServiceResult(
+                success=False,
+                error=f"Failed to retrieve books: {str(e)}"
+            )
+
+    async def search_books(self, query: str, tenant_id: uuid.UUID, limit: int = 20, cursor: Optional[str] = None) -> ServiceResult:
+        try:
+            after = None
+            if cursor:
+                values = decode_cursor(cursor)
+                after = (float(values["rank"]), uuid.UUID(values["edition_id"]))
+
+            rows = await self.repository.search_books(query, tenant_id, limit, after)
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor({"rank": last["rank"], "edition_id": last["edition_id"]})
+
+            return ServiceResult(
+                success=True,
+                data={
+                    "books": [{key: value for key, value in row.items() if key != "rank"} for row in rows],
+                    "next_cursor": next_cursor
+                },
+                message=f"{len(rows)} books found"
+            )
+        except (ValueError, KeyError, TypeError):
+            return ServiceResult(
+                success=False,
+                error="Invalid search cursor"
+            )
+        except Exception as e:
+            return ServiceResult(
+                success=False,
+                error=f"Failed to search books: {str(e)}"
+            )
+
+    async def suggest_books(self, query: str, tenant_id: uuid.UUID, limit: int = 10) -> ServiceResult:
+        try:
+            index = await suggest_indexes.get_index(tenant_id, self.repository)
+            return ServiceResult(
+                success=True,
+                data=[
+                    {
+                        "edition_id": entry.edition_id,
+                        "title": entry.title,
+                        "author": entry.author,
+                        "isbn_number": entry.isbn_number
+                    } for entry in index.search(query, limit)
+                ],
+                message="Suggestions retrieved successfully"
+            )
+        except Exception as e:
+            return ServiceResult(
+                success=False,
+                error=f"Failed to retrieve suggestions: {str(e)}"
+            )
+
     async def get_total_books_count(self, tenant_id: uuid.UUID) -> ServiceResult:
         try:
             total_books = await self.repository.count_books(tenant_id)
@@ -0,0 +1,191 @@
+"""
+In-process type-ahead index for /books/suggest.
+
+Each tenant gets a PrefixIndex over the title, author and ISBN tokens of the editions it
+stocks. Tokens are kept in a sorted list so a prefix lookup is two bisects, and keystrokes
+are answered from memory. The registry refreshes a tenant's index from Postgres only when
+it is missing, marked stale by a write, or older than the refresh interval.
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
+import heapq
+import re
+import time
+import uuid
+
+# Memory bounds: tenants kept resident and editions indexed per tenant
+MAX_TENANTS = 64
+MAX_EDITIONS_PER_TENANT = 100_000
+
+# New inventory rows are pulled in at most this often; a full rebuild drops removed editions
+REFRESH_SECONDS = 30
+REBUILD_SECONDS = 15 * 60
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class SuggestEntry:
+    edition_id: uuid.UUID
+    title: str
+    author: str
+    isbn_number: str
+
+
+class PrefixIndex:
+    """Sorted token arrays with bisect prefix lookup. Not thread-safe; used from the event loop only."""
+
+    def __init__(self, max_entries: int = MAX_EDITIONS_PER_TENANT):
+        self.max_entries = max_entries
+        self.entries: List[SuggestEntry] = []
+        self.slots: Dict[uuid.UUID, int] = {}
+        self.tokens: List[str] = []
+        self.token_slots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _entry_tokens(entry: SuggestEntry) -> Set[str]:
+        return set(tokenize(entry.title)) | set(tokenize(entry.author)) | {entry.isbn_number}
+
+    def build(self, entries: Iterable[SuggestEntry]) -> None:
+        """Replace the whole index in one pass."""
+        self.entries, self.slots = [], {}
+        pairs = []
+        for entry in entries:
+            if len(self.entries) >= self.max_entries:
+                break
+            slot = len(self.entries)
+            self.entries.append(entry)
+            self.slots[entry.edition_id] = slot
+            pairs.extend((token, slot) for token in self._entry_tokens(entry))
+        pairs.sort()
+        self.tokens = [token for token, _ in pairs]
+        self.token_slots = [slot for _, slot in pairs]
+
+    def add(self, entries: Iterable[SuggestEntry]) -> int:
+        """Insert new editions in place. Editions already indexed are skipped. Returns the number added."""
+        added = 0
+        for entry in entries:
+            if entry.edition_id in self.slots or len(self.entries) >= self.max_entries:
+                continue
+            slot = len(self.entries)
+            self.entries.append(entry)
+            self.slots[entry.edition_id] = slot
+            for token in self._entry_tokens(entry):
+                position = bisect_right(self.tokens, token)
+                self.tokens.insert(position, token)
+                self.token_slots.insert(position, slot)
+            added += 1
+        return added
+
+    def _prefix_slots(self, prefix: str) -> Set[int]:
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + "\uffff", start)
+        return set(self.token_slots[start:end])
+
+    def search(self, query: str, limit: int = 10) -> List[SuggestEntry]:
+        """
+        Editions where every query term prefixes some token.
+        Titles that start with the query come first, then shorter titles, then alphabetical.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Longest term first gives the smallest starting set
+        terms.sort(key=len, reverse=True)
+        matches = self._prefix_slots(terms[0])
+        for term in terms[1:]:
+            if not matches:
+                break
+            matches &= self._prefix_slots(term)
+
+        needle = query.strip().lower()
+        return heapq.nsmallest(
+            limit,
+            (self.entries[slot] for slot in matches),
+            key=lambda entry: (not entry.title.lower().startswith(needle), len(entry.title), entry.title.lower())
+        )
+
+
+class TenantIndex:
+    def __init__(self):
+        self.index = PrefixIndex()
+        self.lock = asyncio.Lock()
+        self.synced_at: Optional[datetime] = None
+        self.checked_at = 0.0
+        self.built_at = 0.0
+        self.stale = True
+
+
+class SuggestIndexRegistry:
+    """Process-wide LRU of tenant indexes."""
+
+    def __init__(self, max_tenants: int = MAX_TENANTS):
+        self.max_tenants = max_tenants
+        self._tenants: "OrderedDict[uuid.UUID, TenantIndex]" = OrderedDict()
+
+    def _get(self, tenant_id: uuid.UUID) -> TenantIndex:
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            tenant = self._tenants[tenant_id] = TenantIndex()
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+        else:
+            self._tenants.move_to_end(tenant_id)
+        return tenant
+
+    def mark_stale(self, tenant_id: uuid.UUID) -> None:
+        """Called after writes that add editions to a tenant's inventory in this process."""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is not None:
+            tenant.stale = True
+
+    def evict(self, tenant_id: uuid.UUID) -> None:
+        """Drop a tenant's index, e.g. after editions were removed or renamed."""
+        self._tenants.pop(tenant_id, None)
+
+    async def get_index(self, tenant_id: uuid.UUID, repository) -> PrefixIndex:
+        """
+        Return the tenant's index, refreshing it from the repository when due.
+
+        A missing or expired index is rebuilt from scratch; otherwise only inventory rows
+        created since the last sync are fetched and inserted.
+        """
+        tenant = self._get(tenant_id)
+        now = time.monotonic()
+        if not tenant.stale and now - tenant.checked_at < REFRESH_SECONDS:
+            return tenant.index
+
+        async with tenant.lock:
+            if not tenant.stale and now - tenant.checked_at < REFRESH_SECONDS:
+                return tenant.index
+
+            synced_at = datetime.now()
+            if tenant.synced_at is None or now - tenant.built_at >= REBUILD_SECONDS:
+                rows = await repository.get_suggest_entries(tenant_id, limit=MAX_EDITIONS_PER_TENANT)
+                tenant.index.build(SuggestEntry(**row) for row in rows)
+                tenant.built_at = now
+            else:
+                # Overlap the window so rows committed late are not missed; add() skips duplicates
+                since = tenant.synced_at - timedelta(seconds=REFRESH_SECONDS)
+                rows = await repository.get_suggest_entries(tenant_id, since=since)
+                tenant.index.add(SuggestEntry(**row) for row in rows)
+
+            tenant.synced_at = synced_at
+            tenant.checked_at = now
+            tenant.stale = False
+        return tenant.index
+
+
+suggest_indexes = SuggestIndexRegistry()
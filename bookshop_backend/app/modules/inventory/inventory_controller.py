@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from .inventory_service import InventoryService
+from fastapi.responses import StreamingResponse
+from .inventory_service import InventoryService, export_stock_valuation
 from ...db.session import SessionDep
 from ...utils.auth import (
     require_permission,
+    require_role,
     CurrentUser,
-    Permission
+    Permission,
+    UserRole
 )
 from typing import Annotated
+from datetime import date
 
 
 router = APIRouter()
@@ -24,4 +28,25 @@ async def get_inventory(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=result.error
         )
-    return result.data
\ No newline at end of file
+    return result.data
+
+@router.get('/valuation/export')
+async def export_inventory_valuation(
+    gzip: bool = False,
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """
+    Download cost, sale price, quantity and extended value for every edition in stock as CSV.
+    Rows are streamed from a server-side cursor; pass gzip=true for a compressed file.
+    Requires: Admin or Manager role
+    """
+    filename = f"stock-valuation-{date.today().isoformat()}.csv"
+    media_type = "text/csv"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_stock_valuation(user.tenant_id, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -4,7 +4,7 @@ from sqlalchemy import func, Row
 import uuid
 from .inventory_model import InventoryCreateBase
 from ...db import models
-from typing import Union, List, TypedDict, Dict, Any
+from typing import Union, List, TypedDict, Dict, Any, AsyncIterator
 from decimal import Decimal
 
 class TopInventoryItem(TypedDict):
@@ -17,6 +17,9 @@ class TopInventoryItem(TypedDict):
     sale_price: Decimal
     stock: int
 
+# Rows fetched per round trip from a server-side cursor
+STREAM_BATCH_SIZE = 2000
+
 class InventoryRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -160,6 +163,40 @@ class InventoryRepository:
             print(f"Error getting total inventory items: {str(e)}")
             return 0
 
+    async def stream_stock_valuation(self, tenant_id: uuid.UUID) -> AsyncIterator[Row]:
+        """
+        Stock valuation per edition, read through a server-side cursor so memory
+        stays flat regardless of catalogue size.
+        """
+        sale_price = models.Inventory.cost_price * (1 + models.Inventory.profit) * (1 - models.Inventory.discount)
+        stmt = select(
+            models.BookEdition.isbn_number,
+            models.Book.title,
+            models.Book.author,
+            models.BookEdition.format,
+            models.Inventory.location,
+            models.Inventory.quantity_on_hand,
+            models.Inventory.quantity_reserved,
+            models.Inventory.cost_price,
+            func.round(sale_price, 2).label("sale_price"),
+            (models.Inventory.quantity_on_hand * models.Inventory.cost_price).label("cost_value"),
+            func.round(models.Inventory.quantity_on_hand * sale_price, 2).label("retail_value")
+        ).select_from(
+            models.Inventory
+        ).join(
+            models.BookEdition, models.Inventory.edition_id == models.BookEdition.edition_id
+        ).join(
+            models.Book, models.BookEdition.book_id == models.Book.id
+        ).where(
+            models.Inventory.tenant_id == tenant_id
+        ).order_by(
+            models.Book.title, models.BookEdition.isbn_number
+        ).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+        result = await self.db.stream(stmt)
+        async for row in result:
+            yield row
+
     async def create_inventory(self, inventory_data: InventoryCreateBase) -> models.Inventory:
         new_inventory = models.Inventory(**inventory_data.dict())
         await self.save_inventory(new_inventory)
@@ -176,10 +213,9 @@ class InventoryRepository:
     async def delete_inventory_item(self, inventory_item: models.Inventory) -> None:
         """Delete an inventory item."""
         await self.db.delete(inventory_item)
-        await self.db.commit()
+        await self.db.flush()
 
     async def save_inventory(self, inventory: models.Inventory) -> models.Inventory:
         self.db.add(inventory)
-        await self.db.commit()
-        await self.db.refresh(inventory)
+        await self.db.flush()
         return inventory
\ No newline at end of file
@@ -1,14 +1,26 @@
 from ...utils.result import ServiceResult
 from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
+from ...db.base import async_session_maker
+from ...utils.streaming import csv_stream, gzip_stream
 from .inventory_repository import InventoryRepository
 from .inventory_model import InventoryCreateBase
+from ..tenants.tenant_metrics_repository import TenantMetricsRepository
+from typing import AsyncIterator
 import uuid
 
+STOCK_VALUATION_COLUMNS = [
+    "isbn", "title", "author", "format", "location", "quantity_on_hand", "quantity_reserved",
+    "cost_price", "sale_price", "cost_value", "retail_value"
+]
+
 class InventoryService:
     def __init__(self, db: SessionDep):
         self.db = db
         self.repository = InventoryRepository(db)
+        self.metrics = TenantMetricsRepository(db)
 
+    @transactional
     async def create_inventory_item(self, inventory_data: InventoryCreateBase) -> ServiceResult:
         try:
             inventory_item = await self.repository.get_inventory_by_edition_id_tenant_id(
@@ -26,12 +38,18 @@ class InventoryService:
                         success=False,
                         error="Failed to update inventory item quantity"
                     )
+                await self.metrics.add_stock(
+                    inventory_item.tenant_id, inventory_data.quantity_on_hand, inventory_item.cost_price
+                )
                 return ServiceResult(
                     success=True,
                     data=inventory_item,
                 )
 
             new_inventory = await self.repository.create_inventory(inventory_data)
+            await self.metrics.add_stock(
+                new_inventory.tenant_id, new_inventory.quantity_on_hand, new_inventory.cost_price, new_sku=True
+            )
             return ServiceResult(
                 success=True,
                 data=new_inventory
@@ -42,6 +60,7 @@ class InventoryService:
                 error=f"Failed to create inventory item: {str(e)}"
             )
 
+    @transactional
     async def update_inventory_quantity(self, inventory_id: uuid.UUID, quantity: int) -> ServiceResult:
         try:
             inventory_item = await self.repository.get_inventory_by_id(inventory_id)
@@ -54,6 +73,7 @@ class InventoryService:
                 inventory_item=inventory_item,
                 quantity=quantity
             )
+            await self.metrics.add_stock(updated_inventory.tenant_id, quantity, updated_inventory.cost_price)
             return ServiceResult(
                 success=True,
                 data=updated_inventory
@@ -93,4 +113,20 @@ class InventoryService:
             return ServiceResult(
                 error=e,
                 success=False
-            )
\ No newline at end of file
+            )
+
+
+async def export_stock_valuation(tenant_id: uuid.UUID, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Stream the tenant's stock valuation as CSV.
+
+    Opens its own session: the response body is produced after the request's
+    dependencies have been torn down.
+    """
+    async with async_session_maker() as session:
+        rows = InventoryRepository(session).stream_stock_valuation(tenant_id)
+        chunks = csv_stream(STOCK_VALUATION_COLUMNS, rows)
+        if compress:
+            chunks = gzip_stream(chunks)
+        async for chunk in chunks:
+            yield chunk
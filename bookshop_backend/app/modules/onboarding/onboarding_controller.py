@@ -5,7 +5,7 @@ from app.db.session import SessionDep
 from ..tenants.tenants_model import TenantCreate
 from ..user.user_model import UserCreate
 from .onboarding_service import OnboardingService
-from .onboarding_model import TenantCreate as OnboardingTenantCreate
+from .onboarding_model import TenantCreate as OnboardingTenantCreate, TenantBatchCreate
 from ...utils.auth import (
     get_current_user,
     require_role,
@@ -53,6 +53,33 @@ async def create_tenant_admin(
     
     return response_data
 
+@router.post('/create-tenant-admin/batch', status_code=status.HTTP_201_CREATED)
+async def create_tenant_admins(
+    db: SessionDep,
+    batch: TenantBatchCreate,
+    user: CurrentUser = Depends(require_role([UserRole.SUPERADMIN]))
+):
+    """Create many tenants with their admin users in one transaction."""
+    service = OnboardingService(db)
+
+    result = await service.create_tenants_with_admins(batch.tenants)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+
+    return {
+        "message": result.message,
+        "tenants": [
+            {
+                "id": str(tenant.id),
+                "name": tenant.name,
+                "admin_email": admin.email
+            } for tenant, admin in result.data
+        ]
+    }
+
 @router.get('/tenants', status_code=status.HTTP_200_OK)
 async def list_tenants(
     db: SessionDep,
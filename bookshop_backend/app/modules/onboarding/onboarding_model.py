@@ -1,7 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List
 from ..user.user_model import UserCreate
 from ..tenants.tenants_model import TenantCreate
 
+# Shops provisioned per request, all in one transaction
+MAX_ONBOARDING_BATCH = 1000
+
 class TenantCreate(BaseModel):
     tenant: TenantCreate
     admin: UserCreate
@@ -22,3 +26,7 @@ class TenantCreate(BaseModel):
                 }
             }
         }
+
+
+class TenantBatchCreate(BaseModel):
+    tenants: List[TenantCreate] = Field(..., min_length=1, max_length=MAX_ONBOARDING_BATCH)
@@ -0,0 +1,25 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from typing import Iterable, List, Set
+from ...db import models
+
+
+class OnboardingRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_taken_names(self, names: Iterable[str]) -> Set[str]:
+        """Which of `names` already belong to a tenant, ignoring case, in one query (lowercased)"""
+        lowered = func.lower(models.Tenant.name)
+        result = await self.db.execute(select(lowered).where(lowered.in_([name.strip().lower() for name in names])))
+        return set(result.scalars().all())
+
+    async def get_taken_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Which of `emails` are already used by a user, in one query"""
+        result = await self.db.execute(select(models.User.email).where(models.User.email.in_(list(emails))))
+        return set(result.scalars().all())
+
+    async def add_all(self, objects: List[object]) -> None:
+        """Stage a batch of new rows; the flush sends one multi-row INSERT per table"""
+        self.db.add_all(objects)
+        await self.db.flush()
@@ -1,66 +1,129 @@
 from sqlalchemy.exc import IntegrityError
+from collections import Counter
+from datetime import datetime
+from typing import List, Tuple
+from ...db import models
 from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
 from ...utils.result import ServiceResult
+from ...utils.password_manager import hash_passwords
 from ..user.user_service import UserService
 from ..user.user_model import UserCreate
 from ..tenants.tenants_service import TenantService
+from ..tenants.tenant_context import DEFAULT_TIME_ZONE, DEFAULT_CURRENCY
+from ..sales.receipts import DEFAULT_TEMPLATE
+from .onboarding_model import TenantCreate
+from .onboarding_repository import OnboardingRepository
+
+# Every new shop starts with standard-rated VAT as its default rate
+DEFAULT_TAX_NAME = "vat"
+DEFAULT_TAX_RATE = 0.16
+DEFAULT_TAX_DESCRIPTION = "Value Added Tax (standard rate)"
 
 
 class OnboardingService:
     def __init__(self, db: SessionDep):
         self.db = db
+        self.repository = OnboardingRepository(db)
         self.user_service = UserService(db)
         self.tenants_service = TenantService(db)
 
+    async def _provision(self, entries: List[TenantCreate]) -> ServiceResult:
+        """
+        Stage tenants with their admin, default Settings, default tax rate and receipt
+        template. Names and emails are checked with one query each, passwords are hashed
+        in parallel off the event loop, and all rows go out in a single flush.
+        """
+        names = [entry.tenant.name for entry in entries]
+        emails = [entry.admin.email for entry in entries]
+        # Tenant names are unique regardless of case
+        conflicts = [f"Tenant name '{name}' appears more than once" for name, count in Counter(name.strip().lower() for name in names).items() if count > 1]
+        conflicts += [f"Admin email '{email}' appears more than once" for email, count in Counter(emails).items() if count > 1]
+        taken = await self.repository.get_taken_names(names)
+        conflicts += [f"Tenant with name '{name}' already exists" for name in names if name.strip().lower() in taken]
+        conflicts += [f"User with email '{email}' already exists" for email in sorted(await self.repository.get_taken_emails(emails))]
+        if conflicts:
+            return ServiceResult(success=False, error="; ".join(conflicts))
+
+        hashed_passwords = await hash_passwords([entry.admin.password for entry in entries])
+
+        now = datetime.now()
+        rows: List[object] = []
+        created: List[Tuple[models.Tenant, models.User]] = []
+        for entry, password in zip(entries, hashed_passwords):
+            tenant = models.Tenant(**entry.tenant.model_dump())
+            admin = models.User(
+                email=entry.admin.email,
+                phone_number=entry.admin.phone_number,
+                full_name=entry.admin.full_name,
+                password=password,
+                tenant_id=tenant.id,
+                user_role="admin"
+            )
+            rows += [
+                tenant,
+                admin,
+                models.Settings(tenant_id=tenant.id, time_zone=DEFAULT_TIME_ZONE, currency=DEFAULT_CURRENCY),
+                models.TaxRates(
+                    tenant_id=tenant.id,
+                    name=DEFAULT_TAX_NAME,
+                    rate=DEFAULT_TAX_RATE,
+                    description=DEFAULT_TAX_DESCRIPTION,
+                    default=True,
+                    effective_date=now
+                ),
+                models.ReceiptTemplates(tenant_id=tenant.id, template=DEFAULT_TEMPLATE)
+            ]
+            created.append((tenant, admin))
+
+        await self.repository.add_all(rows)
+        return ServiceResult(data=created, success=True)
+
+    @transactional
     async def create_tenant_with_admin(self, tenant_data, user_data: UserCreate) -> ServiceResult:
-        tenant_result = None
+        """
+        Create a tenant, its admin user and their defaults in one transaction: if any
+        step fails, nothing is kept.
+        """
         try:
-            # Create tenant first (without transaction wrapper)
-            tenant_result = await self.tenants_service.create_tenant(tenant_data)
-            if not tenant_result.success:
-                return ServiceResult(success=False, error=tenant_result.error)
-            
-            # Set tenant ID for the user
-            user_data.tenant_id = tenant_result.data.id
-            user_data.user_role = "admin"
-            
-            # Create admin user
-            user_result = await self.user_service.create_user(user_data)
-            if not user_result.success:
-                # If user creation fails, rollback by deleting the tenant
-                try:
-                    await self.tenants_service.delete_tenant(str(tenant_result.data.id))
-                except Exception as cleanup_error:
-                    print(f"Failed to cleanup tenant after user creation error: {cleanup_error}")
-                
-                return ServiceResult(success=False, error=f"Failed to create admin user: {user_result.error}")
+            result = await self._provision([TenantCreate(tenant=tenant_data, admin=user_data)])
+            if not result.success:
+                return result
 
+            tenant, admin = result.data[0]
             return ServiceResult(
                 data={
-                    "tenant": tenant_result.data,
-                    "user": user_result.data
+                    "tenant": tenant,
+                    "user": admin
                 },
                 success=True,
                 message="Tenant and admin user created successfully"
             )
         except IntegrityError as e:
-            # Cleanup tenant if it was created
-            if tenant_result and tenant_result.success:
-                try:
-                    await self.tenants_service.delete_tenant(str(tenant_result.data.id))
-                except Exception as cleanup_error:
-                    print(f"Failed to cleanup tenant after integrity error: {cleanup_error}")
-            
             return ServiceResult(success=False, error=f"Database integrity error: {str(e)}")
         except Exception as e:
-            # Cleanup tenant if it was created
-            if tenant_result and tenant_result.success:
-                try:
-                    await self.tenants_service.delete_tenant(str(tenant_result.data.id))
-                except Exception as cleanup_error:
-                    print(f"Failed to cleanup tenant after error: {cleanup_error}")
-            
             return ServiceResult(success=False, error=f"Failed to create tenant: {str(e)}")
+
+    @transactional
+    async def create_tenants_with_admins(self, entries: List[TenantCreate]) -> ServiceResult:
+        """
+        Onboard a batch of shops in one transaction. Any conflict (a duplicate name or
+        email, within the batch or with existing data) rejects the whole batch.
+        """
+        try:
+            result = await self._provision(entries)
+            if not result.success:
+                return result
+
+            return ServiceResult(
+                data=result.data,
+                success=True,
+                message=f"{len(result.data)} tenants created successfully"
+            )
+        except IntegrityError as e:
+            return ServiceResult(success=False, error=f"Database integrity error: {str(e)}")
+        except Exception as e:
+            return ServiceResult(success=False, error=f"Failed to create tenants: {str(e)}")
         
     async def get_tenants(self) -> ServiceResult:
         """List all tenants."""
@@ -102,6 +165,7 @@ class OnboardingService:
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
             
+    @transactional
     async def remove_tenant(self, tenant_id: str) -> ServiceResult:
         """Remove a tenant and its associated users."""
         try:
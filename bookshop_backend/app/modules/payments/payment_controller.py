@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, status, Body, Response, Path, Depends
+from fastapi import APIRouter, HTTPException, status, Body, Response, Path, Depends, Header
+from typing import Optional
+from functools import partial
 from ...db.session import SessionDep
+from ...db.idempotency import KEY_REUSED_ERROR, run_idempotent
 from ...utils.auth import (
     get_current_user,
     require_role,
@@ -20,28 +23,38 @@ async def create_mpesa_qr_intent(
     db: SessionDep,
     amount: float = Body(..., gt=0, description="Amount for the M-Pesa QR payment"),
     phone_number: str = Body(..., min_length=10, max_length=15, description="Customer's phone number for M-Pesa QR payment"),
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Client-generated key; retries with the same key return the first intent"),
     user: CurrentUser = Depends(require_permission(Permission.WRITE_SALES))  # Payment creation requires sales permission
 ):
     """
     Create a new M-Pesa QR payment intent.
+    A retry carrying the same Idempotency-Key returns the original intent instead of
+    creating a second one.
     Requires: Write sales permission (Admin/Manager/Cashier)
     """
     service = PaymentService(db)
     
-    result = await service.create_mpesa_qr_intent(
-        amount=amount, 
-        phone_number=phone_number,
-        tenant_id=user.tenant_id,
-        user_id=user.user_id
+    result = await run_idempotent(
+        db, user.tenant_id, "payment_intents", idempotency_key,
+        {"amount": amount, "phone_number": phone_number},
+        partial(
+            service.create_mpesa_qr_intent,
+            amount=amount, 
+            phone_number=phone_number,
+            tenant_id=user.tenant_id,
+            user_id=user.user_id
+        )
     )
     
     if not result.success:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY if result.error == KEY_REUSED_ERROR else status.HTTP_400_BAD_REQUEST,
             detail=result.error
         )
     
     response.status_code = status.HTTP_201_CREATED
+    if result.message == "replayed":
+        response.headers["Idempotent-Replayed"] = "true"
     return result.data
 
 @router.get("/mpesa/qr-status/{transaction_id}", status_code=status.HTTP_200_OK)
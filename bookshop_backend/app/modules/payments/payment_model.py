@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+import uuid
+
+
+class PaymentIntentResponse(BaseModel):
+    intent_id: uuid.UUID = Field(..., validation_alias="id")
+    provider: str
+    amount: Decimal
+    phone_number: str
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from typing import Optional
+import uuid
+from ...db import models
+
+
+class PaymentRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_intent(self, intent: models.PaymentIntent) -> models.PaymentIntent:
+        self.db.add(intent)
+        await self.db.flush()
+        return intent
+
+    async def get_intent(self, intent_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[models.PaymentIntent]:
+        result = await self.db.execute(
+            select(models.PaymentIntent).where(
+                models.PaymentIntent.id == intent_id,
+                models.PaymentIntent.tenant_id == tenant_id
+            )
+        )
+        return result.scalar_one_or_none()
@@ -1,8 +1,47 @@
 from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
+from ...db import models
+from ...utils.result import ServiceResult
+from .payment_model import PaymentIntentResponse
+from .payment_repository import PaymentRepository
+from decimal import Decimal
+from typing import Optional
+import uuid
 
 class PaymentService:
     def __init__(self, db_session: SessionDep):
-        self.db_session = db_session
+        self.db = db_session
+        self.repository = PaymentRepository(db_session)
+
+    @transactional
+    async def create_mpesa_qr_intent(self, amount: float, phone_number: str, tenant_id: uuid.UUID,
+                                     user_id: Optional[uuid.UUID] = None) -> ServiceResult:
+        """
+        Record a pending M-Pesa QR payment for the till to show. The intent is what a
+        retried request must not create twice; the provider confirms it later.
+        """
+        try:
+            intent = await self.repository.create_intent(
+                models.PaymentIntent(
+                    tenant_id=tenant_id,
+                    provider="mpesa_qr",
+                    amount=Decimal(str(amount)).quantize(Decimal("0.01")),
+                    phone_number=phone_number,
+                    created_by=user_id
+                )
+            )
+            return ServiceResult(success=True, data=PaymentIntentResponse.model_validate(intent))
+        except Exception as e:
+            return ServiceResult(success=False, error=f"Failed to create payment intent: {str(e)}")
+
+    async def get_mpesa_qr_intent(self, intent_id: str, tenant_id: uuid.UUID) -> ServiceResult:
+        try:
+            intent = await self.repository.get_intent(uuid.UUID(intent_id), tenant_id)
+        except ValueError:
+            intent = None
+        if intent is None:
+            return ServiceResult(success=False, error="Payment intent not found")
+        return ServiceResult(success=True, data=PaymentIntentResponse.model_validate(intent))
 
     async def process_payment(self, payment_data):
         # Logic to process payment
@@ -18,4 +57,4 @@ class PaymentService:
 
     async def handle_mpesa_payment(self, phone_number, amount):
         # Logic to handle M-Pesa payments
-        pass
\ No newline at end of file
+        pass
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Body, Response, status, HTTPException, Request, Depends, Query
 from typing import Annotated, List, Optional
+import uuid
 from ...db.session import SessionDep
 from .purchase_order_service import PurchaseOrderService
-from .purchase_order_model import PurchaseOrderCreate
+from .purchase_order_model import PurchaseOrderCreate, PurchaseOrderReceive
 from ...utils.auth import (
     require_permission,
     require_role,
@@ -78,4 +79,21 @@ async def update_purchase_order_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result.error
         )
-    return result.data
\ No newline at end of file
+    return result.data
+
+@router.post("/{po_id}/receive")
+async def receive_purchase_order(
+    po_id: uuid.UUID,
+    receipt: PurchaseOrderReceive,
+    db: SessionDep,
+    user: CurrentUser = Depends(require_permission(Permission.MANAGE_PURCHASE_ORDERS))
+):
+    """Receive delivered quantities per line, update inventory and move the order to partial/received"""
+    service = PurchaseOrderService(db)
+    result = await service.receive_purchase_order(po_id=po_id, tenant_id=user.tenant_id, receipt=receipt)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+    return result.data
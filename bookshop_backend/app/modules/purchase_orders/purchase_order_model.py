@@ -9,7 +9,7 @@ class PurchaseOrderItemCreate(BaseModel):
     po_id: Optional[uuid.UUID] = Field(default=None, description="Purchase Order ID")
     edition_id: uuid.UUID = Field(..., description="Book edition ID")
     quantity_ordered: int = Field(..., gt=0, description="Quantity to order")
-    unit_cost: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2, description="Unit cost price")
+    unit_cost: Optional[Decimal] = Field(None, gt=0, max_digits=10, decimal_places=2, description="Unit cost price; defaults to the supplier's catalogue price")
 
 class PurchaseOrderCreate(BaseModel):
     supplier_id: uuid.UUID = Field(..., description="Supplier ID")
@@ -20,6 +20,13 @@ class PurchaseOrderCreate(BaseModel):
             Decimal: float
         }
 
+class PurchaseOrderReceiveItem(BaseModel):
+    item_id: uuid.UUID = Field(..., description="Purchase order line ID")
+    quantity_received: int = Field(..., gt=0, description="Quantity received on this delivery")
+
+class PurchaseOrderReceive(BaseModel):
+    items: List[PurchaseOrderReceiveItem] = Field(..., min_items=1, description="Received quantities per purchase order line")
+
 class PurchaseOrderItemResponse(BaseModel):
     id: uuid.UUID
     edition_id: uuid.UUID
@@ -48,9 +55,12 @@ class SupplierInfo(BaseModel):
 
 class BooksInfo(BaseModel):
     id: uuid.UUID
+    itemId: Optional[uuid.UUID] = None
     title: str
     isbn: str
     quantity: int
+    quantityReceived: int = 0
+    receivedAt: Optional[datetime] = None
     unitPrice: float
     subtotal: float
 
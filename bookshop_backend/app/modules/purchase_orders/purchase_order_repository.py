@@ -1,9 +1,13 @@
+from sqlalchemy import case
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import select, func
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import uuid
+from datetime import datetime
 from decimal import Decimal
 from ...db import models
+from ...db.audit import audit_core_write
 from .purchase_order_model import PurchaseOrderData, PurchaseOrderItemCreate
 from .purchase_order_utils import generate_order_number, calculate_expected_delivery_date
 
@@ -37,15 +41,23 @@ class PurchaseOrderRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def get_purchase_order_by_id(self, po_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[models.PurchaseOrder]:
-        """Get purchase order by ID"""
+    async def get_purchase_order_by_id(self, po_id: uuid.UUID, tenant_id: uuid.UUID, for_update: bool = False) -> Optional[models.PurchaseOrder]:
+        """Get purchase order by ID, optionally locking the row until the transaction ends"""
         stmt = select(models.PurchaseOrder).where(
             models.PurchaseOrder.id == po_id,
             models.PurchaseOrder.tenant_id == tenant_id
         )
+        if for_update:
+            stmt = stmt.with_for_update()
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_purchase_order_lines(self, po_id: uuid.UUID) -> List[models.PurchaseOrderItems]:
+        """Get the line items of a purchase order as ORM objects"""
+        stmt = select(models.PurchaseOrderItems).where(models.PurchaseOrderItems.po_id == po_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
     async def get_purchase_order_supplier(self, po_number: str, tenant_id: uuid.UUID) -> Optional[models.PurchaseOrder]:
         """Get purchase order along with supplier details by ID"""
         stmt = select(
@@ -81,9 +93,12 @@ class PurchaseOrderRepository:
         """Get all items for a specific purchase order"""
         stmt = select(
             models.Book.id,
+            models.PurchaseOrderItems.id.label("item_id"),
             models.Book.title,
             models.BookEdition.isbn_number.label("isbn"),
             models.PurchaseOrderItems.quantity_ordered.label("quantity"),
+            models.PurchaseOrderItems.quantity_received,
+            models.PurchaseOrderItems.received_at,
             models.PurchaseOrderItems.unit_cost.label("unitPrice"),
             (models.PurchaseOrderItems.quantity_ordered * models.PurchaseOrderItems.unit_cost).label("subtotal")
         ).select_from(
@@ -105,9 +120,12 @@ class PurchaseOrderRepository:
         return [
             {
                 "id": row.id,
+                "itemId": row.item_id,
                 "title": row.title,
                 "isbn": row.isbn,
                 "quantity": row.quantity,
+                "quantityReceived": row.quantity_received,
+                "receivedAt": row.received_at,
                 "unitPrice": float(row.unitPrice),
                 "subtotal": float(row.subtotal)
             } for row in rows
@@ -213,6 +231,33 @@ class PurchaseOrderRepository:
         db_po_item = models.PurchaseOrderItems(**po_item_data.dict())
         return await self.save(db_po_item)
 
+    async def create_purchase_orders_bulk(
+        self,
+        tenant_id: uuid.UUID,
+        orders: List[Tuple[PurchaseOrderData, List[PurchaseOrderItemCreate]]]
+    ) -> List[models.PurchaseOrder]:
+        """
+        Create several purchase orders with their items in a single flush.
+        Order numbers are allocated sequentially from the tenant's latest one.
+        """
+        order_number = await self.get_next_order_number(tenant_id)
+        created = []
+        for po_data, items in orders:
+            db_po = models.PurchaseOrder(
+                **po_data.dict(exclude={"order_number"}),
+                order_number=order_number,
+                expected_delivery_date=calculate_expected_delivery_date()
+            )
+            db_po.purchase_order_items = [
+                models.PurchaseOrderItems(**item.dict(exclude={"po_id"})) for item in items
+            ]
+            created.append(db_po)
+            order_number = generate_order_number(order_number)
+
+        self.db.add_all(created)
+        await self.db.flush()
+        return created
+
     async def update_purchase_order(self, po: models.PurchaseOrder, updates: dict) -> models.PurchaseOrder:
         """
         Update an existing purchase order in the database.
@@ -221,9 +266,88 @@ class PurchaseOrderRepository:
             setattr(po, key, value)
         return await self.save(po)
 
+    async def receive_purchase_order(
+        self,
+        po: models.PurchaseOrder,
+        lines: List[models.PurchaseOrderItems],
+        received: Dict[uuid.UUID, int],
+        stock_by_edition: Dict[uuid.UUID, Tuple[int, Decimal]],
+        new_status: str
+    ) -> models.PurchaseOrder:
+        """
+        Apply a delivery to inventory and the purchase order in one transaction.
+
+        All received stock goes in through a single multi-row INSERT ... ON CONFLICT,
+        which adds to quantity_on_hand and blends cost_price into a weighted average.
+        Stock oversold to zero or below has no cost to blend with, so it takes the
+        received unit cost. The rows it will update are read (and locked) first for
+        the audit log.
+        """
+        now = datetime.now()
+        inventory = models.Inventory.__table__
+        result = await self.db.execute(
+            select(inventory.c.edition_id, inventory.c.quantity_on_hand, inventory.c.cost_price).where(
+                inventory.c.tenant_id == po.tenant_id,
+                inventory.c.edition_id.in_(list(stock_by_edition))
+            ).with_for_update()
+        )
+        before = {
+            edition_id: {"quantity_on_hand": quantity, "cost_price": cost_price}
+            for edition_id, quantity, cost_price in result.all()
+        }
+
+        stmt = pg_insert(inventory).values([
+            {
+                "tenant_id": po.tenant_id,
+                "edition_id": edition_id,
+                "quantity_on_hand": quantity,
+                "cost_price": round(unit_cost, 2),
+                "created_at": now,
+                "updated_at": now,
+            } for edition_id, (quantity, unit_cost) in stock_by_edition.items()
+        ])
+        new_quantity = inventory.c.quantity_on_hand + stmt.excluded.quantity_on_hand
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_inventory_tenant_edition",
+            set_={
+                "quantity_on_hand": new_quantity,
+                "cost_price": case(
+                    (inventory.c.quantity_on_hand <= 0, stmt.excluded.cost_price),
+                    else_=func.round(
+                        (inventory.c.quantity_on_hand * inventory.c.cost_price
+                         + stmt.excluded.quantity_on_hand * stmt.excluded.cost_price) / new_quantity,
+                        2
+                    )
+                ),
+                "updated_at": stmt.excluded.updated_at,
+            }
+        ).returning(inventory.c.inventory_id, inventory.c.edition_id, inventory.c.quantity_on_hand, inventory.c.cost_price)
+        result = await self.db.execute(stmt)
+        for inventory_id, edition_id, quantity, cost_price in result.all():
+            after = {"quantity_on_hand": quantity, "cost_price": cost_price}
+            if edition_id in before:
+                audit_core_write(self.db, inventory, po.tenant_id, inventory_id, "update", old=before[edition_id], new=after)
+            else:
+                audit_core_write(self.db, inventory, po.tenant_id, inventory_id, "insert",
+                                 new={"tenant_id": po.tenant_id, "edition_id": edition_id, **after})
+
+        # Line totals, receipt times and the status are flushed together as one batched UPDATE set
+        for line in lines:
+            if line.id in received:
+                line.quantity_received += received[line.id]
+                line.received_at = now
+        po.status = new_status
+        po.updated_at = now
+        if po.first_received_at is None:
+            po.first_received_at = now
+        if new_status == "received":
+            po.received_at = now
+
+        await self.db.flush()
+        return po
+
     async def save(self, model: Union[models.PurchaseOrder, models.PurchaseOrderItems]) -> Union[models.PurchaseOrder, models.PurchaseOrderItems]:
         """Save or update a purchase order in the database."""
         self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
+        await self.db.flush()
         return model
\ No newline at end of file
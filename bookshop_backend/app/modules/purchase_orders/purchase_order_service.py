@@ -1,17 +1,46 @@
 from ...db.session import SessionDep
+from functools import partial
+from ...db.unit_of_work import after_commit, transactional
 from .purchase_order_repository import PurchaseOrderRepository
-from .purchase_order_model import PurchaseOrderCreate, PurchaseOrderData, PurchaseOrderItemCreate, PurchaseOrderListResponse, PurchaseOrderDetailsResponse
+from .purchase_order_model import PurchaseOrderCreate, PurchaseOrderData, PurchaseOrderItemCreate, PurchaseOrderListResponse, PurchaseOrderDetailsResponse, PurchaseOrderReceive
+from .purchase_order_utils import summarise_receipt
+from ..books.book_suggest_index import suggest_indexes
+from ..tenants.tenant_metrics_repository import TenantMetricsRepository
+from ..suppliers.supplier_service import invalidate_supplier_dashboard
+from ..suppliers.supplier_catalog_repository import SupplierCatalogRepository
 from ...utils.result import ServiceResult
-from typing import List, Optional
+from typing import Dict, List, Optional
+from datetime import datetime
 import uuid
 
+# Orders in these states can no longer take deliveries
+CLOSED_STATUSES = ["rejected", "received", "cancelled", "completed"]
+
 
 class PurchaseOrderService:
     def __init__(self, db: SessionDep):
+        self.db = db
         self.repository = PurchaseOrderRepository(db)
+        self.metrics = TenantMetricsRepository(db)
+        self.catalog = SupplierCatalogRepository(db)
 
+    @transactional
     async def create_purchase_order(self, tenant_id: str, po_data: PurchaseOrderCreate) -> ServiceResult:
         try:
+            # Lines without a typed cost take the supplier's catalogue price, fetched in one query
+            unpriced = [item.edition_id for item in po_data.books if item.unit_cost is None]
+            if unpriced:
+                costs = await self.catalog.get_costs(tenant_id, po_data.supplier_id, unpriced)
+                missing = [str(edition_id) for edition_id in unpriced if edition_id not in costs]
+                if missing:
+                    return ServiceResult(
+                        error=f"No unit cost given or in the supplier catalogue for editions: {', '.join(missing)}",
+                        success=False
+                    )
+                for item in po_data.books:
+                    if item.unit_cost is None:
+                        item.unit_cost = costs[item.edition_id]
+
             new_po = PurchaseOrderData(
                 tenant_id=tenant_id,
                 supplier_id=po_data.supplier_id,
@@ -39,6 +68,7 @@ class PurchaseOrderService:
                         error="Failed to create purchase order item",
                         success=False
                     )
+            after_commit(self.db, partial(invalidate_supplier_dashboard, tenant_id))
             return ServiceResult(
                 data=result.id,
                 message="Purchase order created successfully",
@@ -107,11 +137,12 @@ class PurchaseOrderService:
                 success=False
             )
 
+    @transactional
     async def update_purchase_order_status(self, po_id: str, tenant_id: str, new_status: str) -> ServiceResult:
         """Update the status of a purchase order"""
         try:
             # Validate status
-            valid_statuses = ["pending", "approved", "rejected", "received", "cancelled", "partial", "completed"]
+            valid_statuses = ["draft", "pending", "approved", "rejected", "received", "cancelled", "partial", "completed"]
             if new_status not in valid_statuses:
                 return ServiceResult(
                     error=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
@@ -128,12 +159,22 @@ class PurchaseOrderService:
 
             # Update the purchase order status
             existing_po.status = new_status
+            existing_po.updated_at = datetime.now()
+            if new_status in ("received", "completed") and existing_po.received_at is None:
+                # Closed by hand rather than through a receipt. An order closed with nothing
+                # delivered gets no receipt time, so it never counts towards lead times
+                lines = await self.repository.get_purchase_order_lines(existing_po.id)
+                if any(line.quantity_received > 0 for line in lines):
+                    existing_po.received_at = existing_po.updated_at
+                    if existing_po.first_received_at is None:
+                        existing_po.first_received_at = existing_po.updated_at
             result = await self.repository.save(existing_po)
             if not result:
                 return ServiceResult(
                     error="Purchase order update failed",
                     success=False
                 )
+            after_commit(self.db, partial(invalidate_supplier_dashboard, tenant_id))
 
             return ServiceResult(
                 data=result,
@@ -144,4 +185,57 @@ class PurchaseOrderService:
             return ServiceResult(
                 error=f"Failed to update purchase order status: {e}",
                 success=False
-            )
\ No newline at end of file
+            )
+
+    @transactional
+    async def receive_purchase_order(self, po_id: uuid.UUID, tenant_id: uuid.UUID, receipt: PurchaseOrderReceive) -> ServiceResult:
+        """Receive stock against a purchase order and move it to partial or received"""
+        try:
+            existing_po = await self.repository.get_purchase_order_by_id(po_id, tenant_id, for_update=True)
+            if not existing_po:
+                return ServiceResult(
+                    error="Purchase order not found",
+                    success=False
+                )
+            if existing_po.status in CLOSED_STATUSES:
+                return ServiceResult(
+                    error=f"Cannot receive stock on a {existing_po.status} purchase order",
+                    success=False
+                )
+
+            received: Dict[uuid.UUID, int] = {}
+            for item in receipt.items:
+                received[item.item_id] = received.get(item.item_id, 0) + item.quantity_received
+
+            lines = await self.repository.get_purchase_order_lines(existing_po.id)
+            stock_by_edition, new_status = summarise_receipt(lines, received)
+
+            result = await self.repository.receive_purchase_order(
+                existing_po, lines, received, stock_by_edition, new_status
+            )
+            # The upsert may add SKUs and re-averages cost prices, so stock figures are
+            # recomputed for the tenant rather than adjusted
+            await self.metrics.reconcile(tenant_id)
+            # Receiving can add editions the tenant did not stock before
+            after_commit(self.db, partial(suggest_indexes.mark_stale, tenant_id))
+            after_commit(self.db, partial(invalidate_supplier_dashboard, tenant_id))
+            return ServiceResult(
+                data={
+                    "id": result.id,
+                    "status": result.status,
+                    "lines_received": len(received),
+                    "units_received": sum(received.values())
+                },
+                message=f"Purchase order marked as {result.status}",
+                success=True
+            )
+        except ValueError as e:
+            return ServiceResult(
+                error=str(e),
+                success=False
+            )
+        except Exception as e:
+            return ServiceResult(
+                error=f"Failed to receive purchase order: {e}",
+                success=False
+            )
@@ -2,7 +2,9 @@
 Utility functions for purchase order operations
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+import uuid
 
 
 def generate_order_number(latest_order_number: Optional[str] = None) -> str:
@@ -44,3 +46,48 @@ def calculate_expected_delivery_date(order_date: Optional[datetime] = None, days
         order_date = datetime.utcnow()
     
     return order_date + timedelta(days=days_offset)
+
+
+def summarise_receipt(lines: Iterable, received: Dict[uuid.UUID, int]) -> Tuple[Dict[uuid.UUID, Tuple[int, Decimal]], str]:
+    """
+    Validate received quantities against purchase order lines and work out the stock to add
+    
+    Args:
+        lines: Purchase order lines (id, edition_id, quantity_ordered, quantity_received, unit_cost)
+        received: Quantity received on this delivery, keyed by purchase order line ID
+        
+    Returns:
+        Stock to add per edition as (quantity, unit cost) and the resulting order status
+        
+    Raises:
+        ValueError: If a line does not belong to the order or would be over-received
+    """
+    lines_by_id = {line.id: line for line in lines}
+    unknown = [str(line_id) for line_id in received if line_id not in lines_by_id]
+    if unknown:
+        raise ValueError(f"Items not found on this purchase order: {', '.join(unknown)}")
+
+    stock_by_edition: Dict[uuid.UUID, Tuple[int, Decimal]] = {}
+    fully_received = True
+    for line in lines_by_id.values():
+        quantity = received.get(line.id, 0)
+        outstanding = line.quantity_ordered - line.quantity_received
+        if quantity > outstanding:
+            raise ValueError(
+                f"Cannot receive {quantity} units for item {line.id}: only {outstanding} outstanding"
+            )
+        if quantity < outstanding:
+            fully_received = False
+        if quantity == 0:
+            continue
+
+        # The same edition can appear on several lines; blend their unit costs
+        unit_cost = Decimal(line.unit_cost)
+        if line.edition_id in stock_by_edition:
+            existing_quantity, existing_cost = stock_by_edition[line.edition_id]
+            total_quantity = existing_quantity + quantity
+            unit_cost = (existing_quantity * existing_cost + quantity * unit_cost) / total_quantity
+            quantity = total_quantity
+        stock_by_edition[line.edition_id] = (quantity, unit_cost)
+
+    return stock_by_edition, "received" if fully_received else "partial"
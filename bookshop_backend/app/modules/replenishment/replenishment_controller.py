@@ -0,0 +1,65 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends
+from typing import Annotated
+from ...db.session import SessionDep
+from .replenishment_service import ReplenishmentService, run_replenishment_job
+from .replenishment_model import ReorderPolicy
+from ...utils.auth import (
+    require_permission,
+    require_superadmin,
+    CurrentUser,
+    Permission
+)
+
+
+router = APIRouter()
+
+@router.get("/suggestions")
+async def get_reorder_suggestions(
+    db: SessionDep,
+    policy: Annotated[ReorderPolicy, Depends()],
+    user: CurrentUser = Depends(require_permission(Permission.READ_INVENTORY))
+):
+    """
+    Get reorder suggestions grouped by supplier.
+    Requires: Read inventory permission
+    """
+    service = ReplenishmentService(db)
+    result = await service.get_reorder_suggestions(user.tenant_id, policy)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.error
+        )
+    return result.data
+
+@router.post("/draft-orders", status_code=status.HTTP_201_CREATED)
+async def create_draft_orders(
+    db: SessionDep,
+    policy: ReorderPolicy,
+    user: CurrentUser = Depends(require_permission(Permission.MANAGE_PURCHASE_ORDERS))
+):
+    """
+    Create draft purchase orders, one per supplier, from the current suggestions.
+    Requires: Manage purchase orders permission
+    """
+    service = ReplenishmentService(db)
+    result = await service.create_draft_orders(user.tenant_id, policy)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+    return {"message": result.message, "data": result.data}
+
+@router.post("/run", status_code=status.HTTP_202_ACCEPTED)
+async def run_replenishment(
+    background_tasks: BackgroundTasks,
+    policy: ReorderPolicy,
+    user: CurrentUser = Depends(require_superadmin())
+):
+    """
+    Queue draft purchase order generation for every tenant.
+    Requires: Superadmin role only
+    """
+    background_tasks.add_task(run_replenishment_job, policy)
+    return {"message": "Replenishment job queued"}
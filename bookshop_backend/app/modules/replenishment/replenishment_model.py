@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from decimal import Decimal
+from datetime import date
+import uuid
+
+
+class ReorderSuggestion(BaseModel):
+    edition_id: uuid.UUID
+    title: str
+    isbn: str
+    available: int = Field(..., description="Quantity on hand less reserved")
+    on_order: int = Field(0, description="Quantity still outstanding on open purchase orders")
+    reorder_level: int
+    daily_velocity: float = Field(..., description="Blended units sold per day")
+    days_of_cover: Optional[float] = Field(None, description="Days until available stock runs out at current velocity")
+    projected_stockout_date: Optional[date] = None
+    lead_time_days: float = Field(..., description="Supplier's observed p90 lead time, or the policy's when too few deliveries")
+    suggested_quantity: int
+    unit_cost: Decimal = Field(..., description="Supplier catalogue price, else last purchase cost, else inventory cost price")
+
+
+class SupplierReorderGroup(BaseModel):
+    supplier_id: Optional[uuid.UUID] = Field(None, description="Last supplier of these editions, if any")
+    supplier_name: Optional[str] = None
+    estimated_cost: Decimal
+    items: List[ReorderSuggestion]
+
+
+class ReorderPolicy(BaseModel):
+    lead_time_days: int = Field(default=5, ge=0, le=180, description="Expected supplier lead time")
+    use_supplier_lead_times: bool = Field(default=True, description="Prefer each supplier's observed lead time over lead_time_days")
+    cover_days: int = Field(default=30, ge=1, le=365, description="Days of sales each order should cover")
+    window_days: int = Field(default=30, ge=7, le=180, description="Recent sales window used for velocity")
+    history_months: int = Field(default=3, ge=1, le=24, description="Completed months of summary history used for velocity")
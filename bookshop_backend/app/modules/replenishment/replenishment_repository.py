@@ -0,0 +1,174 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, Integer, and_, case, cast, literal
+from sqlmodel import select, func
+from typing import List, Dict, Any
+from datetime import datetime, timedelta
+import uuid
+from ...db import models
+from ...db.partitions import earliest_created_at
+from ...utils.date_ranges import utc_now
+from ..analytics.analytics_repository import supplier_lead_times
+from .replenishment_model import ReorderPolicy
+
+# Purchase orders whose outstanding quantities count as stock on the way
+OPEN_PO_STATUSES = ["draft", "pending", "approved", "partial"]
+
+# Share of the blended velocity taken from the recent sales window
+RECENT_WEIGHT = 0.7
+
+# Purchase history used for observed supplier lead times, and the number of
+# deliveries needed before they replace the policy's lead time
+LEAD_TIME_HISTORY_DAYS = 365
+MIN_LEAD_TIME_SAMPLES = 3
+
+
+class ReplenishmentRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_reorder_candidates(self, tenant_id: uuid.UUID, policy: ReorderPolicy) -> List[Dict[str, Any]]:
+        """
+        Compute velocity, cover and suggested order quantity for every edition in one statement.
+
+        Velocity blends units sold in the recent window (SaleItems) with completed months of
+        MonthlySalesSummary. Only editions that need ordering are returned.
+        """
+        now = utc_now()
+        window_start = now - timedelta(days=policy.window_days)
+        current_period = now.year * 12 + now.month - 1
+        history_start = current_period - policy.history_months
+
+        recent = (
+            select(
+                models.SaleItems.edition_id,
+                func.sum(models.SaleItems.quantity_sold).label("recent_units")
+            )
+            .join(models.Sales, and_(
+                models.SaleItems.sale_id == models.Sales.id,
+                models.SaleItems.sale_created_at == models.Sales.created_at
+            ))
+            .where(
+                models.Sales.tenant_id == tenant_id,
+                models.Sales.created_at >= earliest_created_at(window_start),
+                models.SaleItems.sale_created_at >= earliest_created_at(window_start),
+                models.Sales.sale_date >= window_start,
+                models.Sales.sale_status != "cancelled"
+            )
+            .group_by(models.SaleItems.edition_id)
+            .subquery()
+        )
+
+        period = models.MonthlySalesSummary.year * 12 + models.MonthlySalesSummary.month - 1
+        history = (
+            select(
+                models.MonthlySalesSummary.edition_id,
+                func.sum(models.MonthlySalesSummary.total_quantity).label("history_units")
+            )
+            .where(
+                models.MonthlySalesSummary.tenant_id == tenant_id,
+                period >= history_start,
+                period < current_period
+            )
+            .group_by(models.MonthlySalesSummary.edition_id)
+            .subquery()
+        )
+
+        on_order = (
+            select(
+                models.PurchaseOrderItems.edition_id,
+                func.sum(
+                    models.PurchaseOrderItems.quantity_ordered - models.PurchaseOrderItems.quantity_received
+                ).label("on_order")
+            )
+            .join(models.PurchaseOrder, models.PurchaseOrderItems.po_id == models.PurchaseOrder.id)
+            .where(
+                models.PurchaseOrder.tenant_id == tenant_id,
+                models.PurchaseOrder.status.in_(OPEN_PO_STATUSES)
+            )
+            .group_by(models.PurchaseOrderItems.edition_id)
+            .subquery()
+        )
+
+        # Most recent supplier and cost per edition
+        last_purchase = (
+            select(
+                models.PurchaseOrderItems.edition_id,
+                models.PurchaseOrder.supplier_id,
+                models.PurchaseOrderItems.unit_cost
+            )
+            .join(models.PurchaseOrder, models.PurchaseOrderItems.po_id == models.PurchaseOrder.id)
+            .where(models.PurchaseOrder.tenant_id == tenant_id)
+            .distinct(models.PurchaseOrderItems.edition_id)
+            .order_by(models.PurchaseOrderItems.edition_id, models.PurchaseOrder.order_date.desc())
+            .subquery()
+        )
+
+        # p90 of observed lead times, so the horizon covers all but the slowest deliveries
+        lead_times = None
+        if policy.use_supplier_lead_times:
+            lead_times = supplier_lead_times(tenant_id, now - timedelta(days=LEAD_TIME_HISTORY_DAYS))
+            lead_time = func.coalesce(
+                case((lead_times.c.delivered_orders >= MIN_LEAD_TIME_SAMPLES, lead_times.c.p90_lead_time_days)),
+                float(policy.lead_time_days)
+            )
+        else:
+            lead_time = literal(float(policy.lead_time_days))
+
+        recent_rate = cast(func.coalesce(recent.c.recent_units, 0), Float) / float(policy.window_days)
+        history_rate = cast(func.coalesce(history.c.history_units, 0), Float) / float(policy.history_months * 30)
+        metrics = (
+            select(
+                models.Inventory.edition_id,
+                models.Book.title,
+                models.BookEdition.isbn_number.label("isbn"),
+                models.Inventory.reorder_level,
+                (models.Inventory.quantity_on_hand - models.Inventory.quantity_reserved).label("available"),
+                func.coalesce(on_order.c.on_order, 0).label("on_order"),
+                (recent_rate * RECENT_WEIGHT + history_rate * (1 - RECENT_WEIGHT)).label("daily_velocity"),
+                last_purchase.c.supplier_id,
+                func.coalesce(
+                    models.SupplierCatalog.unit_cost, last_purchase.c.unit_cost, models.Inventory.cost_price
+                ).label("unit_cost"),
+                lead_time.label("lead_time_days")
+            )
+            .select_from(models.Inventory)
+            .join(models.BookEdition, models.Inventory.edition_id == models.BookEdition.edition_id)
+            .join(models.Book, models.BookEdition.book_id == models.Book.id)
+            .outerjoin(recent, recent.c.edition_id == models.Inventory.edition_id)
+            .outerjoin(history, history.c.edition_id == models.Inventory.edition_id)
+            .outerjoin(on_order, on_order.c.edition_id == models.Inventory.edition_id)
+            .outerjoin(last_purchase, last_purchase.c.edition_id == models.Inventory.edition_id)
+            .outerjoin(models.SupplierCatalog, and_(
+                models.SupplierCatalog.tenant_id == tenant_id,
+                models.SupplierCatalog.supplier_id == last_purchase.c.supplier_id,
+                models.SupplierCatalog.edition_id == models.Inventory.edition_id
+            ))
+            .where(models.Inventory.tenant_id == tenant_id)
+        )
+        if lead_times is not None:
+            metrics = metrics.outerjoin(lead_times, lead_times.c.supplier_id == last_purchase.c.supplier_id)
+        metrics = metrics.subquery()
+
+        horizon = metrics.c.lead_time_days + policy.cover_days
+        suggested = func.ceil(
+            metrics.c.daily_velocity * horizon + metrics.c.reorder_level - metrics.c.available - metrics.c.on_order
+        )
+        days_of_cover = cast(metrics.c.available, Float) / func.nullif(metrics.c.daily_velocity, 0.0)
+        stmt = (
+            select(
+                metrics,
+                models.Supplier.name.label("supplier_name"),
+                days_of_cover.label("days_of_cover"),
+                cast(suggested, Integer).label("suggested_quantity")
+            )
+            .outerjoin(models.Supplier, models.Supplier.id == metrics.c.supplier_id)
+            .where(suggested > 0)
+            .order_by(metrics.c.supplier_id, days_of_cover.asc().nulls_last())
+        )
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_tenant_ids(self) -> List[uuid.UUID]:
+        result = await self.db.execute(select(models.Tenant.id))
+        return result.scalars().all()
@@ -0,0 +1,140 @@
+from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
+from ...db.base import async_session_maker
+from ...utils.result import ServiceResult
+from ..purchase_orders.purchase_order_repository import PurchaseOrderRepository
+from ..purchase_orders.purchase_order_model import PurchaseOrderData, PurchaseOrderItemCreate
+from .replenishment_repository import ReplenishmentRepository
+from .replenishment_model import ReorderPolicy, ReorderSuggestion, SupplierReorderGroup
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from logging import getLogger
+import uuid
+
+logger = getLogger(__name__)
+
+
+class ReplenishmentService:
+    def __init__(self, db: SessionDep):
+        self.db = db
+        self.repository = ReplenishmentRepository(db)
+        self.purchase_orders = PurchaseOrderRepository(db)
+
+    async def _build_groups(self, tenant_id: uuid.UUID, policy: ReorderPolicy) -> List[SupplierReorderGroup]:
+        rows = await self.repository.get_reorder_candidates(tenant_id, policy)
+
+        today = date.today()
+        groups: Dict[Optional[uuid.UUID], SupplierReorderGroup] = {}
+        for row in rows:
+            days_of_cover = row["days_of_cover"]
+            suggestion = ReorderSuggestion(
+                edition_id=row["edition_id"],
+                title=row["title"],
+                isbn=row["isbn"],
+                available=row["available"],
+                on_order=row["on_order"],
+                reorder_level=row["reorder_level"],
+                daily_velocity=round(row["daily_velocity"], 4),
+                days_of_cover=round(days_of_cover, 1) if days_of_cover is not None else None,
+                projected_stockout_date=today + timedelta(days=int(days_of_cover)) if days_of_cover is not None else None,
+                lead_time_days=round(row["lead_time_days"], 1),
+                suggested_quantity=row["suggested_quantity"],
+                unit_cost=row["unit_cost"]
+            )
+            group = groups.get(row["supplier_id"])
+            if group is None:
+                group = groups[row["supplier_id"]] = SupplierReorderGroup(
+                    supplier_id=row["supplier_id"],
+                    supplier_name=row["supplier_name"],
+                    estimated_cost=Decimal("0.00"),
+                    items=[]
+                )
+            group.items.append(suggestion)
+            group.estimated_cost += suggestion.unit_cost * suggestion.suggested_quantity
+
+        return list(groups.values())
+
+    async def get_reorder_suggestions(self, tenant_id: uuid.UUID, policy: ReorderPolicy) -> ServiceResult:
+        """Suggested reorder quantities for a tenant, grouped by last supplier"""
+        try:
+            groups = await self._build_groups(tenant_id, policy)
+            return ServiceResult(
+                data=groups,
+                message="Reorder suggestions generated successfully",
+                success=True
+            )
+        except Exception as e:
+            return ServiceResult(
+                error=f"Failed to generate reorder suggestions: {e}",
+                success=False
+            )
+
+    @transactional
+    async def create_draft_orders(self, tenant_id: uuid.UUID, policy: ReorderPolicy) -> ServiceResult:
+        """
+        Turn current suggestions into draft purchase orders, one per supplier.
+        Editions that have never been purchased have no supplier and are left out.
+        """
+        try:
+            groups = await self._build_groups(tenant_id, policy)
+            orders = []
+            for group in groups:
+                if group.supplier_id is None:
+                    continue
+                orders.append((
+                    PurchaseOrderData(
+                        tenant_id=tenant_id,
+                        supplier_id=group.supplier_id,
+                        total_amount=group.estimated_cost,
+                        status="draft"
+                    ),
+                    [
+                        PurchaseOrderItemCreate(
+                            edition_id=item.edition_id,
+                            quantity_ordered=item.suggested_quantity,
+                            unit_cost=item.unit_cost
+                        ) for item in group.items
+                    ]
+                ))
+
+            if not orders:
+                return ServiceResult(
+                    data=[],
+                    message="No draft purchase orders needed",
+                    success=True
+                )
+
+            created = await self.purchase_orders.create_purchase_orders_bulk(tenant_id, orders)
+            return ServiceResult(
+                data=[{"id": po.id, "poNumber": po.order_number, "supplier_id": po.supplier_id} for po in created],
+                message=f"{len(created)} draft purchase orders created",
+                success=True
+            )
+        except Exception as e:
+            return ServiceResult(
+                error=f"Failed to create draft purchase orders: {e}",
+                success=False
+            )
+
+
+async def run_replenishment_job(policy: Optional[ReorderPolicy] = None) -> Dict[uuid.UUID, int]:
+    """
+    Draft reorder purchase orders for every tenant.
+
+    Opens its own sessions so it can run from BackgroundTasks or an external scheduler.
+    Returns the number of drafts created per tenant.
+    """
+    policy = policy or ReorderPolicy()
+    async with async_session_maker() as session:
+        tenant_ids = await ReplenishmentRepository(session).get_tenant_ids()
+
+    created: Dict[uuid.UUID, int] = {}
+    for tenant_id in tenant_ids:
+        async with async_session_maker() as session:
+            result = await ReplenishmentService(session).create_draft_orders(tenant_id, policy)
+        if result.success:
+            created[tenant_id] = len(result.data)
+        else:
+            logger.error(f"Replenishment job failed for tenant {tenant_id}: {result.error}")
+    return created
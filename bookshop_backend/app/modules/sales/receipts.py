@@ -0,0 +1,178 @@
+"""
+Receipt templates and renderers.
+
+A tenant's ReceiptTemplates.template is plain text with str.format-style fields, e.g.
+`{total_amount:>12.2f}` or `{sale_date:%d/%m/%Y %H:%M}`, and one `{#items}...{/items}`
+block that is repeated for every sale line. Templates are parsed once into a
+CompiledTemplate; rendering only walks the pre-parsed parts.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from html import escape
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+ITEMS_START = "{#items}"
+ITEMS_END = "{/items}"
+
+SALE_FIELDS = {
+    "shop_name", "currency", "receipt_number", "sale_id", "sale_date", "payment_method", "customer_name",
+    "subtotal", "total_discount", "total_tax", "total_amount", "amount_received",
+    "change_given", "item_count"
+}
+ITEM_FIELDS = {
+    "title", "author", "isbn", "quantity_sold", "price_per_unit", "total_price",
+    "tax_amount", "discount_amount"
+}
+
+DEFAULT_TEMPLATE = """{shop_name:^40}
+Receipt {receipt_number}
+{sale_date:%d/%m/%Y %H:%M}
+----------------------------------------
+{#items}
+{title:<40.40}
+{quantity_sold:>4} x {price_per_unit:>10.2f}{total_price:>24.2f}
+{/items}
+----------------------------------------
+Discount{total_discount:>32.2f}
+TOTAL {currency:<4}{total_amount:>30.2f}
+VAT included{total_tax:>28.2f}
+Paid ({payment_method}) {amount_received}
+Change {change_given}
+
+Thank you for your purchase!
+"""
+
+# ESC @ resets the printer; ESC d n feeds n lines; GS V 1 is a partial cut
+ESCPOS_INIT = b"\x1b@"
+ESCPOS_CUT = b"\x1bd\x04\x1dV\x01"
+
+# (literal text, field name or None, format spec)
+Part = Tuple[str, Optional[str], str]
+
+
+def _parse(text: str, allowed: set) -> List[Part]:
+    parts = []
+    for literal, field, spec, _conversion in Formatter().parse(text):
+        if field is not None and field not in allowed:
+            raise ValueError(f"Unknown receipt field '{{{field}}}'")
+        parts.append((literal, field, spec or ""))
+    return parts
+
+
+def _render(parts: List[Part], values: Dict[str, Any]) -> str:
+    out = []
+    for literal, field, spec in parts:
+        out.append(literal)
+        if field is not None:
+            value = values.get(field)
+            out.append("" if value is None else format(value, spec))
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    header: List[Part]
+    item: List[Part]
+    footer: List[Part]
+
+    def render(self, receipt: Dict[str, Any]) -> str:
+        lines = [_render(self.header, receipt)]
+        for item in receipt["items"]:
+            lines.append(_render(self.item, {**receipt, **item}))
+        lines.append(_render(self.footer, receipt))
+        return "".join(lines)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    """Parse template text once. Raises ValueError for unknown fields or an unbalanced items block."""
+    header, item, footer = text, "", ""
+    if ITEMS_START in text or ITEMS_END in text:
+        start, end = text.find(ITEMS_START), text.find(ITEMS_END)
+        if start == -1 or end < start:
+            raise ValueError("Receipt template has an unbalanced {#items} block")
+        header = text[:start]
+        item = text[start + len(ITEMS_START):end]
+        footer = text[end + len(ITEMS_END):]
+        # The block markers sit on their own lines; drop the newlines that follow them
+        item = item[1:] if item.startswith("\n") else item
+        footer = footer[1:] if footer.startswith("\n") else footer
+    return CompiledTemplate(
+        header=_parse(header, SALE_FIELDS),
+        item=_parse(item, SALE_FIELDS | ITEM_FIELDS),
+        footer=_parse(footer, SALE_FIELDS)
+    )
+
+
+default_template = compile_template(DEFAULT_TEMPLATE)
+
+
+def group_receipts(
+    rows: Iterable[Dict[str, Any]],
+    currency: str = "",
+    time_zone: Optional[ZoneInfo] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fold joined sale/line rows (ordered by sale) into one receipt context per sale,
+    with its lines under "items" and the totals printed on the receipt.
+    Timezone-aware sale dates are shown in the tenant's `time_zone`.
+    """
+    receipts: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for row in rows:
+        if current is None or current["sale_id"] != row["sale_id"]:
+            sale_date = row["sale_date"]
+            if time_zone is not None and sale_date.tzinfo is not None:
+                sale_date = sale_date.astimezone(time_zone)
+            current = {
+                "sale_id": row["sale_id"],
+                "currency": currency,
+                "receipt_number": row["sale_id"].hex[:8].upper(),
+                "shop_name": row["shop_name"],
+                "sale_date": sale_date,
+                "payment_method": row["payment_method"],
+                "customer_name": row["customer_name"] or "Walk-in Customer",
+                "total_amount": row["total_amount"],
+                "amount_received": row["amount_received"],
+                "change_given": row["change_given"],
+                "subtotal": Decimal("0.00"),
+                "total_discount": Decimal("0.00"),
+                "total_tax": Decimal("0.00"),
+                "item_count": 0,
+                "items": []
+            }
+            receipts.append(current)
+        if row["line_id"] is None:
+            continue
+        item = {field: row[field] for field in ITEM_FIELDS}
+        current["items"].append(item)
+        current["subtotal"] += item["price_per_unit"] * item["quantity_sold"]
+        current["total_discount"] += item["discount_amount"] or 0
+        current["total_tax"] += item["tax_amount"] or 0
+        current["item_count"] += item["quantity_sold"]
+    return receipts
+
+
+def render_receipts(template: CompiledTemplate, receipts: List[Dict[str, Any]], receipt_format: str) -> bytes:
+    """
+    Render receipts back to back in one document: ESC/POS with a cut after each,
+    plain text separated by form feeds, or HTML with a page break per receipt
+    (print to PDF from the browser).
+    """
+    texts = [template.render(receipt) for receipt in receipts]
+    if receipt_format == "escpos":
+        return b"".join(
+            ESCPOS_INIT + text.encode("cp437", errors="replace") + ESCPOS_CUT for text in texts
+        )
+    if receipt_format == "html":
+        sections = "".join(
+            f'<section class="receipt"><pre>{escape(text)}</pre></section>' for text in texts
+        )
+        return (
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Receipts</title>"
+            "<style>pre{font-family:monospace;font-size:12px}"
+            ".receipt{page-break-after:always}@page{margin:4mm}</style></head>"
+            f"<body>{sections}</body></html>"
+        ).encode()
+    return "\f".join(texts).encode()
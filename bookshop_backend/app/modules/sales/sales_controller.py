@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, status, Body, Response, Path, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Body, Response, Path, Query, Depends, Header
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Annotated
+from datetime import date
 from ...db.session import SessionDep
-from .sales_model import SalesRequestBody, SaleResponse
-from .sales_service import SalesService
+from ...db.idempotency import KEY_REUSED_ERROR, run_idempotent
+from .sales_model import SalesRequestBody, SaleResponse, ExportFormat, FactsFormat, ReceiptFormat
+from .sales_service import SalesService, export_sales_ledger, export_sales_facts
+from .sales_facts import pyarrow_available
+from ..tenants.tenant_context import TenantContextDep
 from ...utils.auth import (
     get_current_user,
     require_role,
@@ -11,20 +16,31 @@ from ...utils.auth import (
     UserRole,
     Permission
 )
+from functools import partial
 import uuid
 
 
 router = APIRouter()
 
+RECEIPT_MEDIA_TYPES = {
+    ReceiptFormat.TEXT: "text/plain; charset=utf-8",
+    ReceiptFormat.ESCPOS: "application/octet-stream",
+    ReceiptFormat.HTML: "text/html; charset=utf-8"
+}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_sale(
+    response: Response,
     db: SessionDep,
     sale_data: SalesRequestBody,
     tenant_id: str = Path(..., description="The ID of the tenant"),
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Client-generated key; retries with the same key return the first sale"),
     user: CurrentUser = Depends(require_permission(Permission.WRITE_SALES))
 ):
     """
     Create a new sale.
+    A retry carrying the same Idempotency-Key returns the original sale without
+    recording it or moving stock again.
     Requires: Write sales permission (Admin/Manager/Cashier)
     """
     if str(user.tenant_id) != tenant_id:
@@ -34,17 +50,23 @@ async def create_sale(
         )
     
     service = SalesService(db)
-    result = await service.create_sale(sale_data, uuid.UUID(tenant_id))
+    result = await run_idempotent(
+        db, user.tenant_id, "sales", idempotency_key, sale_data,
+        partial(service.create_sale, sale_data, uuid.UUID(tenant_id))
+    )
     if not result.success:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY if result.error == KEY_REUSED_ERROR else status.HTTP_400_BAD_REQUEST,
             detail=result.error
         )
+    if result.message == "replayed":
+        response.headers["Idempotent-Replayed"] = "true"
     return {"sale_id": result.data["sale_id"], "message": "Sale created successfully"}
 
 @router.get("", response_model=List[SaleResponse])
 async def list_sales(
     db: SessionDep,
+    tenant: TenantContextDep,
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
     payment_method: Optional[str] = Query(None),
@@ -54,6 +76,7 @@ async def list_sales(
 ):
     """
     Retrieve a list of sales with optional filters.
+    date_from/date_to are dates (YYYY-MM-DD, whole days) or ISO datetimes in the tenant's time zone.
     Requires: Read sales permission
     """    
     try:
@@ -65,7 +88,8 @@ async def list_sales(
             date_to=date_to,
             payment=payment_method,
             status=sale_status,
-            limit=limit
+            limit=limit,
+            time_zone=tenant.time_zone
         )
         
         if not result.success:
@@ -88,6 +112,89 @@ async def list_sales(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.get("/export")
+async def export_sales(
+    date_from: date,
+    date_to: date,
+    tenant: TenantContextDep,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    gzip: bool = False,
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """
+    Download every sale and sale line between date_from and date_to (inclusive).
+    One row per line, streamed in keyset chunks as CSV or NDJSON; gzip=true compresses it.
+    Requires: Admin or Manager role
+    """
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+
+    media_type = "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"sales-{date_from.isoformat()}-{date_to.isoformat()}.{export_format.value}"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_sales_ledger(user.tenant_id, date_from, date_to, export_format.value, compress=gzip, time_zone=tenant.time_zone),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/export/facts")
+async def export_sales_facts_columnar(
+    date_from: date,
+    date_to: date,
+    tenant: TenantContextDep,
+    export_format: FactsFormat = Query(FactsFormat.PARQUET, alias="format"),
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """
+    Download sale-line facts as Parquet or Arrow IPC, one file per month
+    (year=YYYY/month=M/), zipped. Loads directly with pyarrow.dataset or pandas.
+    Requires: Admin or Manager role
+    """
+    if not pyarrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export requires pyarrow to be installed on the server"
+        )
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+
+    filename = f"sales-facts-{date_from.isoformat()}-{date_to.isoformat()}-{export_format.value}.zip"
+    return StreamingResponse(
+        export_sales_facts(user.tenant_id, date_from, date_to, export_format.value, time_zone=tenant.time_zone),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/receipts/reprint", status_code=status.HTTP_200_OK)
+async def reprint_receipts(
+    db: SessionDep,
+    day: date,
+    tenant: TenantContextDep,
+    receipt_format: ReceiptFormat = Query(ReceiptFormat.TEXT, alias="format"),
+    user: CurrentUser = Depends(require_permission(Permission.READ_SALES))
+):
+    """
+    Render every receipt from one day into a single document (one cut or page per receipt).
+    Requires: Read sales permission
+    """
+    service = SalesService(db)
+    result = await service.reprint_receipts(user.tenant_id, day, receipt_format.value, context=tenant)
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+    return Response(content=result.data, media_type=RECEIPT_MEDIA_TYPES[receipt_format])
+
 @router.get("/{sale_id}", response_model=SaleResponse)
 async def get_sale(
     db: SessionDep,
@@ -135,26 +242,23 @@ async def get_sale(
 @router.post("/{sale_id}/receipt", status_code=status.HTTP_200_OK)
 async def print_receipt(
     db: SessionDep,
-    tenant_id: str = Path(..., description="The ID of the tenant"),
+    tenant: TenantContextDep,
     sale_id: str = Path(..., description="The ID of the sale"),
+    receipt_format: ReceiptFormat = Query(ReceiptFormat.TEXT, alias="format"),
     user: CurrentUser = Depends(require_permission(Permission.READ_SALES))
 ):
     """
-    Print a receipt for a sale.
+    Render the receipt for a sale with the tenant's receipt template.
+    format=escpos returns raw bytes for a thermal printer; html can be printed to PDF.
     Requires: Read sales permission
     """
-    # Verify the tenant_id matches the user's tenant
-    if str(user.tenant_id) != tenant_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied: Cannot print receipts for other tenants"
-        )
-    
     try:
         service = SalesService(db)
         result = await service.print_receipt(
             sale_id=uuid.UUID(sale_id),
-            tenant_id=uuid.UUID(tenant_id)
+            tenant_id=user.tenant_id,
+            receipt_format=receipt_format.value,
+            context=tenant
         )
         
         if not result.success:
@@ -163,8 +267,10 @@ async def print_receipt(
                 detail=result.error
             )
         
-        return {"message": "Receipt printed successfully"}
+        return Response(content=result.data, media_type=RECEIPT_MEDIA_TYPES[receipt_format])
         
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
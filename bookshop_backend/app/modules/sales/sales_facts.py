@@ -0,0 +1,153 @@
+"""
+Columnar export of sales facts (one row per sale line) for offline analytics.
+
+Files are Hive-partitioned by the tenant's local calendar month (year=YYYY/month=M/...)
+to line up with the MonthlySalesSummary grain, and shipped as a single streamed zip. Batches
+are built column by column rather than from per-row dicts. pyarrow is imported lazily so
+workers that never export do not load it; the endpoint reports 501 if it is missing.
+"""
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import importlib.util
+import io
+import uuid
+import zipfile
+
+# Rows converted per RecordBatch / Parquet row group
+BATCH_SIZE = 10_000
+
+def pyarrow_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def fact_schema():
+    import pyarrow as pa
+
+    money = pa.decimal128(10, 2)
+    return pa.schema([
+        ("tenant_id", pa.string()),
+        ("year", pa.int16()),
+        ("month", pa.int8()),
+        ("sale_id", pa.string()),
+        ("line_id", pa.string()),
+        ("sale_date", pa.timestamp("us", tz="UTC")),
+        ("sale_status", pa.string()),
+        ("payment_method", pa.string()),
+        ("edition_id", pa.string()),
+        ("isbn", pa.string()),
+        ("title", pa.string()),
+        ("quantity_sold", pa.int32()),
+        ("price_per_unit", money),
+        ("total_price", money),
+        ("tax_amount", money),
+        ("discount_amount", money),
+    ])
+
+
+# Per-line columns in schema order, with the conversion applied to each value
+LINE_COLUMNS = [
+    ("sale_id", str),
+    ("line_id", str),
+    ("sale_date", None),
+    ("sale_status", None),
+    ("payment_method", None),
+    ("edition_id", str),
+    ("isbn", None),
+    ("title", None),
+    ("quantity_sold", None),
+    ("price_per_unit", None),
+    ("total_price", None),
+    ("tax_amount", None),
+    ("discount_amount", None),
+]
+
+
+class FactBatch:
+    """Accumulates sale lines column by column and converts them to one RecordBatch"""
+
+    def __init__(self, tenant_id: uuid.UUID, year: int, month: int):
+        self.tenant_id = str(tenant_id)
+        self.year = year
+        self.month = month
+        self.columns: Dict[str, List[Any]] = {name: [] for name, _ in LINE_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["line_id"])
+
+    def append(self, row: Dict[str, Any]) -> None:
+        for name, convert in LINE_COLUMNS:
+            value = row[name]
+            self.columns[name].append(convert(value) if convert and value is not None else value)
+
+    def to_record_batch(self, schema):
+        import pyarrow as pa
+
+        size = len(self)
+        # The partition columns are the same on every line, so they are built as repeats
+        constants = {
+            "tenant_id": pa.repeat(pa.scalar(self.tenant_id, schema.field("tenant_id").type), size),
+            "year": pa.repeat(pa.scalar(self.year, schema.field("year").type), size),
+            "month": pa.repeat(pa.scalar(self.month, schema.field("month").type), size),
+        }
+        arrays = [
+            constants[field.name] if field.name in constants else pa.array(self.columns[field.name], type=field.type)
+            for field in schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def write_month(rows: AsyncIterator[Dict[str, Any]], tenant_id: uuid.UUID, year: int, month: int, export_format: str) -> bytes:
+    """Encode one month of sale lines as a Parquet or Arrow IPC file, batch by batch"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = fact_schema()
+    buffer = io.BytesIO()
+    if export_format == "arrow":
+        writer = pa.ipc.new_file(buffer, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+    else:
+        writer = pq.ParquetWriter(buffer, schema, compression="zstd")
+
+    written = 0
+    batch = FactBatch(tenant_id, year, month)
+    async for row in rows:
+        if row["line_id"] is None:
+            continue
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            writer.write_batch(batch.to_record_batch(schema))
+            written += len(batch)
+            batch = FactBatch(tenant_id, year, month)
+    if len(batch):
+        writer.write_batch(batch.to_record_batch(schema))
+        written += len(batch)
+    writer.close()
+    return buffer.getvalue() if written else b""
+
+
+async def stream_partitioned_zip(months: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """Zip (path, file bytes) pairs as they arrive. Files are stored; Parquet and Arrow are already compressed."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for path, data in months:
+            archive.writestr(path, data)
+            yield sink.drain()
+    yield sink.drain()
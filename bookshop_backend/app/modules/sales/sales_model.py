@@ -2,7 +2,9 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 import uuid
+from ...utils.date_ranges import utc_now
 
 class Customer(BaseModel):
     customer_name: str = Field(..., max_length=100)
@@ -24,7 +26,7 @@ class Sales(BaseModel):
     change_given: Decimal = Field(..., max_digits=10, decimal_places=2, gt=0)
     tax: Optional[Decimal] = Field(None, max_digits=10, decimal_places=2, ge=0)
     discount: Optional[Decimal] = Field(None, max_digits=10, decimal_places=2, ge=0)
-    sale_date: datetime = Field(default_factory=datetime.now)
+    sale_date: datetime = Field(default_factory=utc_now)
     payment_method: str = Field(..., max_length=50)
     sale_status: str = Field(default="completed", max_length=20)
 
@@ -49,7 +51,7 @@ class SalesRequestBody(BaseModel):
     payment: Payment = Field(..., alias="payment")
     total_amount: Decimal = Field(..., max_digits=10, decimal_places=2, gt=0)
     sale_status: str = Field(default="completed", max_length=20)
-    sale_date: datetime = Field(default_factory=datetime.now)
+    sale_date: datetime = Field(default_factory=utc_now)
 
 # Updated SaleResponse to match the required shape
 class SaleResponse(BaseModel):
@@ -66,4 +68,20 @@ class SaleResponse(BaseModel):
     class Config:
         from_attributes = True
 
-        
\ No newline at end of file
+        
+
+class ExportFormat(str, Enum):
+    """Output formats for /sales/export"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class FactsFormat(str, Enum):
+    """Columnar formats for /sales/export/facts"""
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+class ReceiptFormat(str, Enum):
+    """Output formats for receipt printing"""
+    TEXT = "text"
+    ESCPOS = "escpos"
+    HTML = "html"
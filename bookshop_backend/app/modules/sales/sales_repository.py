@@ -1,9 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, tuple_
 from sqlmodel import select, func
 import uuid
+from datetime import datetime
 from .sales_model import Sales, SaleItem
 from ...db import models
-from typing import Union, List
+from ...db.partitions import earliest_created_at
+from ...utils.date_ranges import DateRange
+from typing import Union, List, Dict, Any, AsyncIterator, Optional, Tuple
+
+# Sales fetched per keyset chunk when exporting
+EXPORT_CHUNK_SIZE = 2000
 
 
 class SalesRepository:
@@ -18,21 +25,24 @@ class SalesRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def create_sale(self, sale_data: Sales) -> uuid.UUID:
+    async def create_sale(self, sale_data: Sales) -> models.Sales:
         new_sale = models.Sales(**sale_data.dict())
         await self.save(new_sale)
-        return new_sale.id
+        return new_sale
 
-    async def create_sale_item(self, sale_item_data: SaleItem, sale_id: uuid.UUID) -> models.SaleItems:
-        new_sale_item = models.SaleItems(**sale_item_data.dict(), sale_id=sale_id)
+    async def create_sale_item(self, sale_item_data: SaleItem, sale: models.Sales) -> models.SaleItems:
+        new_sale_item = models.SaleItems(
+            **sale_item_data.dict(),
+            sale_id=sale.id,
+            sale_created_at=sale.created_at
+        )
         await self.save(new_sale_item)
         return new_sale_item
 
     async def get_sales_by_tenant(
         self,
         tenant_id: uuid.UUID,
-        date_from: str = None,
-        date_to: str = None,
+        date_range: Optional[DateRange] = None,
         payment: str = None,
         status: str = None,
         limit: int = 100
@@ -45,10 +55,8 @@ class SalesRepository:
                 models.Sales.tenant_id == tenant_id
             )
             
-            if date_from:
-                stmt = stmt.where(models.Sales.created_at >= date_from)
-            if date_to:
-                stmt = stmt.where(models.Sales.created_at <= date_to)
+            if date_range:
+                stmt = stmt.where(date_range.condition(models.Sales.created_at))
             if payment:
                 stmt = stmt.where(models.Sales.payment_method == payment)
             if status:
@@ -65,7 +73,8 @@ class SalesRepository:
                 try:
                     # Count items for this sale
                     items_stmt = select(func.count(models.SaleItems.id)).where(
-                        models.SaleItems.sale_id == sale.id
+                        models.SaleItems.sale_id == sale.id,
+                        models.SaleItems.sale_created_at == sale.created_at
                     )
                     items_result = await self.db.execute(items_stmt)
                     items_count = items_result.scalar() or 0
@@ -93,8 +102,158 @@ class SalesRepository:
             traceback.print_exc()
             raise
 
+    async def iter_sales_ledger(
+        self,
+        tenant_id: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield one row per sale line for sales in [start, end), oldest first.
+
+        Sales are read in keyset chunks on (sale_date, id) with their lines joined in, so
+        each query is short and nothing beyond one chunk is held in memory. The created_at
+        bounds keep every scan to partitions that can hold sales from `start` on.
+        """
+        created_from = earliest_created_at(start)
+        after: Optional[Tuple[datetime, uuid.UUID]] = None
+        while True:
+            page = select(models.Sales.id, models.Sales.created_at, models.Sales.sale_date).where(
+                models.Sales.tenant_id == tenant_id,
+                models.Sales.created_at >= created_from,
+                models.Sales.sale_date >= start,
+                models.Sales.sale_date < end
+            )
+            if after is not None:
+                page = page.where(tuple_(models.Sales.sale_date, models.Sales.id) > tuple_(*after))
+            page = page.order_by(models.Sales.sale_date, models.Sales.id).limit(chunk_size).subquery()
+
+            stmt = select(
+                models.Sales.id.label("sale_id"),
+                models.Sales.sale_date,
+                models.Sales.sale_status,
+                models.Sales.payment_method,
+                models.Sales.customer_name,
+                models.Sales.total_amount,
+                models.Sales.amount_received,
+                models.Sales.change_given,
+                models.SaleItems.id.label("line_id"),
+                models.SaleItems.edition_id,
+                models.SaleItems.isbn,
+                models.SaleItems.title,
+                models.SaleItems.author,
+                models.SaleItems.quantity_sold,
+                models.SaleItems.price_per_unit,
+                models.SaleItems.total_price,
+                models.SaleItems.tax_amount,
+                models.SaleItems.discount_amount
+            ).select_from(
+                page
+            ).join(
+                models.Sales, and_(
+                    models.Sales.id == page.c.id,
+                    models.Sales.created_at == page.c.created_at,
+                    models.Sales.created_at >= created_from
+                )
+            ).outerjoin(
+                models.SaleItems, and_(
+                    models.SaleItems.sale_id == models.Sales.id,
+                    models.SaleItems.sale_created_at == models.Sales.created_at,
+                    models.SaleItems.sale_created_at >= created_from
+                )
+            ).order_by(page.c.sale_date, page.c.id, models.SaleItems.id)
+
+            result = await self.db.execute(stmt)
+            rows = result.all()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row._mapping)
+
+            last = rows[-1]
+            after = (last.sale_date, last.sale_id)
+            if len({row.sale_id for row in rows}) < chunk_size:
+                return
+
     async def save(self, model: Union[models.Sales, models.SaleItems]) -> Union[models.Sales, models.SaleItems]:
         self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
-        return model
\ No newline at end of file
+        await self.db.flush()
+        return model
+
+    async def get_receipt_rows(
+        self,
+        tenant_id: uuid.UUID,
+        sale_ids: Optional[List[uuid.UUID]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Everything printed on a receipt, for one or many sales, in a single joined query:
+        one row per sale line (or one row with null line fields for a sale without lines),
+        ordered so rows of the same sale are adjacent.
+        """
+        stmt = select(
+            models.Sales.id.label("sale_id"),
+            models.Sales.sale_date,
+            models.Sales.payment_method,
+            models.Sales.customer_name,
+            models.Sales.total_amount,
+            models.Sales.amount_received,
+            models.Sales.change_given,
+            models.Tenant.name.label("shop_name"),
+            models.SaleItems.id.label("line_id"),
+            models.SaleItems.title,
+            models.SaleItems.author,
+            models.SaleItems.isbn,
+            models.SaleItems.quantity_sold,
+            models.SaleItems.price_per_unit,
+            models.SaleItems.total_price,
+            models.SaleItems.tax_amount,
+            models.SaleItems.discount_amount
+        ).select_from(
+            models.Sales
+        ).join(
+            models.Tenant, models.Tenant.id == models.Sales.tenant_id
+        ).outerjoin(
+            models.SaleItems, and_(
+                models.SaleItems.sale_id == models.Sales.id,
+                models.SaleItems.sale_created_at == models.Sales.created_at
+            )
+        ).where(
+            models.Sales.tenant_id == tenant_id
+        )
+        if sale_ids is not None:
+            stmt = stmt.where(models.Sales.id.in_(sale_ids))
+        if start is not None:
+            stmt = stmt.where(models.Sales.sale_date >= start, models.Sales.created_at >= earliest_created_at(start))
+        if end is not None:
+            stmt = stmt.where(models.Sales.sale_date < end)
+        stmt = stmt.order_by(models.Sales.sale_date, models.Sales.id, models.SaleItems.id)
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_receipt_template_version(self, tenant_id: uuid.UUID):
+        """
+        (id, updated_at) of the tenant's active receipt template: the one named
+        "default_template" if present, otherwise the most recently edited one.
+        """
+        stmt = select(
+            models.ReceiptTemplates.id,
+            models.ReceiptTemplates.updated_at
+        ).where(
+            models.ReceiptTemplates.tenant_id == tenant_id
+        ).order_by(
+            (models.ReceiptTemplates.name == "default_template").desc(),
+            models.ReceiptTemplates.updated_at.desc()
+        ).limit(1)
+        result = await self.db.execute(stmt)
+        return result.first()
+
+    async def get_receipt_template_text(self, template_id: uuid.UUID) -> Optional[str]:
+        result = await self.db.execute(
+            select(models.ReceiptTemplates.template).where(models.ReceiptTemplates.id == template_id)
+        )
+        return result.scalar_one_or_none()
+
@@ -1,20 +1,62 @@
 from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
 from .sales_repository import SalesRepository
 from .sales_model import SalesRequestBody, Sales, SaleItem, SaleResponse
 from ...utils.result import ServiceResult
+from ...utils.streaming import csv_stream, ndjson_stream, gzip_stream
+from ...db.base import async_session_maker
+from .sales_facts import write_month, stream_partitioned_zip
+from .receipts import CompiledTemplate, compile_template, default_template, group_receipts, render_receipts
+from ...utils.cache import BoundedCache
+from ...utils.date_ranges import DateRange, day_range, month_ranges, tenant_range, utc_now
+from ...db.partitions import SALE_DATE_LEEWAY
+from datetime import date, datetime, timezone, tzinfo
+from typing import AsyncIterator, Optional
 import uuid
 import traceback
 from ..inventory.inventory_service import InventoryService
+from ..tax.tax_service import TaxService
+from ..tenants.tenant_context import TenantContext, load_tenant_context
+from ..tenants.tenant_metrics_repository import TenantMetricsRepository
+
+# Compiled receipt templates keyed by (template id, updated_at): an edited template gets
+# a new key, so entries never need invalidating and stale versions age out of the LRU
+receipt_template_cache: BoundedCache[CompiledTemplate] = BoundedCache(maxsize=1024)
+
 
 class SalesService:
     def __init__(self, db: SessionDep):
         self.db = db
         self.repository = SalesRepository(db)
         self.inventory_service = InventoryService(db)
+        self.tax_service = TaxService(db)
+        self.metrics = TenantMetricsRepository(db)
 
+    @transactional
     async def create_sale(self, sale_data: SalesRequestBody, tenant_id: uuid.UUID=uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")) -> ServiceResult:
         try:            
-            sale_id = await self.repository.create_sale(
+            # Sale times without an offset are wall-clock times at the till
+            if sale_data.sale_date.tzinfo is None:
+                context = await load_tenant_context(self.db, tenant_id)
+                sale_data.sale_date = sale_data.sale_date.replace(tzinfo=context.time_zone if context else timezone.utc)
+            # Reports prune sales partitions on the assumption that no sale is dated ahead of its recording
+            if sale_data.sale_date > utc_now() + SALE_DATE_LEEWAY:
+                raise ValueError("Sale date is in the future")
+
+            # Line tax comes from the tenant's rate table rather than the client; if no
+            # rate is in effect the submitted amounts are kept
+            tax = await self.tax_service.compute_basket_tax(
+                tenant_id,
+                [(item.price_per_unit, item.quantity_sold, item.discount_amount) for item in sale_data.sale_items],
+                at=sale_data.sale_date
+            )
+            if not tax.success:
+                raise Exception(f"Failed to compute tax: {tax.error}")
+            if tax.data is not None:
+                for item, line in zip(sale_data.sale_items, tax.data.lines):
+                    item.tax_amount = line.tax_amount
+
+            sale = await self.repository.create_sale(
                 Sales(
                     tenant_id=tenant_id,
                     total_amount=sale_data.total_amount,
@@ -48,12 +90,14 @@ class SalesService:
                         tax_amount=item.tax_amount,
                         discount_amount=item.discount_amount
                     ),
-                    sale_id=sale_id
+                    sale=sale
                 )
+            # Stock value already moved with each line's inventory update
+            await self.metrics.record_sale(tenant_id, sale.total_amount, sale.sale_status, sale.created_at)
 
             return ServiceResult(
                 success=True,
-                data={"sale_id": sale_id}
+                data={"sale_id": sale.id}
             )
         except Exception as e:
             return ServiceResult(
@@ -68,14 +112,23 @@ class SalesService:
         date_to: str = None,
         payment: str = None,
         status: str = None,
-        limit: int = 100
+        limit: int = 100,
+        time_zone: Optional[tzinfo] = None
     ) -> ServiceResult:
-        """Get all sales for a tenant with optional filters"""
-        try:            
+        """
+        Get all sales for a tenant with optional filters.
+        date_from/date_to are dates or datetimes in the tenant's time zone; a date-only
+        date_to includes that whole day.
+        """
+        try:
+            try:
+                date_range = tenant_range(date_from, date_to, time_zone or timezone.utc)
+            except ValueError as e:
+                return ServiceResult(success=False, error=f"Invalid date range: {str(e)}")
+
             sales = await self.repository.get_sales_by_tenant(
                 tenant_id=tenant_id,
-                date_from=date_from,
-                date_to=date_to,
+                date_range=date_range,
                 payment=payment,
                 status=status,
                 limit=limit
@@ -101,4 +154,135 @@ class SalesService:
             return ServiceResult(
                 success=False,
                 error=f"Failed to retrieve sales: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+
+    async def get_receipt_template(self, tenant_id: uuid.UUID) -> CompiledTemplate:
+        """The tenant's compiled receipt template; the built-in one if the tenant has none"""
+        version = await self.repository.get_receipt_template_version(tenant_id)
+        if version is None:
+            return default_template
+        key = (version.id, version.updated_at)
+        template = receipt_template_cache.get(key)
+        if template is None:
+            text = await self.repository.get_receipt_template_text(version.id)
+            template = compile_template(text) if text else default_template
+            receipt_template_cache.set(key, template)
+        return template
+
+    async def _group_receipts(self, rows, tenant_id: uuid.UUID, context: Optional[TenantContext]):
+        context = context or await load_tenant_context(self.db, tenant_id)
+        if context is None:
+            return group_receipts(rows)
+        return group_receipts(rows, currency=context.currency, time_zone=context.time_zone)
+
+    async def print_receipt(
+        self,
+        sale_id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        receipt_format: str = "text",
+        context: Optional[TenantContext] = None
+    ) -> ServiceResult:
+        """Render one sale's receipt as ESC/POS, plain text or HTML"""
+        try:
+            rows = await self.repository.get_receipt_rows(tenant_id, sale_ids=[sale_id])
+            if not rows:
+                return ServiceResult(success=False, error="Sale not found")
+            template = await self.get_receipt_template(tenant_id)
+            receipts = await self._group_receipts(rows, tenant_id, context)
+            return ServiceResult(
+                success=True,
+                data=render_receipts(template, receipts, receipt_format)
+            )
+        except Exception as e:
+            return ServiceResult(
+                success=False,
+                error=f"Failed to print receipt: {str(e)}"
+            )
+
+    async def reprint_receipts(
+        self,
+        tenant_id: uuid.UUID,
+        day: date,
+        receipt_format: str = "text",
+        context: Optional[TenantContext] = None
+    ) -> ServiceResult:
+        """Render every receipt of one local day into a single document, oldest first"""
+        try:
+            context = context or await load_tenant_context(self.db, tenant_id)
+            local_day = day_range(day, context.time_zone if context else timezone.utc)
+            rows = await self.repository.get_receipt_rows(tenant_id, start=local_day.start, end=local_day.end)
+            template = await self.get_receipt_template(tenant_id)
+            receipts = await self._group_receipts(rows, tenant_id, context)
+            return ServiceResult(
+                success=True,
+                data=render_receipts(template, receipts, receipt_format),
+                message=f"{len(receipts)} receipts"
+            )
+        except Exception as e:
+            return ServiceResult(
+                success=False,
+                error=f"Failed to reprint receipts: {str(e)}"
+            )
+
+
+SALES_LEDGER_COLUMNS = [
+    "sale_id", "sale_date", "sale_status", "payment_method", "customer_name", "total_amount",
+    "amount_received", "change_given", "line_id", "edition_id", "isbn", "title", "author",
+    "quantity_sold", "price_per_unit", "total_price", "tax_amount", "discount_amount"
+]
+
+
+async def export_sales_ledger(
+    tenant_id: uuid.UUID,
+    date_from: date,
+    date_to: date,
+    export_format: str = "csv",
+    compress: bool = False,
+    time_zone: tzinfo = timezone.utc
+) -> AsyncIterator[bytes]:
+    """
+    Stream every sale and sale line between date_from and date_to (inclusive, tenant local
+    days) as CSV or NDJSON.
+    Opens its own session since the body is produced after the request has returned.
+    """
+    date_range = tenant_range(date_from, date_to, time_zone)
+    async with async_session_maker() as session:
+        rows = SalesRepository(session).iter_sales_ledger(tenant_id, date_range.start, date_range.end)
+        if export_format == "ndjson":
+            chunks = ndjson_stream(rows)
+        else:
+            chunks = csv_stream(SALES_LEDGER_COLUMNS, (
+                [row[column] for column in SALES_LEDGER_COLUMNS] async for row in rows
+            ))
+        if compress:
+            chunks = gzip_stream(chunks)
+        async for chunk in chunks:
+            yield chunk
+
+
+async def export_sales_facts(
+    tenant_id: uuid.UUID,
+    date_from: date,
+    date_to: date,
+    export_format: str = "parquet",
+    time_zone: tzinfo = timezone.utc
+) -> AsyncIterator[bytes]:
+    """
+    Stream sale-line facts as a zip of month-partitioned Parquet or Arrow IPC files,
+    partitioned on the tenant's local months.
+    Only one month is held in memory at a time.
+    """
+    extension = "arrow" if export_format == "arrow" else "parquet"
+
+    async def months():
+        async with async_session_maker() as session:
+            repository = SalesRepository(session)
+            for year, month, start, end in month_ranges(date_from, date_to, time_zone):
+                rows = repository.iter_sales_ledger(tenant_id, start, end)
+                data = await write_month(rows, tenant_id, year, month, export_format)
+                if data:
+                    yield f"year={year}/month={month}/sales-{year}-{month:02d}.{extension}", data
+
+    async for chunk in stream_partitioned_zip(months()):
+        yield chunk
@@ -0,0 +1,179 @@
+"""
+Supplier price lists.
+
+Suppliers send CSV price lists of ISBN, unit cost and availability. They are loaded into
+suppliercatalog, one row per tenant, supplier and edition (a supplier shared by several
+tenants may quote each of them differently), in batches: each batch is a single
+INSERT ... SELECT over unnest() of column arrays joined to bookedition on ISBN, with
+ON CONFLICT updating the existing price. Five array parameters per batch keep the
+statement small however many lines it carries, and ISBNs that match no edition simply
+drop out of the join.
+
+Price lines are normalised to ISBN-13. Editions may be stored as ISBN-10 or ISBN-13,
+with or without hyphens, so each line also carries its ISBN-10 form (for 978 ISBNs)
+and the join compares both against the edition's ISBN with hyphens removed. Each batch is audited as one entry against the supplier rather
+than one per price.
+"""
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import uuid
+
+from sqlalchemy import ARRAY, Boolean, Integer, Numeric, String, bindparam, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from ...db import models
+from ...db.audit import audit_core_write
+
+# Lines sent to the database per statement
+BATCH_SIZE = 5000
+
+# Accepted header names for each price list column
+ISBN_HEADERS = {"isbn", "isbn_number", "isbn13", "ean"}
+COST_HEADERS = {"unit_cost", "cost", "price", "unit_price"}
+AVAILABILITY_HEADERS = {"availability", "available", "in_stock", "stock", "quantity"}
+
+IN_STOCK_WORDS = {"", "y", "yes", "true", "available", "in stock", "instock"}
+OUT_OF_STOCK_WORDS = {"n", "no", "false", "unavailable", "out of stock", "oos", "discontinued"}
+
+# (isbn, unit_cost, in_stock, quantity_available); the ISBN is always ISBN-13
+PriceLine = Tuple[str, Decimal, bool, Optional[int]]
+
+# Edition ISBN as price lines are matched against it. Matches the expression index
+# ix_bookedition_isbn_normalised, so the constants are inlined rather than bound.
+NORMALISED_ISBN = func.replace(func.upper(models.BookEdition.isbn_number), literal_column("'-'"), literal_column("''"))
+
+
+def _isbn10_check_digit(digits: str) -> str:
+    check = (11 - sum(int(d) * weight for d, weight in zip(digits, range(10, 1, -1))) % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def _isbn13_check_digit(digits: str) -> str:
+    return str((10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10)
+
+
+def isbn10_to_isbn13(isbn: str) -> str:
+    """ISBN-13 for a valid ISBN-10; raises ValueError if its check digit is wrong"""
+    if _isbn10_check_digit(isbn[:9]) != isbn[9]:
+        raise ValueError("ISBN-10 check digit does not match")
+    return "978" + isbn[:9] + _isbn13_check_digit("978" + isbn[:9])
+
+
+def isbn13_to_isbn10(isbn: str) -> Optional[str]:
+    """ISBN-10 form of an ISBN-13, or None for 979 ISBNs, which have none"""
+    if not isbn.startswith("978"):
+        return None
+    return isbn[3:12] + _isbn10_check_digit(isbn[3:12])
+
+
+def resolve_columns(header: Sequence[str]) -> Tuple[int, int, Optional[int]]:
+    """Positions of the ISBN, cost and (optional) availability columns in a header row"""
+    names = [name.strip().lower().replace(" ", "_") for name in header]
+
+    def find(accepted: set) -> Optional[int]:
+        return next((i for i, name in enumerate(names) if name in accepted), None)
+
+    isbn, cost, availability = find(ISBN_HEADERS), find(COST_HEADERS), find(AVAILABILITY_HEADERS)
+    if isbn is None or cost is None:
+        raise ValueError("Price list needs an ISBN column and a unit cost column")
+    return isbn, cost, availability
+
+
+def parse_price_line(row: Sequence[str], columns: Tuple[int, int, Optional[int]]) -> PriceLine:
+    isbn_at, cost_at, availability_at = columns
+    if len(row) <= max(isbn_at, cost_at):
+        raise ValueError("missing columns")
+
+    isbn = row[isbn_at].replace("-", "").replace(" ", "").upper()
+    # An ISBN-10 check digit of ten is written X
+    digits = isbn[:-1] if len(isbn) == 10 and isbn.endswith("X") else isbn
+    if len(isbn) not in (10, 13) or not digits.isdigit():
+        raise ValueError(f"invalid ISBN '{row[isbn_at]}'")
+    if len(isbn) == 10:
+        try:
+            isbn = isbn10_to_isbn13(isbn)
+        except ValueError:
+            raise ValueError(f"invalid ISBN '{row[isbn_at]}'")
+
+    try:
+        unit_cost = Decimal(row[cost_at].strip().replace(",", "")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError(f"invalid unit cost '{row[cost_at]}'")
+    if unit_cost <= 0 or unit_cost >= Decimal("100000000"):
+        raise ValueError(f"unit cost out of range '{row[cost_at]}'")
+
+    availability = row[availability_at].strip().lower() if availability_at is not None and availability_at < len(row) else ""
+    if availability.isdigit():
+        return isbn, unit_cost, int(availability) > 0, int(availability)
+    if availability in IN_STOCK_WORDS:
+        return isbn, unit_cost, True, None
+    if availability in OUT_OF_STOCK_WORDS:
+        return isbn, unit_cost, False, None
+    raise ValueError(f"unrecognised availability '{row[availability_at]}'")
+
+
+class SupplierCatalogRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def upsert_prices(self, tenant_id: uuid.UUID, supplier_id: uuid.UUID, lines: Iterable[PriceLine]) -> int:
+        """
+        Insert or update one batch of price lines; ISBNs must be unique within the batch.
+        Returns the number of lines that matched an edition.
+        """
+        isbns, costs, in_stock, quantities = (list(column) for column in zip(*lines))
+        price_list = func.unnest(
+            bindparam("isbns", isbns, type_=ARRAY(String)),
+            bindparam("isbn10s", [isbn13_to_isbn10(isbn) for isbn in isbns], type_=ARRAY(String)),
+            bindparam("costs", costs, type_=ARRAY(Numeric(10, 2))),
+            bindparam("in_stock", in_stock, type_=ARRAY(Boolean)),
+            bindparam("quantities", quantities, type_=ARRAY(Integer))
+        ).table_valued("isbn", "isbn10", "unit_cost", "in_stock", "quantity_available").render_derived(name="price_list")
+
+        table = models.SupplierCatalog.__table__
+        source = select(
+            literal(tenant_id),
+            literal(supplier_id),
+            models.BookEdition.edition_id,
+            price_list.c.unit_cost,
+            price_list.c.in_stock,
+            price_list.c.quantity_available,
+            literal(datetime.now())
+        ).select_from(price_list).join(
+            models.BookEdition, NORMALISED_ISBN.in_([price_list.c.isbn, price_list.c.isbn10])
+        )
+        stmt = pg_insert(table).from_select(
+            ["tenant_id", "supplier_id", "edition_id", "unit_cost", "in_stock", "quantity_available", "updated_at"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.tenant_id, table.c.supplier_id, table.c.edition_id],
+            set_={
+                "unit_cost": stmt.excluded.unit_cost,
+                "in_stock": stmt.excluded.in_stock,
+                "quantity_available": stmt.excluded.quantity_available,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        result = await self.db.execute(stmt)
+        audit_core_write(
+            self.db, table, tenant_id, supplier_id, "upsert",
+            new={"price_lines": len(isbns), "editions_priced": result.rowcount}
+        )
+        return result.rowcount
+
+    async def get_costs(self, tenant_id: uuid.UUID, supplier_id: uuid.UUID,
+                        edition_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Decimal]:
+        """Current catalogue cost for each of the editions the supplier lists for the tenant"""
+        if not edition_ids:
+            return {}
+        result = await self.db.execute(
+            select(models.SupplierCatalog.edition_id, models.SupplierCatalog.unit_cost).where(
+                models.SupplierCatalog.tenant_id == tenant_id,
+                models.SupplierCatalog.supplier_id == supplier_id,
+                models.SupplierCatalog.edition_id.in_(edition_ids)
+            )
+        )
+        return {edition_id: unit_cost for edition_id, unit_cost in result.all()}
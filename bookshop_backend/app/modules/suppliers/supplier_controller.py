@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Body, Response, status, HTTPException, Request, Depends, Path, Query
+from fastapi import APIRouter, Body, Response, status, HTTPException, Request, Depends, Path, Query, UploadFile, File
 from .supplier_model import SupplierCreate
 from .supplier_service import SupplierService
+from ...utils.streaming import csv_reader
 from ...db.session import SessionDep
 from ...utils.auth import (
     get_current_user,
@@ -13,7 +14,15 @@ from ...utils.auth import (
 )
 import uuid
 
-from typing import Annotated
+from typing import Annotated, AsyncIterator
+
+# Bytes read from an uploaded price list at a time
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
 
 
 router = APIRouter()
@@ -102,6 +111,31 @@ async def get_supplier_dashboard(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/{supplier_id}/catalog", status_code=status.HTTP_200_OK)
+async def import_supplier_catalog(
+    supplier_id: uuid.UUID,
+    db: SessionDep,
+    file: UploadFile = File(..., description="CSV with ISBN, unit cost and optional availability columns"),
+    user: CurrentUser = Depends(require_permission(Permission.WRITE_SUPPLIERS))
+):
+    """
+    Load a supplier's price list. Existing prices for the same editions are replaced;
+    these become the default unit costs when drafting purchase orders.
+    Requires: Write suppliers permission (Admin/Manager)
+    """
+    service = SupplierService(db)
+    result = await service.import_price_list(
+        tenant_id=get_current_tenant_id(user),
+        supplier_id=supplier_id,
+        rows=csv_reader(read_upload(file))
+    )
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND if result.error == "Supplier not found" else status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+    return result.data
+
 @router.get("/{supplier_id}", status_code=status.HTTP_200_OK)
 async def get_supplier(
     supplier_id: str,
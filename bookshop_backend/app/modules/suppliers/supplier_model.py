@@ -1,6 +1,7 @@
 import uuid
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from decimal import Decimal
 
 
 class SupplierCreate(BaseModel):
@@ -23,8 +24,27 @@ class Supplier(BaseModel):
     status: str = Field(..., max_length=20)
 
 
+class SupplierDashboardEntry(Supplier):
+    open_orders: int = Field(0, description="Purchase orders awaiting delivery")
+    open_po_value: Decimal = Field(Decimal("0"), description="Value of stock still to be delivered on open orders")
+    delivered_orders: int = Field(0, description="Fully delivered purchase orders")
+    lead_time_orders: int = Field(0, description="Delivered orders that received stock, which the lead time averages over")
+    avg_lead_time_days: Optional[float] = Field(None, description="Average days from order to first delivery")
+    titles_supplied: int = Field(0, description="Distinct titles received from this supplier")
+
+
 class SupplierDashboardResponse(BaseModel):
     total_suppliers: int = Field(..., description="Total number of suppliers")
     total_books: int = Field(..., description="Total number of books from all suppliers")
     total_active_suppliers: int = Field(..., description="Number of active suppliers")
-    supplier_list: List[Supplier] = Field(default_factory=list, description="List of suppliers")
+    open_po_value: Decimal = Field(Decimal("0"), description="Value still to be delivered across all suppliers")
+    avg_lead_time_days: Optional[float] = Field(None, description="Average days from order to first delivery")
+    supplier_list: List[SupplierDashboardEntry] = Field(default_factory=list, description="List of suppliers")
+
+
+class PriceListImportSummary(BaseModel):
+    rows_read: int = Field(..., description="Data rows in the file, excluding the header")
+    rows_upserted: int = Field(..., description="Catalogue entries inserted or updated")
+    unknown_isbns: int = Field(..., description="Valid lines whose ISBN matches no book edition")
+    rows_rejected: int = Field(..., description="Lines that could not be parsed")
+    errors: List[str] = Field(default_factory=list, description="The first few parse errors, by line number")
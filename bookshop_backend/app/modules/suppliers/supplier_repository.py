@@ -1,10 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-from typing import List, Optional, Union
+from sqlalchemy import distinct, extract
+from sqlmodel import select, func
+from typing import Any, Dict, List, Optional, Union
 import uuid
 from ...db import models
 from .supplier_model import SupplierCreate
 
+# Purchase orders placed with the supplier and still awaiting stock
+OPEN_PO_STATUSES = ["pending", "approved", "partial"]
+# Fully delivered orders
+DELIVERED_PO_STATUSES = ["received", "completed"]
+
 class SupplierRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -42,13 +48,102 @@ class SupplierRepository:
         return result.scalar_one_or_none() is not None
 
     async def list_suppliers(self, tenant_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[models.Supplier]:
+        """Suppliers linked to the tenant; a supplier can be shared by several tenants"""
         result = await self.db.execute(
-            select(models.Supplier).where(models.Supplier.tenant_id == tenant_id).offset(skip).limit(limit)
+            select(models.Supplier).join(
+                models.TenantSupplier, models.TenantSupplier.supplier_id == models.Supplier.id
+            ).where(
+                models.TenantSupplier.tenant_id == tenant_id
+            ).order_by(models.Supplier.name, models.Supplier.id).offset(skip).limit(limit)
         )
         return result.scalars().all()
 
+    async def get_dashboard_rows(self, tenant_id: uuid.UUID) -> List[Dict[str, Any]]:
+        """
+        Every supplier linked to the tenant with its purchasing figures, in one statement:
+        open orders and their outstanding value, delivered orders and the average days
+        from order to first delivery over those that received any stock (an order closed
+        by hand may have none), and distinct titles received. Each row also carries
+        total_titles, the distinct titles received across all of the tenant's suppliers.
+        """
+        po = models.PurchaseOrder
+        item = models.PurchaseOrderItems
+
+        # Value still to be delivered per order
+        outstanding = select(
+            item.po_id,
+            func.sum((item.quantity_ordered - item.quantity_received) * item.unit_cost).label("value")
+        ).join(
+            po, po.id == item.po_id
+        ).where(
+            po.tenant_id == tenant_id
+        ).group_by(item.po_id).subquery()
+
+        is_open = po.status.in_(OPEN_PO_STATUSES)
+        is_delivered = po.status.in_(DELIVERED_PO_STATUSES)
+        orders = select(
+            po.supplier_id,
+            func.count().filter(is_open).label("open_orders"),
+            func.sum(outstanding.c.value).filter(is_open).label("open_po_value"),
+            func.count().filter(is_delivered).label("delivered_orders"),
+            func.count(po.first_received_at).filter(is_delivered).label("lead_time_orders"),
+            func.avg(extract("epoch", po.first_received_at - po.order_date) / 86400).filter(is_delivered).label("avg_lead_time_days")
+        ).outerjoin(
+            outstanding, outstanding.c.po_id == po.id
+        ).where(
+            po.tenant_id == tenant_id
+        ).group_by(po.supplier_id).subquery()
+
+        titles = select(
+            po.supplier_id,
+            func.count(distinct(item.edition_id)).label("titles_supplied")
+        ).join(
+            po, po.id == item.po_id
+        ).where(
+            po.tenant_id == tenant_id,
+            item.quantity_received > 0
+        ).group_by(po.supplier_id).subquery()
+
+        total_titles = select(
+            func.count(distinct(item.edition_id))
+        ).join(
+            po, po.id == item.po_id
+        ).where(
+            po.tenant_id == tenant_id,
+            item.quantity_received > 0
+        ).scalar_subquery()
+
+        stmt = select(
+            models.Supplier.id,
+            models.Supplier.name,
+            models.Supplier.contact_person,
+            models.Supplier.contact_info,
+            models.Supplier.phone_number,
+            models.Supplier.address,
+            models.Supplier.status,
+            func.coalesce(orders.c.open_orders, 0).label("open_orders"),
+            func.coalesce(orders.c.open_po_value, 0).label("open_po_value"),
+            func.coalesce(orders.c.delivered_orders, 0).label("delivered_orders"),
+            func.coalesce(orders.c.lead_time_orders, 0).label("lead_time_orders"),
+            orders.c.avg_lead_time_days,
+            func.coalesce(titles.c.titles_supplied, 0).label("titles_supplied"),
+            total_titles.label("total_titles")
+        ).select_from(
+            models.TenantSupplier
+        ).join(
+            models.Supplier, models.Supplier.id == models.TenantSupplier.supplier_id
+        ).outerjoin(
+            orders, orders.c.supplier_id == models.Supplier.id
+        ).outerjoin(
+            titles, titles.c.supplier_id == models.Supplier.id
+        ).where(
+            models.TenantSupplier.tenant_id == tenant_id
+        ).order_by(models.Supplier.name, models.Supplier.id)
+
+        result = await self.db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
     async def save(self, model: Union[models.Supplier, models.TenantSupplier]) -> Union[models.Supplier, models.TenantSupplier]:
         self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
+        await self.db.flush()
         return model
\ No newline at end of file
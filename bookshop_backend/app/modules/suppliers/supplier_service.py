@@ -1,15 +1,35 @@
 from ...db.session import SessionDep
-from .supplier_model import SupplierCreate, SupplierDashboardResponse
+from functools import partial
+from ...db.unit_of_work import after_commit, transactional
+from .supplier_model import SupplierCreate, SupplierDashboardResponse, PriceListImportSummary
 from .supplier_repository import SupplierRepository
+from .supplier_catalog_repository import (
+    BATCH_SIZE, PriceLine, SupplierCatalogRepository, parse_price_line, resolve_columns
+)
 from ...utils.result import ServiceResult
-from ..books.book_service import BookService
+from ...utils.cache import BoundedCache
+from typing import AsyncIterator, Dict, List
+import uuid
+
+# Parse errors echoed back from a price list import; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+# Per-tenant dashboards; supplier and purchase order writes drop the tenant's entry, the
+# TTL bounds staleness for writes made by other workers
+supplier_dashboard_cache: BoundedCache[SupplierDashboardResponse] = BoundedCache(maxsize=4096, ttl=300)
+
+
+def invalidate_supplier_dashboard(tenant_id: uuid.UUID) -> None:
+    supplier_dashboard_cache.pop(tenant_id)
 
 
 class SupplierService:
     def __init__(self, db: SessionDep):
+        self.db = db
         self.repo = SupplierRepository(db)
-        self.book = BookService(db)
+        self.catalog = SupplierCatalogRepository(db)
 
+    @transactional
     async def create_supplier(self, supplier_data: SupplierCreate) -> ServiceResult:
         try:
             # Check if supplier already exists
@@ -22,11 +42,13 @@ class SupplierService:
                     return ServiceResult(success=False, error="Supplier already exists for this tenant")
                 
                 await self.repo.add_tenant_to_supplier(existing_supplier.id, supplier_data.tenant_id)
+                after_commit(self.db, partial(invalidate_supplier_dashboard, supplier_data.tenant_id))
                 return ServiceResult(success=True, data=existing_supplier)
             
             # Create new supplier
             supplier_id = await self.repo.create_supplier(supplier_data)
             await self.repo.add_tenant_to_supplier(supplier_id, supplier_data.tenant_id)
+            after_commit(self.db, partial(invalidate_supplier_dashboard, supplier_data.tenant_id))
             return ServiceResult(success=True, data=supplier_id)
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
@@ -38,38 +60,87 @@ class SupplierService:
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
 
-    async def get_supplier_dashboard(self, tenant_id: str) -> ServiceResult:
+    async def get_supplier_dashboard(self, tenant_id: uuid.UUID) -> ServiceResult:
         try:
-            suppliers_data = await self.repo.list_suppliers(tenant_id)
-            
-            # Convert SQLModel objects to dictionaries for Pydantic validation
-            suppliers_list = []
-            for supplier in suppliers_data:
-                supplier_dict = {
-                    "id": str(supplier.id),
-                    "name": supplier.name,
-                    "contact_person": supplier.contact_person,
-                    "contact_info": supplier.contact_info,
-                    "phone_number": supplier.phone_number,
-                    "address": supplier.address,
-                    "status": supplier.status
-                }
-                suppliers_list.append(supplier_dict)
-            
+            cached = supplier_dashboard_cache.get(tenant_id)
+            if cached is not None:
+                return ServiceResult(success=True, data=cached)
+
+            rows = await self.repo.get_dashboard_rows(tenant_id)
+
+            # Lead time over all orders that received stock, not the mean of supplier averages
+            timed = [row for row in rows if row["avg_lead_time_days"] is not None]
+            delivered = sum(row["lead_time_orders"] for row in timed)
+            lead_days = sum(float(row["avg_lead_time_days"]) * row["lead_time_orders"] for row in timed)
             dashboard_data = {
-                "total_suppliers": len(suppliers_data),
-                "total_active_suppliers": sum(1 for s in suppliers_data if s.status == "active"),
-                "total_books": 0,  # Default value, will be updated below
-                "supplier_list": suppliers_list
+                "total_suppliers": len(rows),
+                "total_active_suppliers": sum(1 for row in rows if row["status"] == "active"),
+                "total_books": rows[0]["total_titles"] if rows else 0,
+                "open_po_value": sum(row["open_po_value"] for row in rows),
+                "avg_lead_time_days": lead_days / delivered if delivered else None,
+                "supplier_list": [{**row, "id": str(row["id"])} for row in rows]
             }
-            
-            books_count_result = await self.book.get_total_books_count(tenant_id)
-            if books_count_result.success:
-                dashboard_data["total_books"] = books_count_result.data.get("total_books", 0)
-            else:
-                dashboard_data["total_books"] = 0
-                
+
             validated_data = SupplierDashboardResponse.model_validate(dashboard_data)
+            supplier_dashboard_cache.set(tenant_id, validated_data)
             return ServiceResult(success=True, data=validated_data)
         except Exception as e:
-            return ServiceResult(success=False, error=str(e))
\ No newline at end of file
+            return ServiceResult(success=False, error=str(e))
+
+    @transactional
+    async def import_price_list(self, tenant_id: uuid.UUID, supplier_id: uuid.UUID,
+                                rows: AsyncIterator[List[str]]) -> ServiceResult:
+        """
+        Load a supplier's CSV price list into the catalogue as the rows stream in,
+        upserting BATCH_SIZE lines per statement. Bad lines are skipped and reported;
+        the import commits as a whole.
+        """
+        try:
+            if not await self.repo.check_tenant_supplier_exists(tenant_id, supplier_id):
+                return ServiceResult(success=False, error="Supplier not found")
+
+            columns = None
+            rows_read = rows_rejected = accepted = upserted = 0
+            errors: List[str] = []
+            batch: Dict[str, PriceLine] = {}
+            line_number = 0
+            async for row in rows:
+                line_number += 1
+                if columns is None:
+                    columns = resolve_columns(row)
+                    continue
+                if not any(field.strip() for field in row):
+                    continue
+                rows_read += 1
+                try:
+                    line = parse_price_line(row, columns)
+                except ValueError as e:
+                    rows_rejected += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Line {line_number}: {e}")
+                    continue
+                # A repeated ISBN in the same batch would hit ON CONFLICT twice; the last line wins
+                batch[line[0]] = line
+                if len(batch) >= BATCH_SIZE:
+                    accepted += len(batch)
+                    upserted += await self.catalog.upsert_prices(tenant_id, supplier_id, batch.values())
+                    batch = {}
+            if columns is None:
+                return ServiceResult(success=False, error="Price list is empty")
+            if batch:
+                accepted += len(batch)
+                upserted += await self.catalog.upsert_prices(tenant_id, supplier_id, batch.values())
+
+            return ServiceResult(
+                success=True,
+                data=PriceListImportSummary(
+                    rows_read=rows_read,
+                    rows_upserted=upserted,
+                    unknown_isbns=accepted - upserted,
+                    rows_rejected=rows_rejected,
+                    errors=errors
+                ),
+                message="Price list imported successfully"
+            )
+        except Exception as e:
+            return ServiceResult(success=False, error=str(e))
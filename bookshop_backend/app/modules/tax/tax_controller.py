@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Body, HTTPException, status, Depends, Path, Query
-from .tax_model import CreateTaxModel, UpdateTaxModel
+from .tax_model import CreateTaxModel, UpdateTaxModel, TaxBasketRequest
 from .tax_service import TaxService
 from ...db.session import SessionDep
 from ...utils.auth import (
@@ -122,6 +122,32 @@ async def get_default_tax_rate(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post('/compute', status_code=status.HTTP_200_OK)
+async def compute_basket_tax(
+    basket: TaxBasketRequest,
+    db: SessionDep,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Compute VAT for a whole basket using the tenant's cached rate table.
+    Prices are tax-inclusive; tax is rounded half-up per line.
+    Available to all authenticated users.
+    """
+    service = TaxService(db)
+    result = await service.compute_basket_tax(
+        user.tenant_id,
+        [(item.price_per_unit, item.quantity, item.discount_amount) for item in basket.items],
+        tax_rate_id=basket.tax_rate_id
+    )
+
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.error
+        )
+
+    return result.data
+
 @router.get('/{tax_rate_id}', status_code=status.HTTP_200_OK)
 async def get_tax_rate(
     tax_rate_id: str,
@@ -147,6 +173,8 @@ async def get_tax_rate(
         
         return result.data
         
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -185,6 +213,8 @@ async def update_tax_rate(
         
         return {"message": "Tax rate updated successfully", "data": result.data}
         
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -221,6 +251,8 @@ async def delete_tax_rate(
         
         return {"message": "Tax rate deleted successfully"}
         
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -257,6 +289,8 @@ async def set_default_tax_rate(
         
         return {"message": "Default tax rate set successfully"}
         
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,81 @@
+"""
+Server-side tax computation.
+
+Shelf prices are VAT-inclusive (the POS shows the grand total as the discounted subtotal),
+so tax is extracted from each line as net * rate / (1 + rate) and rounded half-up to the
+cent per line. Basket totals are sums of the rounded lines, matching what is printed.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Optional, Sequence, Tuple
+import uuid
+
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class EffectiveRate:
+    id: uuid.UUID
+    name: str
+    rate: Decimal
+    default: bool
+    effective_date: datetime
+    description: Optional[str] = None
+
+
+@dataclass
+class TaxTable:
+    """All of a tenant's tax rates, loaded once and resolved against a point in time"""
+    rates: List[EffectiveRate] = field(default_factory=list)
+
+    def _effective(self, rate: EffectiveRate, at: datetime) -> bool:
+        effective_date = rate.effective_date
+        # Stored dates may be naive or aware depending on how they were written
+        if effective_date.tzinfo is not None and at.tzinfo is None:
+            at = at.astimezone()
+        elif effective_date.tzinfo is None and at.tzinfo is not None:
+            effective_date = effective_date.replace(tzinfo=at.tzinfo)
+        return effective_date <= at
+
+    def get(self, tax_rate_id: uuid.UUID, at: datetime) -> Optional[EffectiveRate]:
+        return next((rate for rate in self.rates if rate.id == tax_rate_id and self._effective(rate, at)), None)
+
+    def default_rate(self, at: datetime) -> Optional[EffectiveRate]:
+        """The tenant's default rate, provided it has come into effect"""
+        return next((rate for rate in self.rates if rate.default and self._effective(rate, at)), None)
+
+
+@dataclass
+class LineTax:
+    net_amount: Decimal
+    tax_amount: Decimal
+
+
+@dataclass
+class BasketTax:
+    rate: Decimal
+    lines: List[LineTax]
+    total_amount: Decimal
+    total_tax: Decimal
+
+
+def compute_basket_tax(lines: Sequence[Tuple[Decimal, int, Decimal]], rate: Decimal) -> BasketTax:
+    """
+    Tax for a whole basket at one rate.
+
+    Each line is (unit price, quantity, line discount); prices include tax.
+    """
+    divisor = 1 + rate
+    taxed = []
+    for unit_price, quantity, discount in lines:
+        net = (Decimal(unit_price) * quantity - Decimal(discount or 0)).quantize(CENT, rounding=ROUND_HALF_UP)
+        tax = (net * rate / divisor).quantize(CENT, rounding=ROUND_HALF_UP) if net > 0 else Decimal("0.00")
+        taxed.append(LineTax(net_amount=net, tax_amount=tax))
+
+    return BasketTax(
+        rate=rate,
+        lines=taxed,
+        total_amount=sum((line.net_amount for line in taxed), Decimal("0.00")),
+        total_tax=sum((line.tax_amount for line in taxed), Decimal("0.00"))
+    )
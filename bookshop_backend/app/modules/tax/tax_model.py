@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
 
 class CreateTaxModel(BaseModel):
@@ -36,4 +37,13 @@ class TaxResponseModel(BaseModel):
         from_attributes = True
 
     def __repr__(self):
-        return f"TaxResponseModel(id={self.id}, name={self.taxName}, rate={self.taxRate})"
\ No newline at end of file
+        return f"TaxResponseModel(id={self.id}, name={self.taxName}, rate={self.taxRate})"
+
+class TaxBasketLine(BaseModel):
+    price_per_unit: Decimal = Field(..., max_digits=10, decimal_places=2, gt=0, description="Tax-inclusive unit price")
+    quantity: int = Field(..., gt=0)
+    discount_amount: Decimal = Field(default=Decimal("0.00"), max_digits=10, decimal_places=2, ge=0)
+
+class TaxBasketRequest(BaseModel):
+    items: List[TaxBasketLine] = Field(..., min_items=1)
+    tax_rate_id: Optional[uuid.UUID] = Field(default=None, description="Rate to apply; defaults to the tenant's default rate")
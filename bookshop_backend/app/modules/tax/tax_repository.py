@@ -1,8 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, exists, update
+from sqlalchemy.orm import aliased
 from sqlmodel import select
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from datetime import datetime
 import uuid
 from ...db import models
+from ...db.audit import audit_core_write
 from .tax_model import CreateTaxModel
 
 
@@ -19,13 +23,102 @@ class TaxRepository:
             effective_date=tax_rate_data.effectiveDate,
             tenant_id=tenant_id
             )
-        await self.save(tax_rate)
+        self.db.add(tax_rate)
+        await self.db.flush()
+        if tax_rate.default:
+            await self._switch_default(tax_rate.id, tenant_id)
         return tax_rate
     
-    async def get_tax_rate_by_id(self, tax_rate_id: uuid.UUID) -> Optional[models.TaxRates]:
-        result = await self.db.execute(select(models.TaxRates).where(models.TaxRates.id == tax_rate_id))
+    async def get_tax_rate_by_id(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[models.TaxRates]:
+        result = await self.db.execute(
+            select(models.TaxRates).where(models.TaxRates.id == tax_rate_id, models.TaxRates.tenant_id == tenant_id)
+        )
         return result.scalar_one_or_none()
 
+    def _switch_default_stmt(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID):
+        """
+        Make `tax_rate_id` the tenant's only default in one statement.
+
+        Every tax rate of the tenant is rewritten, not just the old and new default: a
+        concurrent switch then blocks on the same rows and re-evaluates them after this one
+        commits, instead of skipping rows that were not defaults in its snapshot.
+        The one-default constraint is deferred, so the order rows are visited in does not matter.
+        Each row comes back with its flag from before the switch, joined from the statement's snapshot.
+        """
+        previous = aliased(models.TaxRates)
+        return update(models.TaxRates).where(
+            models.TaxRates.tenant_id == tenant_id,
+            previous.id == models.TaxRates.id,
+            exists().where(models.TaxRates.id == tax_rate_id, models.TaxRates.tenant_id == tenant_id)
+        ).values(
+            default=(models.TaxRates.id == tax_rate_id),
+            updated_at=datetime.now()
+        ).execution_options(synchronize_session=False).returning(models.TaxRates.id, previous.default)
+
+    async def _switch_default(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """Run the default switch and audit the rates whose flag it flipped"""
+        result = await self.db.execute(self._switch_default_stmt(tax_rate_id, tenant_id))
+        rows = result.all()
+        for rate_id, was_default in rows:
+            audit_core_write(
+                self.db, models.TaxRates.__table__, tenant_id, rate_id, "update",
+                old={"default": was_default}, new={"default": rate_id == tax_rate_id}
+            )
+        return bool(rows)
+
+    async def set_default_tax_rate(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """Switch the tenant's default rate; False if the rate is not the tenant's"""
+        return await self._switch_default(tax_rate_id, tenant_id)
+
+    async def update_tax_rate(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID, values: Dict[str, Any]) -> Optional[models.TaxRates]:
+        """
+        Apply `values` to one of the tenant's rates. `default=True` is routed through the
+        default switch so the previous default is cleared in the same transaction.
+        """
+        default = values.pop("default", None)
+        if default is False:
+            values["default"] = False
+        if default is True:
+            await self._switch_default(tax_rate_id, tenant_id)
+        # The updated row comes back through RETURNING rather than a separate refresh, with
+        # the previous values of the updated columns for the audit log
+        previous = aliased(models.TaxRates)
+        result = await self.db.execute(
+            update(models.TaxRates).where(
+                models.TaxRates.id == tax_rate_id,
+                models.TaxRates.tenant_id == tenant_id,
+                previous.id == models.TaxRates.id
+            ).values(
+                **values,
+                updated_at=datetime.now()
+            ).execution_options(synchronize_session=False, populate_existing=True).returning(
+                models.TaxRates, *(getattr(previous, column) for column in values)
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        tax_rate, old_values = row[0], row[1:]
+        audit_core_write(
+            self.db, models.TaxRates.__table__, tenant_id, tax_rate.id, "update",
+            old=dict(zip(values, old_values)), new={column: getattr(tax_rate, column) for column in values}
+        )
+        return tax_rate
+
+    async def delete_tax_rate(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        table = models.TaxRates.__table__
+        result = await self.db.execute(
+            delete(table).where(
+                table.c.id == tax_rate_id,
+                table.c.tenant_id == tenant_id
+            ).returning(*table.c)
+        )
+        row = result.mappings().one_or_none()
+        if row is None:
+            return False
+        audit_core_write(self.db, table, tenant_id, tax_rate_id, "delete", old=dict(row))
+        return True
+
     async def get_tax_rate_by_name(self, name: str, tenant_id: uuid.UUID) -> Optional[models.TaxRates]:
         result = await self.db.execute(
             select(models.TaxRates).where(models.TaxRates.name == name, models.TaxRates.tenant_id == tenant_id)
@@ -57,6 +150,5 @@ class TaxRepository:
 
     async def save(self, tax_rate: models.TaxRates) -> models.TaxRates: 
         self.db.add(tax_rate)
-        await self.db.commit()
-        await self.db.refresh(tax_rate)
+        await self.db.flush()
         return tax_rate
\ No newline at end of file
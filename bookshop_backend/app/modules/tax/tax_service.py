@@ -1,79 +1,164 @@
 from .tax_model import CreateTaxModel, UpdateTaxModel, TaxResponseModel
 from .tax_repository import TaxRepository
+from .tax_engine import EffectiveRate, TaxTable, compute_basket_tax
 from ...db.session import SessionDep
+from functools import partial
+from ...db.unit_of_work import after_commit, transactional
 from ...utils.result import ServiceResult
+from ...utils.cache import BoundedCache
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Sequence, Tuple
 import uuid
 
+# Per-tenant rate tables; writes through TaxService drop the tenant's entry, the TTL
+# bounds staleness for writes made by other workers
+tax_table_cache: BoundedCache[TaxTable] = BoundedCache(maxsize=4096, ttl=600)
+
+
+# UpdateTaxModel fields -> TaxRates columns
+UPDATE_FIELDS = {
+    "taxName": "name",
+    "taxRate": "rate",
+    "description": "description",
+    "isDefault": "default"
+}
+
+
+def invalidate_tax_rates(tenant_id: uuid.UUID) -> None:
+    tax_table_cache.pop(tenant_id)
+
 
 class TaxService:
     def __init__(self, db: SessionDep):
+        self.db = db
         self.repo = TaxRepository(db)
 
+    async def get_tax_table(self, tenant_id: uuid.UUID) -> TaxTable:
+        table = tax_table_cache.get(tenant_id)
+        if table is None:
+            rows = await self.repo.list_tax_rates_by_tenant(tenant_id)
+            table = TaxTable(rates=[
+                EffectiveRate(
+                    id=row["id"],
+                    name=row["taxName"],
+                    rate=Decimal(str(row["taxRate"])),
+                    default=row["isDefault"],
+                    effective_date=row["effectiveDate"],
+                    description=row["description"]
+                ) for row in rows
+            ])
+            tax_table_cache.set(tenant_id, table)
+        return table
+
+    async def compute_basket_tax(
+        self,
+        tenant_id: uuid.UUID,
+        lines: Sequence[Tuple[Decimal, int, Decimal]],
+        tax_rate_id: Optional[uuid.UUID] = None,
+        at: Optional[datetime] = None
+    ) -> ServiceResult:
+        """
+        Tax for a basket of (unit price, quantity, line discount) at the given rate,
+        or the tenant's default rate. data is None when no rate applies.
+        """
+        try:
+            at = at or datetime.now()
+            table = await self.get_tax_table(tenant_id)
+            rate = table.get(tax_rate_id, at) if tax_rate_id else table.default_rate(at)
+            if rate is None:
+                if tax_rate_id:
+                    return ServiceResult(success=False, error="Tax rate not found or not yet effective")
+                return ServiceResult(success=True, data=None, message="No tax rate in effect")
+            return ServiceResult(success=True, data=compute_basket_tax(lines, rate.rate))
+        except Exception as e:
+            return ServiceResult(success=False, error=str(e))
+
+    @transactional
     async def create_tax_rate(self, tax_rate_data: CreateTaxModel, tenant_id: uuid.UUID) -> ServiceResult:
         try:
             existing_tax_rate = await self.repo.get_tax_rate_by_name(tax_rate_data.taxName.lower(), tenant_id)
             if existing_tax_rate:
                 return ServiceResult(success=False, error="Tax rate with this name already exists")
 
-            if tax_rate_data.isDefault:
-                await self._unset_existing_default(tenant_id)
-
+            # A new default clears the previous one in the same transaction
             tax_rate_data.taxName = tax_rate_data.taxName.lower()
             tax_rate = await self.repo.create_tax_rate(tax_rate_data, tenant_id)
+            after_commit(self.db, partial(invalidate_tax_rates, tenant_id))
             return ServiceResult(success=True, data=tax_rate.id)
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
+
+    async def get_tax_rate_by_id(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> ServiceResult:
+        try:
+            tax_rate = await self.repo.get_tax_rate_by_id(tax_rate_id, tenant_id)
+            if not tax_rate:
+                return ServiceResult(success=False, error="Tax rate not found")
+            return ServiceResult(success=True, data=self._to_response(tax_rate))
+        except Exception as e:
+            return ServiceResult(success=False, error=str(e))
         
+    @transactional
     async def update_tax_rate(self, tax_rate_id: uuid.UUID, tax_rate_data: UpdateTaxModel, tenant_id: uuid.UUID) -> ServiceResult:
         try:
-            existing_tax_rate = await self.repo.get_tax_rate_by_id(tax_rate_id, tenant_id)
-            if not existing_tax_rate:
-                return ServiceResult(success=False, error="Tax rate not found")
-            
             # Check name uniqueness if name is being updated
             if tax_rate_data.taxName:
                 existing_tax_rate_by_name = await self.repo.get_tax_rate_by_name(tax_rate_data.taxName.lower(), tenant_id)
                 if existing_tax_rate_by_name and existing_tax_rate_by_name.id != tax_rate_id:
                     return ServiceResult(success=False, error="Tax rate with this name already exists")
-                existing_tax_rate.taxName = tax_rate_data.taxName.lower()
-
-            # If this tax rate is being set as default, unset any existing default
-            if tax_rate_data.isDefault:
-                await self._unset_existing_default(tenant_id, exclude_id=tax_rate_id)
-            
-            # Update the tax rate fields
-            for field, value in tax_rate_data.dict(exclude_unset=True).items():
-                if field != 'taxName':
-                    setattr(existing_tax_rate, field, value)
-            
-            await self.repo.save(existing_tax_rate)
-            return ServiceResult(success=True, data=existing_tax_rate)
+
+            values = {
+                UPDATE_FIELDS[field]: value.lower() if field == "taxName" else value
+                for field, value in tax_rate_data.model_dump(exclude_unset=True).items()
+                if value is not None
+            }
+            tax_rate = await self.repo.update_tax_rate(tax_rate_id, tenant_id, values)
+            if not tax_rate:
+                return ServiceResult(success=False, error="Tax rate not found")
+
+            after_commit(self.db, partial(invalidate_tax_rates, tenant_id))
+            return ServiceResult(success=True, data=self._to_response(tax_rate))
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
-    
-    async def _unset_existing_default(self, tenant_id: uuid.UUID, exclude_id: uuid.UUID = None) -> None:
-        """
-        Private method to unset any existing default tax rate for a tenant
-        """
+
+    @transactional
+    async def delete_tax_rate(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> ServiceResult:
         try:
-            current_default = await self.repo.get_default_tax_rate(tenant_id)
-            if current_default and (exclude_id is None or current_default.id != exclude_id):
-                current_default.default = False
-                await self.repo.save(current_default)
+            deleted = await self.repo.delete_tax_rate(tax_rate_id, tenant_id)
+            if not deleted:
+                return ServiceResult(success=False, error="Tax rate not found")
+            after_commit(self.db, partial(invalidate_tax_rates, tenant_id))
+            return ServiceResult(success=True, data=tax_rate_id)
         except Exception as e:
-            # Log the error but don't fail the main operation
-            print(f"Warning: Failed to unset existing default tax rate: {str(e)}")
-            raise e
+            return ServiceResult(success=False, error=str(e))
+    
+    def _to_response(self, tax_rate) -> TaxResponseModel:
+        return TaxResponseModel(
+            id=tax_rate.id,
+            taxName=tax_rate.name,
+            taxRate=tax_rate.rate,
+            description=tax_rate.description,
+            isDefault=tax_rate.default,
+            effectiveDate=tax_rate.effective_date
+        )
     
     async def get_default_tax_rate(self, tenant_id: uuid.UUID) -> ServiceResult:
         """
-        Get the default tax rate for a tenant
+        Get the tenant's default tax rate, provided it has come into effect, as sales see it
         """
         try:
-            default_tax = await self.repo.get_default_tax_rate(tenant_id)
+            table = await self.get_tax_table(tenant_id)
+            default_tax = table.default_rate(datetime.now())
             if not default_tax:
                 return ServiceResult(success=False, error="No default tax rate found")
-            return ServiceResult(success=True, data=default_tax)
+            return ServiceResult(success=True, data=TaxResponseModel(
+                id=default_tax.id,
+                taxName=default_tax.name,
+                taxRate=float(default_tax.rate),
+                description=default_tax.description,
+                isDefault=True,
+                effectiveDate=default_tax.effective_date
+            ))
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
         
@@ -88,23 +173,17 @@ class TaxService:
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
     
+    @transactional
     async def set_default_tax_rate(self, tax_rate_id: uuid.UUID, tenant_id: uuid.UUID) -> ServiceResult:
         """
-        Set a specific tax rate as the default
+        Set a specific tax rate as the default, clearing the previous default atomically
         """
         try:
-            tax_rate = await self.repo.get_tax_rate_by_id(tax_rate_id, tenant_id)
-            if not tax_rate:
+            switched = await self.repo.set_default_tax_rate(tax_rate_id, tenant_id)
+            if not switched:
                 return ServiceResult(success=False, error="Tax rate not found")
-            
-            # Unset any existing default
-            await self._unset_existing_default(tenant_id, exclude_id=tax_rate_id)
-            
-            # Set this one as default
-            tax_rate.default = True
-            await self.repo.save(tax_rate)
-            
-            return ServiceResult(success=True, data=tax_rate)
+            after_commit(self.db, partial(invalidate_tax_rates, tenant_id))
+            return ServiceResult(success=True, data=tax_rate_id)
         except Exception as e:
             return ServiceResult(success=False, error=str(e))
 
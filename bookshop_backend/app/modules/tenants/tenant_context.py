@@ -0,0 +1,96 @@
+"""
+Per-request tenant context: the tenant row plus its Settings, loaded with one query and
+cached in process so formatting dates and money never costs a query of its own.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import uuid
+
+from ...db.session import SessionDep
+from ...utils.auth import get_current_user, CurrentUser
+from ...utils.cache import BoundedCache
+from .tenants_repository import TenantRepository
+
+DEFAULT_TIME_ZONE = "Africa/Nairobi"
+DEFAULT_CURRENCY = "KES"
+
+# Abbreviations stored before settings used IANA names
+LEGACY_TIME_ZONES = {"eat": "Africa/Nairobi", "utc": "UTC"}
+LEGACY_CURRENCIES = {"ksh": "KES", "kshs": "KES"}
+
+
+def resolve_time_zone(name: Optional[str]) -> ZoneInfo:
+    """IANA zone for a stored setting; unknown names fall back to the default zone"""
+    name = LEGACY_TIME_ZONES.get((name or "").lower(), name) or DEFAULT_TIME_ZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIME_ZONE)
+
+
+def resolve_currency(code: Optional[str]) -> str:
+    code = (code or DEFAULT_CURRENCY).strip()
+    return LEGACY_CURRENCIES.get(code.lower(), code.upper())
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    tenant_id: uuid.UUID
+    name: str
+    time_zone: ZoneInfo
+    currency: str
+    email_notifications: bool = True
+    sms_notification: bool = False
+
+    def format_money(self, amount: Optional[Decimal]) -> str:
+        return f"{self.currency} {Decimal(amount or 0):,.2f}"
+
+
+# Writes through TenantService drop the tenant's entry; the TTL bounds staleness
+# for writes made by other workers
+tenant_context_cache: BoundedCache[TenantContext] = BoundedCache(maxsize=4096, ttl=300)
+
+
+def invalidate_tenant_context(tenant_id: uuid.UUID) -> None:
+    tenant_context_cache.pop(tenant_id)
+
+
+async def load_tenant_context(db, tenant_id: uuid.UUID) -> Optional[TenantContext]:
+    """Cached context for a tenant, or None if the tenant does not exist"""
+    context = tenant_context_cache.get(tenant_id)
+    if context is None:
+        row = await TenantRepository(db).get_context_row(tenant_id)
+        if row is None:
+            return None
+        context = TenantContext(
+            tenant_id=row.id,
+            name=row.name,
+            time_zone=resolve_time_zone(row.time_zone),
+            currency=resolve_currency(row.currency),
+            email_notifications=True if row.email_notifications is None else row.email_notifications,
+            sms_notification=bool(row.sms_notification)
+        )
+        tenant_context_cache.set(tenant_id, context)
+    return context
+
+
+async def get_tenant_context(db: SessionDep, user: CurrentUser = Depends(get_current_user)) -> TenantContext:
+    """FastAPI dependency: the current user's tenant context"""
+    if not user.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User does not belong to any tenant"
+        )
+    context = await load_tenant_context(db, user.tenant_id)
+    if context is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tenant not found"
+        )
+    return context
+
+
+TenantContextDep = Annotated[TenantContext, Depends(get_tenant_context)]
@@ -0,0 +1,255 @@
+"""
+Precomputed tenant metrics.
+
+One tenantmetrics row per tenant holds SKU count, stock value at cost, revenue over the
+last 30 days, active users and the last sale time, so the superadmin overview reads one
+small table instead of aggregating every tenant's inventory and sales.
+
+The write paths record deltas in the same transaction as the change (add_stock from
+inventory writes, record_sale from sales). They are appended to tenantmetricsdelta rather
+than added to the tenant's row, so concurrent tills never queue on that row's lock.
+fold_deltas moves them into tenantmetrics every FOLD_INTERVAL_SECONDS, deleting and summing
+them in one statement, so the overview lags writes by at most that long.
+
+Figures that drift without a write are settled by reconcile, which recomputes the rows
+from source in one statement: sales ageing out of the 30-day window, logins, and anything
+written outside the services. The same statement discards the deltas visible to it, which
+its figures already include. It runs periodically from the app and after purchase order
+receipts.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import uuid
+
+from sqlalchemy import delete, func, insert, literal, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from ...db import models
+from ...utils.date_ranges import utc_now
+from ..analytics.analytics_repository import EXCLUDED_SALE_STATUSES
+from ..books.book_model import SortOrder
+from .tenants_model import TenantMetricsSortField
+
+REVENUE_WINDOW_DAYS = 30
+ACTIVE_USER_DAYS = 30
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("TENANT_METRICS_RECONCILE_MINUTES", "60")) * 60
+FOLD_INTERVAL_SECONDS = int(os.getenv("TENANT_METRICS_FOLD_SECONDS", "10"))
+
+# Sort key for tenants that have never sold, so they order (and paginate) as oldest
+NEVER = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class TenantMetricsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _apply(self, tenant_id: uuid.UUID, **deltas: Any) -> None:
+        """Append deltas for the tenant; a plain INSERT that takes no lock other writers wait on"""
+        await self.db.execute(
+            insert(models.TenantMetricsDelta.__table__).values(
+                id=uuid.uuid4(), tenant_id=tenant_id, created_at=utc_now(), **deltas
+            )
+        )
+
+    async def add_stock(self, tenant_id: uuid.UUID, quantity: int, cost_price: Decimal, new_sku: bool = False) -> None:
+        """Stock moved in (positive) or out (negative) of an inventory row at its cost price"""
+        deltas: Dict[str, Any] = {"stock_value": Decimal(quantity) * Decimal(cost_price)}
+        if new_sku:
+            deltas["sku_count"] = 1
+        await self._apply(tenant_id, **deltas)
+
+    async def record_sale(self, tenant_id: uuid.UUID, amount: Decimal, status: str, sold_at: datetime) -> None:
+        revenue = Decimal(0) if status in EXCLUDED_SALE_STATUSES else Decimal(amount)
+        await self._apply(tenant_id, revenue_30d=revenue, last_sale_at=sold_at)
+
+    async def fold_deltas(self) -> None:
+        """
+        Move every pending delta into tenantmetrics in one statement: a DELETE ... RETURNING
+        feeding an INSERT ... ON CONFLICT that adds the per-tenant sums to the rows. A delta
+        being folded by a concurrent run is locked by its DELETE, so each is added once.
+        """
+        deltas = models.TenantMetricsDelta.__table__
+        folded = delete(deltas).returning(
+            deltas.c.tenant_id, deltas.c.sku_count, deltas.c.stock_value, deltas.c.revenue_30d, deltas.c.last_sale_at
+        ).cte("folded")
+        source = select(
+            folded.c.tenant_id,
+            func.sum(folded.c.sku_count),
+            func.sum(folded.c.stock_value),
+            func.sum(folded.c.revenue_30d),
+            func.max(folded.c.last_sale_at),
+            literal(utc_now())
+        ).group_by(folded.c.tenant_id)
+
+        table = models.TenantMetrics.__table__
+        stmt = pg_insert(table).from_select(
+            ["tenant_id", "sku_count", "stock_value", "revenue_30d", "last_sale_at", "updated_at"], source
+        ).add_cte(folded)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.tenant_id],
+            set_={
+                "sku_count": table.c.sku_count + stmt.excluded.sku_count,
+                "stock_value": table.c.stock_value + stmt.excluded.stock_value,
+                "revenue_30d": table.c.revenue_30d + stmt.excluded.revenue_30d,
+                # GREATEST skips NULLs, so the first sale sets it
+                "last_sale_at": func.greatest(table.c.last_sale_at, stmt.excluded.last_sale_at),
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def reconcile(self, tenant_id: Optional[uuid.UUID] = None) -> None:
+        """
+        Recompute metrics from source for every tenant (or one) in a single
+        INSERT ... SELECT ... ON CONFLICT. The revenue scan is bounded by created_at, so it
+        is pruned to the last one or two monthly sales partitions.
+
+        Pending deltas are deleted by a CTE of the same statement. Sharing its snapshot,
+        it removes exactly the deltas whose changes the recomputed figures include; those
+        committed later stay for the next fold.
+        """
+        now = utc_now()
+        revenue_since = now - timedelta(days=REVENUE_WINDOW_DAYS)
+        # last_login is a naive local timestamp like the other user columns
+        active_since = datetime.now() - timedelta(days=ACTIVE_USER_DAYS)
+
+        stock = select(
+            models.Inventory.tenant_id,
+            func.count().label("sku_count"),
+            func.sum(models.Inventory.quantity_on_hand * models.Inventory.cost_price).label("stock_value")
+        ).group_by(models.Inventory.tenant_id)
+        revenue = select(
+            models.Sales.tenant_id,
+            func.sum(models.Sales.total_amount).label("revenue")
+        ).where(
+            models.Sales.created_at >= revenue_since,
+            models.Sales.sale_status.notin_(EXCLUDED_SALE_STATUSES)
+        ).group_by(models.Sales.tenant_id)
+        users = select(
+            models.User.tenant_id,
+            func.count().label("active_users")
+        ).where(
+            models.User.last_login >= active_since
+        ).group_by(models.User.tenant_id)
+        if tenant_id is not None:
+            stock = stock.where(models.Inventory.tenant_id == tenant_id)
+            revenue = revenue.where(models.Sales.tenant_id == tenant_id)
+            users = users.where(models.User.tenant_id == tenant_id)
+        stock, revenue, users = stock.subquery(), revenue.subquery(), users.subquery()
+
+        # Correlated per tenant: a backward scan of ix_sales_tenant_created_at in each partition
+        last_sale = select(func.max(models.Sales.created_at)).where(
+            models.Sales.tenant_id == models.Tenant.id
+        ).scalar_subquery()
+
+        source = select(
+            models.Tenant.id,
+            func.coalesce(stock.c.sku_count, 0),
+            func.coalesce(stock.c.stock_value, 0),
+            func.coalesce(revenue.c.revenue, 0),
+            func.coalesce(users.c.active_users, 0),
+            last_sale,
+            literal(now),
+            literal(now)
+        ).select_from(
+            models.Tenant
+        ).outerjoin(
+            stock, stock.c.tenant_id == models.Tenant.id
+        ).outerjoin(
+            revenue, revenue.c.tenant_id == models.Tenant.id
+        ).outerjoin(
+            users, users.c.tenant_id == models.Tenant.id
+        )
+        if tenant_id is not None:
+            source = source.where(models.Tenant.id == tenant_id)
+
+        deltas = models.TenantMetricsDelta.__table__
+        discarded = delete(deltas)
+        if tenant_id is not None:
+            discarded = discarded.where(deltas.c.tenant_id == tenant_id)
+        discarded = discarded.returning(deltas.c.id).cte("discarded")
+
+        table = models.TenantMetrics.__table__
+        columns = [
+            "tenant_id", "sku_count", "stock_value", "revenue_30d", "active_users",
+            "last_sale_at", "reconciled_at", "updated_at"
+        ]
+        stmt = pg_insert(table).from_select(columns, source).add_cte(discarded)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.tenant_id],
+            set_={name: stmt.excluded[name] for name in columns if name != "tenant_id"}
+        )
+        await self.db.execute(stmt)
+
+    async def list_metrics(
+        self,
+        limit: int,
+        sort_by: TenantMetricsSortField = TenantMetricsSortField.REVENUE_30D,
+        order: SortOrder = SortOrder.DESC,
+        after: Optional[Tuple[Any, uuid.UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of tenants with their metrics, keyset-paginated on (sort column,
+        tenant id) via `after`. Tenants without a metrics row yet show zeros.
+        Returns up to limit + 1 rows.
+        """
+        metrics = models.TenantMetrics
+        sku_count = func.coalesce(metrics.sku_count, 0)
+        stock_value = func.coalesce(metrics.stock_value, 0)
+        revenue_30d = func.coalesce(metrics.revenue_30d, 0)
+        active_users = func.coalesce(metrics.active_users, 0)
+        sort_columns = {
+            TenantMetricsSortField.NAME: models.Tenant.name,
+            TenantMetricsSortField.SKU_COUNT: sku_count,
+            TenantMetricsSortField.STOCK_VALUE: stock_value,
+            TenantMetricsSortField.REVENUE_30D: revenue_30d,
+            TenantMetricsSortField.ACTIVE_USERS: active_users,
+            TenantMetricsSortField.LAST_SALE_AT: func.coalesce(metrics.last_sale_at, NEVER),
+        }
+        sort_column = sort_columns[sort_by]
+
+        stmt = select(
+            models.Tenant.id.label("tenant_id"),
+            models.Tenant.name,
+            models.Tenant.contact_email,
+            sku_count.label("sku_count"),
+            stock_value.label("stock_value"),
+            revenue_30d.label("revenue_30d"),
+            active_users.label("active_users"),
+            metrics.last_sale_at,
+            metrics.reconciled_at,
+            sort_column.label("sort_key")
+        ).select_from(
+            models.Tenant
+        ).outerjoin(
+            metrics, metrics.tenant_id == models.Tenant.id
+        )
+
+        key = tuple_(sort_column, models.Tenant.id)
+        if order == SortOrder.DESC:
+            if after is not None:
+                stmt = stmt.where(key < tuple_(*after))
+            stmt = stmt.order_by(sort_column.desc(), models.Tenant.id.desc())
+        else:
+            if after is not None:
+                stmt = stmt.where(key > tuple_(*after))
+            stmt = stmt.order_by(sort_column.asc(), models.Tenant.id.asc())
+
+        result = await self.db.execute(stmt.limit(limit + 1))
+        return [dict(row._mapping) for row in result.all()]
+
+
+async def fold_tenant_metrics(session_maker) -> None:
+    async with session_maker() as session:
+        await TenantMetricsRepository(session).fold_deltas()
+        await session.commit()
+
+
+async def reconcile_tenant_metrics(session_maker) -> None:
+    async with session_maker() as session:
+        await TenantMetricsRepository(session).reconcile()
+        await session.commit()
@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, status, Form, Query, Depends
 from typing import List, Optional, Annotated
 import uuid
-from .tenants_model import TenantResponse, TenantCreate, TenantUpdate
+from .tenants_model import (
+    TenantResponse, TenantCreate, TenantUpdate, TenantSettingsUpdate, TenantSettingsResponse,
+    TenantMetricsSortField, TenantMetricsPage, TenantSearchPage
+)
+from ..books.book_model import SortOrder
 from ...db.session import SessionDep
 from .tenants_service import TenantService
 from ...utils.auth import (
@@ -41,15 +45,16 @@ async def list_tenants(
     name: Optional[str] = Query(None, min_length=1, description="Filter tenants by name"),
     email: Optional[str] = Query(None, min_length=1, description="Filter tenants by email"),
     created_at: Optional[str] = Query(None, description="Filter tenants by creation date"),
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
     user: CurrentUser = Depends(require_role([UserRole.SUPERADMIN]))  # Only superadmins can list all tenants
 ):
     """
-    Retrieve a list of all tenants, with optional filters.
+    Retrieve tenants by name, with optional case-insensitive substring filters.
     Requires: Superadmin role only
     """
     service = TenantService(db)
     
-    result = await service.get_tenants(name=name, email=email, created_at=created_at)
+    result = await service.get_tenants(name=name, email=email, created_at=created_at, limit=limit)
     if not result.success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -58,6 +63,58 @@ async def list_tenants(
         
     return result.data
 
+@router.get("/search", response_model=TenantSearchPage)
+async def search_tenants(
+    db: SessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=100, description="Part of a tenant name or contact email")],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None,
+    user: CurrentUser = Depends(require_role([UserRole.SUPERADMIN]))
+):
+    """
+    Search tenants by name or contact email, best match first. Tolerates typos in names.
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page.
+    Requires: Superadmin role only
+    """
+    service = TenantService(db)
+    result = await service.search_tenants(q, limit=limit, cursor=cursor)
+
+    if not result.success:
+        status_code = status.HTTP_400_BAD_REQUEST if result.error == "Invalid pagination cursor" else status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.error
+        )
+
+    return result.data
+
+@router.get("/metrics", response_model=TenantMetricsPage)
+async def list_tenant_metrics(
+    db: SessionDep,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None,
+    sort_by: TenantMetricsSortField = TenantMetricsSortField.REVENUE_30D,
+    order: SortOrder = SortOrder.DESC,
+    user: CurrentUser = Depends(require_role([UserRole.SUPERADMIN]))
+):
+    """
+    Cross-tenant overview: SKU count, stock value, 30-day revenue, active users and last
+    sale time per tenant, read from precomputed metrics.
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page.
+    Requires: Superadmin role only
+    """
+    service = TenantService(db)
+    result = await service.get_tenant_metrics(limit=limit, cursor=cursor, sort_by=sort_by, order=order)
+
+    if not result.success:
+        status_code = status.HTTP_400_BAD_REQUEST if result.error == "Invalid pagination cursor" else status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.error
+        )
+
+    return result.data
+
 @router.get("/{tenant_id}", response_model=TenantResponse)
 async def get_tenant(
     tenant_id: uuid.UUID,
@@ -131,6 +188,63 @@ async def delete_tenant(
     
     return {"message": result.message}
 
+@router.get("/{tenant_id}/settings", response_model=TenantSettingsResponse)
+async def get_tenant_settings(
+    tenant_id: uuid.UUID,
+    db: SessionDep,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Retrieve a tenant's time zone, currency and notification settings.
+    Users can only access their own tenant's settings.
+    """
+    if user.role != UserRole.SUPERADMIN and user.tenant_id != tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Cannot view other tenants"
+        )
+
+    service = TenantService(db)
+    result = await service.get_settings(tenant_id)
+
+    if not result.success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.error
+        )
+
+    return result.data
+
+@router.put("/{tenant_id}/settings", response_model=TenantSettingsResponse)
+async def update_tenant_settings(
+    tenant_id: uuid.UUID,
+    settings: TenantSettingsUpdate,
+    db: SessionDep,
+    user: CurrentUser = Depends(require_role([UserRole.ADMIN, UserRole.SUPERADMIN]))
+):
+    """
+    Update a tenant's settings. Takes effect immediately in this worker and within
+    the context cache TTL in others.
+    Requires: Admin role only
+    """
+    if user.role != UserRole.SUPERADMIN and user.tenant_id != tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Cannot update other tenants"
+        )
+
+    service = TenantService(db)
+    result = await service.update_settings(tenant_id, settings)
+
+    if not result.success:
+        status_code = status.HTTP_404_NOT_FOUND if "not found" in result.error else status.HTTP_400_BAD_REQUEST
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.error
+        )
+
+    return result.data
+
 # Additional tenant management endpoints
 @router.get("/{tenant_id}/stats", status_code=status.HTTP_200_OK)
 async def get_tenant_statistics(
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 from uuid import UUID, uuid4
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
 
 class TenantCreate(BaseModel):
     name: str = Field(..., max_length=100, description="Name of the tenant")
@@ -22,3 +25,49 @@ class TenantResponse(BaseModel):
     address: Optional[str] = Field(None, max_length=255, description="Address of the tenant")
 
     model_config = ConfigDict(from_attributes=True)
+
+class TenantSearchResult(TenantResponse):
+    score: float = Field(..., description="Trigram similarity of the best matching field, 0 to 1")
+
+class TenantSearchPage(BaseModel):
+    tenants: List[TenantSearchResult]
+    next_cursor: Optional[str] = None
+
+class TenantSettingsUpdate(BaseModel):
+    time_zone: Optional[str] = Field(None, max_length=50, description="IANA time zone, e.g. Africa/Nairobi")
+    currency: Optional[str] = Field(None, max_length=10, description="ISO 4217 currency code, e.g. KES")
+    email_notifications: Optional[bool] = None
+    sms_notification: Optional[bool] = None
+
+class TenantSettingsResponse(BaseModel):
+    tenant_id: UUID
+    time_zone: str
+    currency: str
+    email_notifications: bool
+    sms_notification: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TenantMetricsSortField(str, Enum):
+    """Columns GET /tenants/metrics can be sorted by"""
+    NAME = "name"
+    SKU_COUNT = "sku_count"
+    STOCK_VALUE = "stock_value"
+    REVENUE_30D = "revenue_30d"
+    ACTIVE_USERS = "active_users"
+    LAST_SALE_AT = "last_sale_at"
+
+class TenantMetricsResponse(BaseModel):
+    tenant_id: UUID
+    name: str
+    contact_email: str
+    sku_count: int
+    stock_value: Decimal
+    revenue_30d: Decimal
+    active_users: int
+    last_sale_at: Optional[datetime] = None
+    reconciled_at: Optional[datetime] = None
+
+class TenantMetricsPage(BaseModel):
+    tenants: List[TenantMetricsResponse]
+    next_cursor: Optional[str] = None
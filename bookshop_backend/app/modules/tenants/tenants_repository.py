@@ -1,10 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, exists, func, case, or_, tuple_
+from typing import Optional, List, Dict, Any, Tuple
 from ...db import models
 from .tenants_model import TenantCreate, TenantUpdate
 import uuid
 
+
+def like_pattern(term: str) -> str:
+    """%term% with LIKE wildcards in the term escaped (backslash is the default escape)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
 class TenantRepository:
     """
     Repository for managing tenant database operations.
@@ -15,12 +21,18 @@ class TenantRepository:
 
     async def get_by_name(self, name: str) -> Optional[models.Tenant]:
         """
-        Retrieve a tenant by name.
+        Retrieve a tenant by name, ignoring case (uq_tenant_name_lower).
         """
-        stmt = select(models.Tenant).where(models.Tenant.name == name)
+        stmt = select(models.Tenant).where(func.lower(models.Tenant.name) == name.strip().lower())
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
+    async def name_exists(self, name: str) -> bool:
+        """Whether a tenant name is taken, ignoring case; an index-only probe"""
+        stmt = select(exists().where(func.lower(models.Tenant.name) == name.strip().lower()))
+        result = await self.db.execute(stmt)
+        return bool(result.scalar())
+
     async def create_tenant(self, tenant: TenantCreate) -> models.Tenant:
         """
         Create a new tenant in the database.
@@ -34,38 +46,108 @@ class TenantRepository:
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
-    async def get_all(self, name: Optional[str] = None, email: Optional[str] = None, created_at: Optional[str] = None) -> List[models.Tenant]:
-        """Get all tenants with optional filters"""
+    async def get_all(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        created_at: Optional[str] = None,
+        limit: int = 100
+    ) -> List[models.Tenant]:
+        """Get tenants with optional case-insensitive substring filters, by name"""
         stmt = select(models.Tenant)
         
-        # Apply filters if provided
+        # Apply filters if provided; lower(...) LIKE is served by the trigram indexes
         if name:
-            stmt = stmt.where(models.Tenant.name.ilike(f"%{name}%"))  # Use ilike for case-insensitive partial match
+            stmt = stmt.where(func.lower(models.Tenant.name).like(like_pattern(name.strip().lower())))
         if email:
-            stmt = stmt.where(models.Tenant.contact_email.ilike(f"%{email}%"))  # Fixed field name
+            stmt = stmt.where(func.lower(models.Tenant.contact_email).like(like_pattern(email.strip().lower())))
         if created_at:
             # You might want to parse this date string properly
             stmt = stmt.where(models.Tenant.created_at >= created_at)
         
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(stmt.order_by(models.Tenant.name, models.Tenant.id).limit(limit))
         return result.scalars().all()
 
-    async def search_by_name(self, search_term: str) -> List[models.Tenant]:
-        """Search tenants by name"""
-        stmt = select(models.Tenant).where(
-            models.Tenant.name.ilike(f"%{search_term}%")
+    async def search(
+        self,
+        term: str,
+        limit: int,
+        after: Optional[Tuple[int, float, uuid.UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tenants whose name or contact email contains `term`, or whose name is similar to
+        it, best match first: exact name, then name prefix, then trigram similarity.
+
+        Every branch of the filter is served by a trigram GIN index. Pages are
+        keyset-paginated on (match, score, id) via `after`. Returns up to limit + 1 rows.
+        """
+        term = term.strip().lower()
+        name = func.lower(models.Tenant.name)
+        email = func.lower(models.Tenant.contact_email)
+        pattern = like_pattern(term)
+        prefix = pattern[1:]
+        match = case(
+            (name == term, 2),
+            (name.like(prefix), 1),
+            else_=0
+        )
+        score = func.greatest(func.similarity(name, term), func.similarity(email, term))
+
+        stmt = select(
+            models.Tenant.id,
+            models.Tenant.name,
+            models.Tenant.contact_email,
+            models.Tenant.contact_phone,
+            models.Tenant.address,
+            match.label("match"),
+            score.label("score")
+        ).where(
+            or_(
+                name.like(pattern),
+                email.like(pattern),
+                # pg_trgm similarity above pg_trgm.similarity_threshold (0.3 by default)
+                name.op("%")(term)
+            )
         )
+        key = tuple_(match, score, models.Tenant.id)
+        if after is not None:
+            stmt = stmt.where(key < tuple_(*after))
+        stmt = stmt.order_by(match.desc(), score.desc(), models.Tenant.id.desc())
+
+        result = await self.db.execute(stmt.limit(limit + 1))
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_context_row(self, tenant_id: uuid.UUID):
+        """Tenant name and settings in one query; settings columns are null if never saved"""
+        stmt = select(
+            models.Tenant.id,
+            models.Tenant.name,
+            models.Settings.time_zone,
+            models.Settings.currency,
+            models.Settings.email_notifications,
+            models.Settings.sms_notification
+        ).outerjoin(
+            models.Settings, models.Settings.tenant_id == models.Tenant.id
+        ).where(models.Tenant.id == tenant_id)
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.first()
+
+    async def get_settings(self, tenant_id: uuid.UUID) -> Optional[models.Settings]:
+        result = await self.db.execute(select(models.Settings).where(models.Settings.tenant_id == tenant_id))
+        return result.scalars().first()
+
+    async def save_settings(self, settings: models.Settings) -> models.Settings:
+        self.db.add(settings)
+        await self.db.flush()
+        return settings
 
     async def delete_tenant(self, tenant: models.Tenant) -> None:
         """Delete tenant"""
         await self.db.delete(tenant)
-        await self.db.commit()
+        await self.db.flush()
 
     async def save(self, tenant: models.Tenant) -> models.Tenant:
         """Save tenant"""
         self.db.add(tenant)
-        await self.db.commit()
-        await self.db.refresh(tenant)
+        await self.db.flush()
         return tenant
\ No newline at end of file
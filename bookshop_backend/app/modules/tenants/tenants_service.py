@@ -1,8 +1,20 @@
 from ...db import models
 from ...db.session import SessionDep
-from .tenants_model import TenantCreate, TenantUpdate, TenantResponse
+from functools import partial
+from ...db.unit_of_work import after_commit, transactional
+from .tenants_model import (
+    TenantCreate, TenantUpdate, TenantResponse, TenantSettingsUpdate, TenantSettingsResponse,
+    TenantMetricsSortField, TenantMetricsResponse, TenantSearchResult
+)
 from logging import getLogger
 from .tenants_repository import TenantRepository
+from .tenant_metrics_repository import TenantMetricsRepository
+from ..books.book_model import SortOrder
+from ...utils.pagination import encode_cursor, decode_cursor
+from datetime import datetime
+from decimal import Decimal
+from .tenant_context import invalidate_tenant_context, resolve_currency, DEFAULT_TIME_ZONE, DEFAULT_CURRENCY
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from app.utils.result import ServiceResult
 import uuid
 
@@ -19,7 +31,9 @@ class TenantService:
     def __init__(self, db: SessionDep):
         self.db = db 
         self.repo = TenantRepository(db)
+        self.metrics = TenantMetricsRepository(db)
 
+    @transactional
     async def create_tenant(self, tenant_create_data: TenantCreate) -> ServiceResult:
         """
         Create a new tenant in the database.
@@ -47,12 +61,18 @@ class TenantService:
                 error=f"Failed to create tenant: {str(e)}"
             )
 
-    async def get_tenants(self, name: Optional[str] = None, email: Optional[str] = None, created_at: Optional[str] = None) -> ServiceResult:
+    async def get_tenants(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        created_at: Optional[str] = None,
+        limit: int = 100
+    ) -> ServiceResult:
         """
-        Retrieve a list of all tenants.
+        Retrieve tenants, optionally filtered by name or email substring.
         """
         try:
-            tenants = await self.repo.get_all(name=name, email=email, created_at=created_at)
+            tenants = await self.repo.get_all(name=name, email=email, created_at=created_at, limit=limit)
             tenant_responses = [TenantResponse.model_validate(tenant) for tenant in tenants]
 
             return ServiceResult(
@@ -66,6 +86,106 @@ class TenantService:
                 error=f"Failed to fetch tenants: {str(e)}"
             )
 
+    async def search_tenants(self, query: str, limit: int = 20, cursor: Optional[str] = None) -> ServiceResult:
+        """
+        Ranked tenant search on name and contact email.
+        """
+        try:
+            after = None
+            if cursor:
+                values = decode_cursor(cursor)
+                if values.get("q") != query.strip().lower():
+                    raise ValueError("Cursor does not match search")
+                after = (int(values["match"]), float(values["score"]), uuid.UUID(values["id"]))
+
+            rows = await self.repo.search(query, limit, after)
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor({
+                    "q": query.strip().lower(),
+                    "match": last["match"],
+                    "score": last["score"],
+                    "id": last["id"]
+                })
+
+            return ServiceResult(
+                success=True,
+                data={
+                    "tenants": [TenantSearchResult.model_validate(row) for row in rows],
+                    "next_cursor": next_cursor
+                },
+                message=f"{len(rows)} tenants found"
+            )
+        except (ValueError, KeyError, TypeError):
+            return ServiceResult(
+                success=False,
+                error="Invalid pagination cursor"
+            )
+        except Exception as e:
+            logger.error(f"Error searching tenants for '{query}': {e}")
+            return ServiceResult(
+                success=False,
+                error=f"Failed to search tenants: {str(e)}"
+            )
+
+    async def get_tenant_metrics(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort_by: TenantMetricsSortField = TenantMetricsSortField.REVENUE_30D,
+        order: SortOrder = SortOrder.DESC
+    ) -> ServiceResult:
+        """
+        One page of tenants with their precomputed metrics, for the superadmin overview.
+        """
+        try:
+            after = None
+            if cursor:
+                values = decode_cursor(cursor)
+                if values.get("sort_by") != sort_by.value:
+                    raise ValueError("Cursor does not match sort order")
+                sort_key = values["key"]
+                if sort_by in (TenantMetricsSortField.SKU_COUNT, TenantMetricsSortField.ACTIVE_USERS):
+                    sort_key = int(sort_key)
+                elif sort_by in (TenantMetricsSortField.STOCK_VALUE, TenantMetricsSortField.REVENUE_30D):
+                    sort_key = Decimal(sort_key)
+                elif sort_by == TenantMetricsSortField.LAST_SALE_AT:
+                    sort_key = datetime.fromisoformat(sort_key)
+                after = (sort_key, uuid.UUID(values["tenant_id"]))
+
+            rows = await self.metrics.list_metrics(limit, sort_by, order, after)
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor({
+                    "sort_by": sort_by.value,
+                    "key": last["sort_key"],
+                    "tenant_id": last["tenant_id"]
+                })
+
+            return ServiceResult(
+                success=True,
+                data={
+                    "tenants": [TenantMetricsResponse.model_validate(row) for row in rows],
+                    "next_cursor": next_cursor
+                },
+                message=f"{len(rows)} tenants retrieved"
+            )
+        except (ValueError, KeyError, TypeError, ArithmeticError):
+            return ServiceResult(
+                success=False,
+                error="Invalid pagination cursor"
+            )
+        except Exception as e:
+            logger.error(f"Error fetching tenant metrics: {e}")
+            return ServiceResult(
+                success=False,
+                error=f"Failed to fetch tenant metrics: {str(e)}"
+            )
+
     async def get_tenant_by_id(self, tenant_id: uuid.UUID) -> ServiceResult:
         """
         Retrieve a tenant by ID.
@@ -94,14 +214,13 @@ class TenantService:
         Check if a tenant name is available.
         """
         try:
-            exists = await self.repo.get_by_name(name)
-            if exists:
-                return ServiceResult(success=True, data={"exists": True})
-            return ServiceResult(success=True, data={"exists": False})
+            exists = await self.repo.name_exists(name)
+            return ServiceResult(success=True, data={"exists": exists})
         except Exception as e:
             logger.error(f"Error checking tenant name '{name}': {e}")
             return ServiceResult(success=False, error=f"Failed to check tenant name: {str(e)}")
 
+    @transactional
     async def update_tenant(self, tenant_id: uuid.UUID, tenant_update_data: TenantUpdate) -> ServiceResult:
         """
         Update an existing tenant.
@@ -116,7 +235,8 @@ class TenantService:
 
             if tenant_update_data.name and tenant_update_data.name != tenant.name:
                 existing = await self.repo.get_by_name(tenant_update_data.name)
-                if existing:
+                # Changing only the case of its own name is allowed
+                if existing and existing.id != tenant.id:
                     return ServiceResult(
                         success=False,
                         error=f"Tenant with name '{tenant_update_data.name}' already exists."
@@ -129,6 +249,7 @@ class TenantService:
                     setattr(tenant, field, value)
 
             updated_tenant = await self.repo.save(tenant)
+            after_commit(self.db, partial(invalidate_tenant_context, tenant_id))
             logger.info(f"Tenant '{updated_tenant.name}' updated successfully.")
             return ServiceResult(
                 data=TenantResponse.model_validate(updated_tenant),
@@ -141,6 +262,7 @@ class TenantService:
                 error=f"Failed to update tenant: {str(e)}"
             )
 
+    @transactional
     async def delete_tenant(self, tenant_id: uuid.UUID) -> ServiceResult:
         """
         Delete a tenant.
@@ -154,6 +276,7 @@ class TenantService:
                 )
             
             await self.repo.delete_tenant(tenant)
+            after_commit(self.db, partial(invalidate_tenant_context, tenant_id))
             
             return ServiceResult(
                 success=True,
@@ -165,3 +288,60 @@ class TenantService:
                 success=False,
                 error=f"Failed to delete tenant: {str(e)}"
             )
+
+    async def get_settings(self, tenant_id: uuid.UUID) -> ServiceResult:
+        """
+        Get a tenant's settings, with defaults if they have never been saved.
+        """
+        try:
+            settings = await self.repo.get_settings(tenant_id)
+            if not settings:
+                settings = models.Settings(tenant_id=tenant_id, time_zone=DEFAULT_TIME_ZONE, currency=DEFAULT_CURRENCY)
+            return ServiceResult(success=True, data=TenantSettingsResponse.model_validate(settings))
+        except Exception as e:
+            logger.error(f"Error fetching settings for tenant {tenant_id}: {e}")
+            return ServiceResult(
+                success=False,
+                error=f"Failed to fetch tenant settings: {str(e)}"
+            )
+
+    @transactional
+    async def update_settings(self, tenant_id: uuid.UUID, settings_data: TenantSettingsUpdate) -> ServiceResult:
+        """
+        Create or update a tenant's settings and drop its cached context.
+        """
+        try:
+            tenant = await self.repo.get_by_id(tenant_id)
+            if not tenant:
+                return ServiceResult(
+                    success=False,
+                    error=f"Tenant with ID '{tenant_id}' not found."
+                )
+
+            if settings_data.time_zone is not None:
+                try:
+                    ZoneInfo(settings_data.time_zone)
+                except (ZoneInfoNotFoundError, ValueError):
+                    return ServiceResult(
+                        success=False,
+                        error=f"Unknown time zone '{settings_data.time_zone}'"
+                    )
+            if settings_data.currency is not None:
+                settings_data.currency = resolve_currency(settings_data.currency)
+
+            settings = await self.repo.get_settings(tenant_id)
+            if not settings:
+                settings = models.Settings(tenant_id=tenant_id, time_zone=DEFAULT_TIME_ZONE, currency=DEFAULT_CURRENCY)
+            for field, value in settings_data.model_dump(exclude_unset=True).items():
+                if value is not None:
+                    setattr(settings, field, value)
+
+            settings = await self.repo.save_settings(settings)
+            after_commit(self.db, partial(invalidate_tenant_context, tenant_id))
+            return ServiceResult(success=True, data=TenantSettingsResponse.model_validate(settings))
+        except Exception as e:
+            logger.error(f"Error updating settings for tenant {tenant_id}: {e}")
+            return ServiceResult(
+                success=False,
+                error=f"Failed to update tenant settings: {str(e)}"
+            )
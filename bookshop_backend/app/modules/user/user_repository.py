@@ -19,11 +19,10 @@ class UserRepository:
     async def delete_user(self, user: models.User) -> None:
         """Delete a user from the database."""
         await self.db.delete(user)
-        await self.db.commit()
+        await self.db.flush()
 
     async def save(self, user: models.User) -> None:
         """Save a user to the database."""
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         return user
\ No newline at end of file
@@ -1,13 +1,16 @@
 from ...db.session import SessionDep
+from ...db.unit_of_work import transactional
 from .user_model import UserCreate
 from ...utils.result import ServiceResult
-from ...utils.password_manager import hash_password
+from ...utils.password_manager import hash_password_async
 from .user_repository import UserRepository
 
 class UserService:
     def __init__(self, db: SessionDep):
+        self.db = db
         self.repo = UserRepository(db)
 
+    @transactional
     async def create_user(self, user_data: UserCreate) -> ServiceResult:
         """Create a new user in the database."""
         existing_user = await self.repo.get_user_by_email(user_data.email)
@@ -17,7 +20,7 @@ class UserService:
                 error=f"User with email '{user_data.email}' already exists."
             )
         
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         user_data.password = hashed_password
         
         user_result = await self.repo.create_user(user_data)
@@ -52,6 +55,7 @@ class UserService:
                 error=f"Failed to retrieve user: {str(e)}"
             )
     
+    @transactional
     async def delete_user(self, user_id: str) -> ServiceResult:
         """Delete a user by ID."""
         try:
@@ -0,0 +1,107 @@
+"""
+Date ranges for report and list filters.
+
+Ranges are resolved in the tenant's time zone and turned into half-open UTC intervals
+[start, end), so a filter is two plain comparisons on the indexed timestamp column and
+a date-only upper bound includes that whole day.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import List, Optional, Tuple, Union
+
+from sqlalchemy import and_, true
+
+DateBound = Union[str, date, datetime, None]
+
+
+def utc_now() -> datetime:
+    """Timezone-aware now, for timestamptz columns"""
+    return datetime.now(timezone.utc)
+
+
+def naive_local(value: datetime) -> datetime:
+    """
+    Server-local naive time, for comparing an aware instant with the older timestamp
+    columns (purchase orders, inventory) that are filled with datetime.now()
+    """
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def local_midnight(day: date, tz: tzinfo) -> datetime:
+    """Start of `day` in `tz`, as a UTC instant"""
+    return datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc)
+
+
+def parse_bound(value: DateBound) -> Union[date, datetime, None]:
+    """Accept a date, a datetime, or an ISO 8601 string of either. Raises ValueError otherwise."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (date, datetime)):
+        return value
+    value = value.strip()
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _instant(value: Union[date, datetime], tz: tzinfo, next_day: bool = False) -> datetime:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=tz)
+        return value.astimezone(timezone.utc)
+    return local_midnight(value + timedelta(days=1) if next_day else value, tz)
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """Half-open UTC interval; either end may be open"""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def condition(self, column):
+        """Sargable predicate: column >= start AND column < end"""
+        conditions = []
+        if self.start is not None:
+            conditions.append(column >= self.start)
+        if self.end is not None:
+            conditions.append(column < self.end)
+        return and_(*conditions) if conditions else true()
+
+
+def tenant_range(date_from: DateBound, date_to: DateBound, tz: tzinfo) -> DateRange:
+    """
+    Resolve user-supplied bounds in the tenant's time zone.
+
+    Dates cover whole local days, so date_to=2026-10-19 ends at local midnight of the 20th.
+    Datetimes are taken as given (naive ones in the tenant zone), with date_to exclusive.
+    """
+    start, end = parse_bound(date_from), parse_bound(date_to)
+    date_range = DateRange(
+        start=_instant(start, tz) if start is not None else None,
+        end=_instant(end, tz, next_day=True) if end is not None else None
+    )
+    if date_range.start and date_range.end and date_range.end <= date_range.start:
+        raise ValueError("date_to must not be before date_from")
+    return date_range
+
+
+def day_range(day: date, tz: tzinfo) -> DateRange:
+    return DateRange(start=local_midnight(day, tz), end=local_midnight(day + timedelta(days=1), tz))
+
+
+def month_ranges(date_from: date, date_to: date, tz: tzinfo = timezone.utc) -> List[Tuple[int, int, datetime, datetime]]:
+    """
+    Split the inclusive local date range [date_from, date_to] into calendar months of `tz`.
+    Returns (year, month, start, end) with end exclusive and both clipped to the range.
+    """
+    ranges = []
+    range_start = local_midnight(date_from, tz)
+    range_end = local_midnight(date_to + timedelta(days=1), tz)
+    year, month = date_from.year, date_from.month
+    while (year, month) <= (date_to.year, date_to.month):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        start = max(local_midnight(date(year, month, 1), tz), range_start)
+        end = min(local_midnight(date(next_year, next_month, 1), tz), range_end)
+        ranges.append((year, month, start, end))
+        year, month = next_year, next_month
+    return ranges
@@ -0,0 +1,40 @@
+from logging import getLogger
+from typing import Awaitable, Callable, Optional
+import asyncio
+
+logger = getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs `job` once at startup and then every `interval` seconds until stopped"""
+
+    def __init__(self, name: str, job: Callable[[], Awaitable[None]], interval: float):
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A failed run is retried at the next interval
+                logger.error(f"{self.name} failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
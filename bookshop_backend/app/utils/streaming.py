@@ -0,0 +1,91 @@
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+import codecs
+import csv
+import io
+import json
+import uuid
+import zlib
+
+# Rows buffered before a chunk is handed to the response
+FLUSH_EVERY = 1000
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+async def csv_stream(header: Sequence[str], rows: AsyncIterator[Sequence[Any]], flush_every: int = FLUSH_EVERY) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV. The header is yielded on its own before the first row is read,
+    so the client gets its first byte while the query is still running.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    async for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+async def ndjson_stream(rows: AsyncIterator[Dict[str, Any]], flush_every: int = FLUSH_EVERY) -> AsyncIterator[bytes]:
+    """Encode mappings as newline-delimited JSON"""
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(row, default=_json_default))
+        if len(lines) >= flush_every:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Compress a byte stream into a single gzip member without buffering it.
+    Each input chunk is sync-flushed so the client keeps receiving data as rows are read.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def csv_reader(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[List[str]]:
+    """
+    Decode CSV rows from a byte stream without holding the whole file.
+    Text is parsed up to the last line break that is not inside a quoted field,
+    so fields spanning chunk boundaries come out whole.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        cut = pending.rfind("\n") + 1
+        while cut and pending.count('"', 0, cut) % 2:
+            cut = pending.rfind("\n", 0, cut - 1) + 1
+        if cut:
+            for row in csv.reader(io.StringIO(pending[:cut])):
+                yield row
+            pending = pending[cut:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        for row in csv.reader(io.StringIO(pending)):
+            yield row
@@ -0,0 +1,110 @@
+"""
+In-memory stand-ins for an AsyncSession and its results, shared by the test scripts.
+
+FakeSession compiles every statement it is given for PostgreSQL and keeps it, so tests
+can look at the SQL and its bound parameters, and answers it with canned rows. It also
+records commits and rollbacks, collects objects passed to add and add_all, and carries session.info
+for units of work and audit entries.
+"""
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+from sqlalchemy.dialects import postgresql
+
+
+class Row:
+    """A result row: attribute access, row._mapping, and unpacking in column order"""
+    def __init__(self, **values: Any):
+        self._mapping = values
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__["_mapping"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        return iter(self._mapping.values())
+
+    def __getitem__(self, index: int) -> Any:
+        return list(self._mapping.values())[index]
+
+
+class FakeResult:
+    """Result of one statement over canned rows (Row objects, tuples or ORM instances)"""
+    def __init__(self, rows: Iterable[Any] = (), rowcount: Optional[int] = None):
+        self.rows = list(rows)
+        self.rowcount = len(self.rows) if rowcount is None else rowcount
+
+    def all(self) -> List[Any]:
+        return self.rows
+
+    def first(self) -> Any:
+        return self.rows[0] if self.rows else None
+
+    def one_or_none(self) -> Any:
+        return self.first()
+
+    scalar_one_or_none = one_or_none
+    scalar = one_or_none
+
+    def scalar_one(self) -> Any:
+        assert len(self.rows) == 1, self.rows
+        return self.rows[0]
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def mappings(self) -> "FakeResult":
+        return FakeResult([getattr(row, "_mapping", row) for row in self.rows], self.rowcount)
+
+
+Response = Union[FakeResult, Iterable[Any]]
+
+
+class FakeSession:
+    """
+    Records statements, commits and rollbacks instead of talking to a database.
+    Every statement is answered with `rows`, or with whatever `respond` returns for it
+    when given (a FakeResult or an iterable of rows).
+    """
+    def __init__(self, rows: Iterable[Any] = (), respond: Optional[Callable[[Any], Response]] = None):
+        self.rows = list(rows)
+        self.respond = respond
+        self.compiled = []
+        self.info = {}
+        self.added: List[Any] = []
+        # "commit" and "rollback" in the order they happened; tests may append their own events
+        self.calls: List[str] = []
+
+    @property
+    def statements(self) -> List[str]:
+        return [compiled.string for compiled in self.compiled]
+
+    @property
+    def commits(self) -> int:
+        return self.calls.count("commit")
+
+    @property
+    def rollbacks(self) -> int:
+        return self.calls.count("rollback")
+
+    async def execute(self, stmt, params=None) -> FakeResult:
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.compiled.append(compiled)
+        response = self.respond(compiled) if self.respond is not None else self.rows
+        return response if isinstance(response, FakeResult) else FakeResult(response)
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    def add_all(self, objects: Iterable[Any]) -> None:
+        self.added.extend(objects)
+
+    async def flush(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.calls.append("commit")
+
+    async def rollback(self) -> None:
+        self.calls.append("rollback")
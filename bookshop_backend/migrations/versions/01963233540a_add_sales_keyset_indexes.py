@@ -0,0 +1,30 @@
+"""add tenant/sale_date index on sales and sale_id index on sale items
+
+Revision ID: 01963233540a
+Revises: a2f1aef998f0
+Create Date: 2026-10-19 12:40:17.204356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '01963233540a'
+down_revision: Union[str, Sequence[str], None] = 'a2f1aef998f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sales_tenant_sale_date', 'sales', ['tenant_id', 'sale_date', 'id'], unique=False)
+    op.create_index(op.f('ix_saleitems_sale_id'), 'saleitems', ['sale_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_saleitems_sale_id'), table_name='saleitems')
+    op.drop_index('ix_sales_tenant_sale_date', table_name='sales')
@@ -0,0 +1,31 @@
+"""add quantity_received to purchase order items and unique tenant/edition inventory constraint
+
+Revision ID: 39fb24965b23
+Revises: d35b6022ba73
+Create Date: 2026-10-19 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '39fb24965b23'
+down_revision: Union[str, Sequence[str], None] = 'd35b6022ba73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('purchaseorderitems', sa.Column('quantity_received', sa.Integer(), nullable=False, server_default='0'))
+    # Receiving upserts stock with ON CONFLICT (tenant_id, edition_id)
+    op.create_unique_constraint('uq_inventory_tenant_edition', 'inventory', ['tenant_id', 'edition_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_inventory_tenant_edition', 'inventory', type_='unique')
+    op.drop_column('purchaseorderitems', 'quantity_received')
@@ -0,0 +1,39 @@
+"""add tenant metrics deltas
+
+Revision ID: 3d7d8d3fad18
+Revises: 14ee543deb6f
+Create Date: 2026-10-19 22:14:36.208517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7d8d3fad18'
+down_revision: Union[str, Sequence[str], None] = '14ee543deb6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tenantmetricsdelta',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('sku_count', sa.Integer(), nullable=False),
+    sa.Column('stock_value', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('revenue_30d', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('last_sale_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tenantmetricsdelta')
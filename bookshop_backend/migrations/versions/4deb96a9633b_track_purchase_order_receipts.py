@@ -0,0 +1,48 @@
+"""track purchase order receipts
+
+Revision ID: 4deb96a9633b
+Revises: 659becb34162
+Create Date: 2026-10-19 19:27:44.318502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4deb96a9633b'
+down_revision: Union[str, Sequence[str], None] = '659becb34162'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('purchaseorder', sa.Column('first_received_at', sa.DateTime(), nullable=True))
+    op.add_column('purchaseorder', sa.Column('received_at', sa.DateTime(), nullable=True))
+    op.add_column('purchaseorderitems', sa.Column('received_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_purchaseorder_tenant_order_date', 'purchaseorder', ['tenant_id', 'order_date'], unique=False)
+    op.create_index(op.f('ix_purchaseorderitems_po_id'), 'purchaseorderitems', ['po_id'], unique=False)
+
+    # Receipts were not timestamped before; the last update is the best available estimate
+    op.execute(
+        "UPDATE purchaseorder SET first_received_at = updated_at, received_at = updated_at "
+        "WHERE status IN ('received', 'completed')"
+    )
+    op.execute("UPDATE purchaseorder SET first_received_at = updated_at WHERE status = 'partial'")
+    op.execute(
+        "UPDATE purchaseorderitems SET received_at = purchaseorder.updated_at "
+        "FROM purchaseorder WHERE purchaseorder.id = purchaseorderitems.po_id "
+        "AND purchaseorderitems.quantity_received > 0"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_purchaseorderitems_po_id'), table_name='purchaseorderitems')
+    op.drop_index('ix_purchaseorder_tenant_order_date', table_name='purchaseorder')
+    op.drop_column('purchaseorderitems', 'received_at')
+    op.drop_column('purchaseorder', 'received_at')
+    op.drop_column('purchaseorder', 'first_received_at')
@@ -0,0 +1,146 @@
+"""partition auditlog and sales by month
+
+Revision ID: 64957373201c
+Revises: b7843f18d747
+Create Date: 2026-10-19 16:40:51.208315
+
+"""
+from typing import Optional, Sequence, Tuple, Union
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '64957373201c'
+down_revision: Union[str, Sequence[str], None] = 'b7843f18d747'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created beyond the current one; the app keeps this window rolling
+MONTHS_AHEAD = 3
+
+
+def _add_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _first_month(table: str, column: str, timezone_aware: bool) -> Optional[Tuple[int, int]]:
+    expression = f"min({column} AT TIME ZONE 'UTC')" if timezone_aware else f"min({column})"
+    value = op.get_bind().execute(sa.text(f"SELECT {expression} FROM {table}")).scalar()
+    return (value.year, value.month) if value is not None else None
+
+
+def _create_partitions(table: str, first: Optional[Tuple[int, int]], timezone_aware: bool) -> None:
+    """Monthly partitions from `first` (or now) to MONTHS_AHEAD months out, plus a default"""
+    now = datetime.now(timezone.utc)
+    last = (now.year, now.month)
+    for _ in range(MONTHS_AHEAD):
+        last = _add_month(*last)
+    year, month = min(first or last, (now.year, now.month))
+    suffix = "+00" if timezone_aware else ""
+    while (year, month) <= last:
+        next_year, next_month = _add_month(year, month)
+        op.execute(
+            f"CREATE TABLE {table}_y{year:04d}m{month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01 00:00:00{suffix}') "
+            f"TO ('{next_year:04d}-{next_month:02d}-01 00:00:00{suffix}')"
+        )
+        year, month = next_year, next_month
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _set_aside(table: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_unpartitioned_pkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Primary keys of partitioned tables must include the partition key, so they become
+    # (id, created_at); LIKE copies columns, defaults and NOT NULLs, keys are added here
+    for table in ('auditlog', 'sales', 'saleitems'):
+        _set_aside(table)
+
+    op.execute(
+        "CREATE TABLE auditlog (LIKE auditlog_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.create_primary_key('auditlog_pkey', 'auditlog', ['id', 'created_at'])
+    op.create_foreign_key(None, 'auditlog', 'tenant', ['tenant_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'auditlog', 'user', ['user_id'], ['id'], ondelete='SET NULL')
+
+    op.execute(
+        "CREATE TABLE sales (LIKE sales_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.create_primary_key('sales_pkey', 'sales', ['id', 'created_at'])
+    op.create_foreign_key(None, 'sales', 'tenant', ['tenant_id'], ['id'])
+
+    # Lines carry their sale's created_at so they are partitioned alongside it
+    op.execute(
+        "CREATE TABLE saleitems (LIKE saleitems_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+        "sale_created_at TIMESTAMP WITH TIME ZONE NOT NULL) "
+        "PARTITION BY RANGE (sale_created_at)"
+    )
+    op.create_primary_key('saleitems_pkey', 'saleitems', ['id', 'sale_created_at'])
+    op.create_foreign_key(
+        'saleitems_sale_fkey', 'saleitems', 'sales',
+        ['sale_id', 'sale_created_at'], ['id', 'created_at'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(None, 'saleitems', 'bookedition', ['edition_id'], ['edition_id'])
+
+    _create_partitions('auditlog', _first_month('auditlog_unpartitioned', 'created_at', False), False)
+    _create_partitions('sales', _first_month('sales_unpartitioned', 'created_at', True), True)
+    _create_partitions('saleitems', _first_month('sales_unpartitioned', 'created_at', True), True)
+
+    op.execute("INSERT INTO auditlog SELECT * FROM auditlog_unpartitioned")
+    op.execute("INSERT INTO sales SELECT * FROM sales_unpartitioned")
+    op.execute(
+        "INSERT INTO saleitems SELECT saleitems_unpartitioned.*, sales.created_at "
+        "FROM saleitems_unpartitioned JOIN sales ON sales.id = saleitems_unpartitioned.sale_id"
+    )
+    for table in ('saleitems', 'sales', 'auditlog'):
+        op.drop_table(f'{table}_unpartitioned')
+
+    # Indexes on the parents cascade to every partition, including future ones
+    op.create_index(op.f('ix_auditlog_created_at'), 'auditlog', ['created_at'], unique=False)
+    op.create_index('ix_auditlog_tenant_created_at', 'auditlog', ['tenant_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_sales_sale_date'), 'sales', ['sale_date'], unique=False)
+    op.create_index(op.f('ix_sales_created_at'), 'sales', ['created_at'], unique=False)
+    op.create_index(op.f('ix_sales_updated_at'), 'sales', ['updated_at'], unique=False)
+    op.create_index('ix_sales_tenant_sale_date', 'sales', ['tenant_id', 'sale_date', 'id'], unique=False)
+    op.create_index(op.f('ix_saleitems_sale_id'), 'saleitems', ['sale_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('auditlog', 'sales', 'saleitems'):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_partitioned_pkey")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+
+    op.drop_column('saleitems', 'sale_created_at')
+    op.create_primary_key('auditlog_pkey', 'auditlog', ['id'])
+    op.create_primary_key('sales_pkey', 'sales', ['id'])
+    op.create_primary_key('saleitems_pkey', 'saleitems', ['id'])
+    op.create_foreign_key(None, 'auditlog', 'tenant', ['tenant_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'auditlog', 'user', ['user_id'], ['id'], ondelete='SET NULL')
+    op.create_foreign_key(None, 'sales', 'tenant', ['tenant_id'], ['id'])
+    op.create_foreign_key('saleitems_sale_id_fkey', 'saleitems', 'sales', ['sale_id'], ['id'])
+    op.create_foreign_key(None, 'saleitems', 'bookedition', ['edition_id'], ['edition_id'])
+
+    # Dropping the parents drops their partitions; archived audit partitions are kept
+    for table in ('saleitems', 'sales', 'auditlog'):
+        op.drop_table(f'{table}_partitioned')
+
+    op.create_index(op.f('ix_auditlog_created_at'), 'auditlog', ['created_at'], unique=False)
+    op.create_index(op.f('ix_sales_sale_date'), 'sales', ['sale_date'], unique=False)
+    op.create_index(op.f('ix_sales_created_at'), 'sales', ['created_at'], unique=False)
+    op.create_index(op.f('ix_sales_updated_at'), 'sales', ['updated_at'], unique=False)
+    op.create_index('ix_sales_tenant_sale_date', 'sales', ['tenant_id', 'sale_date', 'id'], unique=False)
+    op.create_index(op.f('ix_saleitems_sale_id'), 'saleitems', ['sale_id'], unique=False)
@@ -0,0 +1,49 @@
+"""case-insensitive tenant names and trigram search
+
+Revision ID: 659becb34162
+Revises: 9d15baa2d718
+Create Date: 2026-10-19 18:41:09.662871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '659becb34162'
+down_revision: Union[str, Sequence[str], None] = '9d15baa2d718'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # The plain unique index on name becomes a unique index on lower(name); this fails
+    # if existing names differ only in case, which must be resolved by hand first
+    op.execute("DROP INDEX IF EXISTS ix_tenant_name")
+    op.execute("ALTER TABLE tenant DROP CONSTRAINT IF EXISTS tenant_name_key")
+    op.create_index(op.f('ix_tenant_name'), 'tenant', ['name'], unique=False)
+    op.create_index('uq_tenant_name_lower', 'tenant', [sa.text('lower(name)')], unique=True)
+
+    op.create_index(
+        'ix_tenant_name_trgm', 'tenant', [sa.text('lower(name) gin_trgm_ops')],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_tenant_contact_email_trgm', 'tenant', [sa.text('lower(contact_email) gin_trgm_ops')],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tenant_contact_email_trgm', table_name='tenant')
+    op.drop_index('ix_tenant_name_trgm', table_name='tenant')
+    op.drop_index('uq_tenant_name_lower', table_name='tenant')
+    op.drop_index(op.f('ix_tenant_name'), table_name='tenant')
+    op.create_index(op.f('ix_tenant_name'), 'tenant', ['name'], unique=True)
+    # pg_trgm is left installed; other objects may depend on it
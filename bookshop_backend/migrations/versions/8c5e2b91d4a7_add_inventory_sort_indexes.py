@@ -0,0 +1,33 @@
+"""add inventory sort indexes
+
+Revision ID: 8c5e2b91d4a7
+Revises: 3d7d8d3fad18
+Create Date: 2026-10-19 23:05:41.712384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5e2b91d4a7'
+down_revision: Union[str, Sequence[str], None] = '3d7d8d3fad18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must match the expressions BookRepository.list_tenant_books sorts on for the planner to pick them up
+    op.create_index('ix_inventory_tenant_available', 'inventory', ['tenant_id', sa.text('(quantity_on_hand - quantity_reserved)'), 'edition_id'], unique=False)
+    op.create_index('ix_inventory_tenant_sale_price', 'inventory', ['tenant_id', sa.text('(cost_price * (1 + profit) * (1 - discount))'), 'edition_id'], unique=False)
+    op.create_index('ix_inventory_tenant_stock_value', 'inventory', ['tenant_id', sa.text('((quantity_on_hand - quantity_reserved) * cost_price * (1 + profit) * (1 - discount))'), 'edition_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_tenant_stock_value', table_name='inventory')
+    op.drop_index('ix_inventory_tenant_sale_price', table_name='inventory')
+    op.drop_index('ix_inventory_tenant_available', table_name='inventory')
@@ -0,0 +1,43 @@
+"""add tenant metrics
+
+Revision ID: 9d15baa2d718
+Revises: 64957373201c
+Create Date: 2026-10-19 18:02:37.514209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d15baa2d718'
+down_revision: Union[str, Sequence[str], None] = '64957373201c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are filled by the app's reconcile on startup
+    op.create_table('tenantmetrics',
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('sku_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('stock_value', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('revenue_30d', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('active_users', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_sale_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tenant_id')
+    )
+    op.create_index('ix_sales_tenant_created_at', 'sales', ['tenant_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_tenant_created_at', table_name='sales')
+    op.drop_table('tenantmetrics')
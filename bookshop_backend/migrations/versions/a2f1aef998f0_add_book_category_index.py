@@ -0,0 +1,28 @@
+"""add index on book category_id
+
+Revision ID: a2f1aef998f0
+Revises: fafc8d5d4116
+Create Date: 2026-10-19 11:22:08.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f1aef998f0'
+down_revision: Union[str, Sequence[str], None] = 'fafc8d5d4116'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_book_category_id'), 'book', ['category_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_book_category_id'), table_name='book')
@@ -0,0 +1,45 @@
+"""enforce one default tax rate per tenant
+
+Revision ID: ae3ed47061ca
+Revises: 01963233540a
+Create Date: 2026-10-19 14:05:41.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae3ed47061ca'
+down_revision: Union[str, Sequence[str], None] = '01963233540a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the most recently updated default where earlier races left several
+    op.execute("""
+        UPDATE taxrates SET "default" = false
+        WHERE "default" AND id NOT IN (
+            SELECT DISTINCT ON (tenant_id) id FROM taxrates
+            WHERE "default"
+            ORDER BY tenant_id, updated_at DESC, id
+        )
+    """)
+    op.create_exclude_constraint(
+        'taxrates_one_default_per_tenant',
+        'taxrates',
+        ('tenant_id', '='),
+        using='btree',
+        where=sa.text('"default"'),
+        deferrable=True,
+        initially='DEFERRED'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('taxrates_one_default_per_tenant', 'taxrates', type_='exclude')
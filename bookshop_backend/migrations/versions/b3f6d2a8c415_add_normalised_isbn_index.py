@@ -0,0 +1,29 @@
+"""add normalised isbn index
+
+Revision ID: b3f6d2a8c415
+Revises: 5a0c3e7d9b21
+Create Date: 2026-10-20 00:04:19.863501
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6d2a8c415'
+down_revision: Union[str, Sequence[str], None] = '5a0c3e7d9b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must match NORMALISED_ISBN in supplier_catalog_repository for the planner to pick it up
+    op.create_index('ix_bookedition_isbn_normalised', 'bookedition', [sa.text("replace(upper(isbn_number), '-', '')")], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookedition_isbn_normalised', table_name='bookedition')
@@ -0,0 +1,48 @@
+"""store sales timestamps as timestamptz
+
+Revision ID: b7843f18d747
+Revises: ae3ed47061ca
+Create Date: 2026-10-19 15:12:09.774120
+
+"""
+from typing import Sequence, Union
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7843f18d747'
+down_revision: Union[str, Sequence[str], None] = 'ae3ed47061ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing values were written with the app server's naive datetime.now()
+LEGACY_TIME_ZONE = os.getenv("LEGACY_TIMESTAMP_TIME_ZONE", "UTC")
+
+COLUMNS = ['sale_date', 'created_at', 'updated_at']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            'sales', column,
+            existing_type=sa.DateTime(),
+            type_=sa.DateTime(timezone=True),
+            existing_nullable=False,
+            postgresql_using=f"{column} AT TIME ZONE '{LEGACY_TIME_ZONE}'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            'sales', column,
+            existing_type=sa.DateTime(timezone=True),
+            type_=sa.DateTime(),
+            existing_nullable=False,
+            postgresql_using=f"{column} AT TIME ZONE '{LEGACY_TIME_ZONE}'"
+        )
@@ -0,0 +1,30 @@
+"""allow null auditlog tenant
+
+Revision ID: e1a94c7b2f60
+Revises: 8c5e2b91d4a7
+Create Date: 2026-10-19 23:48:12.305917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a94c7b2f60'
+down_revision: Union[str, Sequence[str], None] = '8c5e2b91d4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Entries written when a tenant is deleted cannot reference it; applies to every partition
+    op.alter_column('auditlog', 'tenant_id', existing_type=sa.UUID(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM auditlog WHERE tenant_id IS NULL")
+    op.alter_column('auditlog', 'tenant_id', existing_type=sa.UUID(), nullable=False)
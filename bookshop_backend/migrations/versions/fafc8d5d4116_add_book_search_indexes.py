@@ -0,0 +1,38 @@
+"""add full-text and trigram indexes for book search
+
+Revision ID: fafc8d5d4116
+Revises: 39fb24965b23
+Create Date: 2026-10-19 10:05:31.772418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fafc8d5d4116'
+down_revision: Union[str, Sequence[str], None] = '39fb24965b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Must match the expression used in BookRepository.search_books for the planner to pick it up
+    op.create_index('ix_book_search_vector', 'book', [sa.text("to_tsvector('simple', title || ' ' || author)")], unique=False, postgresql_using='gin')
+    op.create_index('ix_book_title_trgm', 'book', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_book_author_trgm', 'book', ['author'], unique=False, postgresql_using='gin', postgresql_ops={'author': 'gin_trgm_ops'})
+    op.create_index('ix_bookedition_isbn_trgm', 'bookedition', ['isbn_number'], unique=False, postgresql_using='gin', postgresql_ops={'isbn_number': 'gin_trgm_ops'})
+    op.create_index('ix_bookedition_publisher_trgm', 'bookedition', ['publisher'], unique=False, postgresql_using='gin', postgresql_ops={'publisher': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookedition_publisher_trgm', table_name='bookedition')
+    op.drop_index('ix_bookedition_isbn_trgm', table_name='bookedition')
+    op.drop_index('ix_book_author_trgm', table_name='book')
+    op.drop_index('ix_book_title_trgm', table_name='book')
+    op.drop_index('ix_book_search_vector', table_name='book')
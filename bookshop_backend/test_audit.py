@@ -0,0 +1,224 @@
+"""
+Quick test script to verify audit entries and the batched audit writer
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import models
+from app.db.audit import (
+    PENDING_KEY, AuditWriter, _audit_entry, _capture_changes, _discard_pending, _release_pending,
+    audit_core_write, audit_writer
+)
+from app.modules.tax.tax_repository import TaxRepository
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, make_transient_to_detached
+from decimal import Decimal
+from fakes import FakeSession
+import asyncio
+import uuid
+
+TENANT = uuid.uuid4()
+
+def loaded_user() -> models.User:
+    user = models.User(
+        email="wanjiru@example.com", phone_number="0712345678", password="old-hash",
+        full_name="Wanjiru", tenant_id=TENANT
+    )
+    # As if loaded from the database: attribute history starts clean
+    make_transient_to_detached(user)
+    return user
+
+def test_entry_diff_and_redaction():
+    """Test that updates log changed columns only and credentials are never copied"""
+    print("Testing audit entries:")
+
+    user = loaded_user()
+    assert _audit_entry(user, "update") is None
+
+    user.full_name = "Wanjiru Kamau"
+    user.password = "new-hash"
+    entry = _audit_entry(user, "update")
+    assert entry["table_name"] == "user" and entry["record_id"] == user.id and entry["tenant_id"] == TENANT
+    assert entry["changed_data"] == {
+        "full_name": {"old": "Wanjiru", "new": "Wanjiru Kamau"},
+        "password": "[redacted]",
+    }
+
+    snapshot = _audit_entry(loaded_user(), "delete")["changed_data"]
+    assert snapshot["email"] == "wanjiru@example.com" and snapshot["tenant_id"] == str(TENANT)
+    assert snapshot["password"] == "[redacted]"
+
+    # Not tenant-scoped
+    assert _audit_entry(models.AuditLog(tenant_id=TENANT, table_name="user", record_id=uuid.uuid4(), action="insert"), "insert") is None
+
+    print("✅ Entry tests passed!")
+
+def test_core_writes_are_held_until_commit():
+    """Test Core-statement entries: diffs, snapshots and the commit/rollback lifecycle"""
+    print("Testing Core write entries:")
+
+    session = FakeSession()
+    table = models.Inventory.__table__
+    record_id = uuid.uuid4()
+    audit_core_write(session, table, TENANT, record_id, "update",
+                     old={"quantity_on_hand": 4, "cost_price": Decimal("500.00")},
+                     new={"quantity_on_hand": 10, "cost_price": Decimal("500.00")})
+    audit_core_write(session, table, TENANT, record_id, "update", old={"quantity_on_hand": 10}, new={"quantity_on_hand": 10})
+    audit_core_write(session, models.User.__table__, TENANT, record_id, "insert", new={"email": "a@b.c", "otp": "123456"})
+
+    pending = session.info[PENDING_KEY]
+    assert len(pending) == 2
+    assert pending[0]["changed_data"] == {"quantity_on_hand": {"old": 4, "new": 10}}
+    assert pending[1]["table_name"] == "user" and pending[1]["changed_data"] == {"email": "a@b.c", "otp": "[redacted]"}
+
+    _discard_pending(session)
+    assert PENDING_KEY not in session.info
+
+    audit_core_write(session, table, TENANT, record_id, "delete", old={"quantity_on_hand": 0})
+    queued = []
+    enqueue = audit_writer.enqueue
+    audit_writer.enqueue = queued.extend
+    try:
+        _release_pending(session)
+    finally:
+        audit_writer.enqueue = enqueue
+    assert [entry["action"] for entry in queued] == ["delete"] and PENDING_KEY not in session.info
+
+    print("✅ Core write tests passed!")
+
+def test_tax_rate_writes_are_audited():
+    """Test that the default switch logs only the rates whose flag changed, and deletes are logged"""
+    print("Testing default switch audit:")
+
+    new_default, old_default, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    session = FakeSession(rows=[(new_default, False), (old_default, True), (other, False)])
+    assert asyncio.run(TaxRepository(session).set_default_tax_rate(new_default, TENANT))
+
+    changes = {entry["record_id"]: entry["changed_data"] for entry in session.info[PENDING_KEY]}
+    assert changes == {
+        new_default: {"default": {"old": False, "new": True}},
+        old_default: {"default": {"old": True, "new": False}},
+    }
+    assert not asyncio.run(TaxRepository(FakeSession()).set_default_tax_rate(new_default, TENANT))
+
+    session = FakeSession(rows=[{"id": other, "tenant_id": TENANT, "name": "vat", "rate": 16.0, "default": False}])
+    assert asyncio.run(TaxRepository(session).delete_tax_rate(other, TENANT))
+    [entry] = session.info[PENDING_KEY]
+    assert entry["action"] == "delete" and entry["record_id"] == other and entry["changed_data"]["name"] == "vat"
+
+    print("✅ Default switch audit tests passed!")
+
+def recording_writer(batch_size: int, flush_ms: int, block_first: bool = False):
+    writer = AuditWriter(batch_size=batch_size, flush_ms=flush_ms)
+    writer.batches = []
+
+    async def insert(batch):
+        if block_first and not writer.batches:
+            writer.batches.append(None)
+            await asyncio.sleep(60)
+        writer.batches.append([entry["id"] for entry in batch])
+
+    writer._insert = insert
+    return writer
+
+def entries(count: int):
+    return [{"id": n} for n in range(count)]
+
+def test_writer_batches():
+    """Test that entries are written in batches of at most batch_size, or after flush_ms"""
+    print("Testing audit writer batching:")
+
+    async def run():
+        writer = recording_writer(batch_size=3, flush_ms=50)
+        await writer.start()
+        writer.enqueue(entries(7))
+        await asyncio.sleep(0.2)
+        await writer.stop()
+        return writer.batches
+
+    assert asyncio.run(run()) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    print("✅ Batching tests passed!")
+
+def test_writer_drains_on_shutdown():
+    """Test that stop() writes queued entries and any batch interrupted mid-write"""
+    print("Testing audit writer shutdown:")
+
+    async def waiting():
+        # Stopped while the first batch is still collecting
+        writer = recording_writer(batch_size=100, flush_ms=10000)
+        await writer.start()
+        writer.enqueue(entries(5))
+        await asyncio.sleep(0.05)
+        await writer.stop()
+        return writer
+
+    writer = asyncio.run(waiting())
+    assert writer.batches == [[0, 1, 2, 3, 4]] and writer.queue is None and not writer.running
+
+    async def writing():
+        # Stopped while the first batch is being inserted; more entries queued behind it
+        writer = recording_writer(batch_size=2, flush_ms=10, block_first=True)
+        await writer.start()
+        writer.enqueue(entries(5))
+        await asyncio.sleep(0.05)
+        await writer.stop()
+        return writer
+
+    writer = asyncio.run(writing())
+    assert writer.batches == [None, [0, 1], [2, 3], [4]]
+
+    print("✅ Shutdown tests passed!")
+
+def test_deleted_tenant_keeps_writer_running():
+    """Test that a tenant's deletion is logged without it and rejected rows do not stall the writer"""
+    print("Testing tenant deletion audit:")
+
+    tenant = models.Tenant(id=TENANT, name="Text Book Centre", contact_email="shop@tbc.co.ke")
+    user = loaded_user()
+    make_transient_to_detached(tenant)
+    session = Session()
+    session.add_all([tenant, user])
+    session.delete(tenant)
+    session.delete(user)
+    _capture_changes(session, None, None)
+
+    deleted = {entry["table_name"]: entry for entry in session.info[PENDING_KEY]}
+    assert set(deleted) == {"tenant", "user"}
+    assert all(entry["tenant_id"] is None and entry["action"] == "delete" for entry in deleted.values())
+    assert deleted["tenant"]["record_id"] == TENANT and deleted["tenant"]["changed_data"]["id"] == str(TENANT)
+
+    # The database rejects some rows; the rest of their batch is written and the writer moves on
+    async def writing():
+        writer = AuditWriter(batch_size=3, flush_ms=10)
+        writer.batches = []
+
+        async def insert(batch):
+            if any(entry["id"] in (1, 4) for entry in batch):
+                raise IntegrityError("INSERT INTO auditlog ...", {}, Exception("violates foreign key constraint"))
+            writer.batches.append([entry["id"] for entry in batch])
+
+        writer._insert = insert
+        await writer.start()
+        writer.enqueue(entries(6))
+        await asyncio.sleep(0.1)
+        writer.enqueue([{"id": 6}])
+        await asyncio.sleep(0.1)
+        assert writer.running and writer.queue.empty()
+        await writer.stop()
+        return writer
+
+    writer = asyncio.run(writing())
+    assert writer.batches == [[0], [2], [3], [5], [6]]
+
+    print("✅ Tenant deletion tests passed!")
+
+if __name__ == "__main__":
+    test_entry_diff_and_redaction()
+    test_core_writes_are_held_until_commit()
+    test_tax_rate_writes_are_audited()
+    test_writer_batches()
+    test_writer_drains_on_shutdown()
+    test_deleted_tenant_keeps_writer_running()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,119 @@
+"""
+Quick test script to verify the tenant book listing behind GET /books
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import models
+from app.modules.books.book_model import BookSortField, SortOrder
+from app.modules.books.book_repository import AVAILABLE_QUANTITY, SALE_PRICE, STOCK_VALUE, BookRepository
+from app.modules.books.book_service import BookService
+from app.utils.pagination import decode_cursor, encode_cursor
+from fakes import FakeSession, Row
+from sqlalchemy.dialects import postgresql
+from decimal import Decimal
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def book_row(n, sort_key):
+    return Row(
+        edition_id=uuid.UUID(int=n), book_id=uuid.UUID(int=1000 + n), title=f"Title {n}", author="Margaret Ogola",
+        isbn_number=f"978996646{n:04d}", format="paperback", category="fiction", available_quantity=n,
+        reorder_level=5, cost_price=Decimal("400.00"), sale_price=Decimal("520.00"),
+        stock_value=Decimal("520.00") * n, sort_key=sort_key
+    )
+
+def test_computed_sorts_match_indexes():
+    """Test that stock and price sorts are exactly the indexed expressions, constants inlined"""
+    print("Testing sort indexes:")
+
+    indexes = {index.name: index for index in models.Inventory.__table__.indexes}
+    for name, expression in (
+        ("ix_inventory_tenant_available", AVAILABLE_QUANTITY),
+        ("ix_inventory_tenant_sale_price", SALE_PRICE),
+        ("ix_inventory_tenant_stock_value", STOCK_VALUE),
+    ):
+        tenant, indexed, edition = (str(element) for element in indexes[name].expressions)
+        assert (tenant, edition) == ("inventory.tenant_id", "inventory.edition_id")
+        compiled = expression.compile(dialect=postgresql.dialect())
+        print(f"{name}: {compiled}")
+        assert not compiled.params
+        assert f"({compiled.string.replace('inventory.', '')})" == indexed
+
+    print("✅ Sort index tests passed!")
+
+def test_keyset_on_indexed_key():
+    """Test that pages filter and order on (expression, inventory.edition_id) for the tenant"""
+    print("Testing keyset statement:")
+
+    after = (12, uuid.UUID(int=7))
+    for order, comparison, direction in ((SortOrder.ASC, ">", "ASC"), (SortOrder.DESC, "<", "DESC")):
+        session = FakeSession()
+        asyncio.run(BookRepository(session).list_tenant_books(TENANT, 50, BookSortField.STOCK, order, after))
+        compiled, = session.compiled
+        sql = compiled.string
+        assert "(inventory.quantity_on_hand - inventory.quantity_reserved, inventory.edition_id) " + comparison in sql
+        assert f"ORDER BY inventory.quantity_on_hand - inventory.quantity_reserved {direction}, inventory.edition_id {direction}" in sql
+        assert TENANT in compiled.params.values() and 51 in compiled.params.values()
+        assert 12 in compiled.params.values() and uuid.UUID(int=7) in compiled.params.values()
+
+    print("✅ Keyset statement tests passed!")
+
+def test_cursor_round_trip():
+    """Test that each sort's cursor decodes back to a key of the column's type"""
+    print("Testing listing pagination:")
+
+    for sort_by, first_key, last_key in (
+        (BookSortField.TITLE, "River and the Source", "The River Between"),
+        (BookSortField.STOCK, 3, 9),
+        (BookSortField.SALE_PRICE, Decimal("520.00"), Decimal("865.50")),
+        (BookSortField.STOCK_VALUE, Decimal("1560.00"), Decimal("7789.50")),
+    ):
+        session = FakeSession(rows=[book_row(1, first_key), book_row(2, last_key), book_row(3, last_key)])
+        result = asyncio.run(BookService(session).get_books_by_tenant(TENANT, limit=2, sort_by=sort_by))
+        assert result.success, result.error
+        books = result.data["books"]
+        assert [book["edition_id"] for book in books] == [uuid.UUID(int=1), uuid.UUID(int=2)]
+        assert "sort_key" not in books[0]
+        cursor = result.data["next_cursor"]
+        assert decode_cursor(cursor)["sort_by"] == sort_by.value
+
+        session = FakeSession(rows=[book_row(3, last_key)])
+        result = asyncio.run(BookService(session).get_books_by_tenant(TENANT, limit=2, cursor=cursor, sort_by=sort_by))
+        assert result.success and result.data["next_cursor"] is None
+        after = [value for value in session.compiled[0].params.values() if value in (last_key, uuid.UUID(int=2))]
+        assert after == [last_key, uuid.UUID(int=2)], session.compiled[0].params
+        assert all(type(value) is type(expected) for value, expected in zip(after, (last_key, uuid.UUID(int=2))))
+
+    print("✅ Pagination tests passed!")
+
+def test_bad_cursors_rejected():
+    """Test that cursors for another sort, or mangled ones, fail before any query runs"""
+    print("Testing listing cursor validation:")
+
+    stock_cursor = encode_cursor({"sort_by": "available_quantity", "key": 3, "edition_id": str(uuid.UUID(int=1))})
+    for sort_by, cursor in (
+        (BookSortField.TITLE, stock_cursor),
+        (BookSortField.STOCK, "not-a-cursor"),
+        (BookSortField.STOCK, encode_cursor({"sort_by": "available_quantity", "key": "three", "edition_id": str(uuid.UUID(int=1))})),
+        (BookSortField.SALE_PRICE, encode_cursor({"sort_by": "sale_price", "key": "cheap", "edition_id": str(uuid.UUID(int=1))})),
+        (BookSortField.STOCK, encode_cursor({"sort_by": "available_quantity", "key": 3, "edition_id": "nope"})),
+        (BookSortField.STOCK, encode_cursor({"sort_by": "available_quantity", "key": 3})),
+        (BookSortField.STOCK, encode_cursor(["available_quantity", 3])),
+    ):
+        session = FakeSession()
+        result = asyncio.run(BookService(session).get_books_by_tenant(TENANT, limit=2, cursor=cursor, sort_by=sort_by))
+        assert not result.success and result.error == "Invalid pagination cursor", (sort_by, cursor)
+        assert session.compiled == []
+
+    print("✅ Cursor validation tests passed!")
+
+if __name__ == "__main__":
+    test_computed_sorts_match_indexes()
+    test_keyset_on_indexed_key()
+    test_cursor_round_trip()
+    test_bad_cursors_rejected()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,92 @@
+"""
+Quick test script to verify book search queries and pagination
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.books.book_repository import BookRepository, build_prefix_tsquery
+from app.modules.books.book_service import BookService
+from app.utils.pagination import encode_cursor
+from fakes import FakeSession, Row
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def book_row(n, rank):
+    return Row(
+        edition_id=uuid.UUID(int=n), book_id=uuid.UUID(int=1000 + n), title=f"Harry Potter {n}",
+        author="J. K. Rowling", isbn_number=f"978074753269{n}", publisher="Bloomsbury", format="paperback",
+        available_quantity=3, sale_price=None, rank=rank
+    )
+
+def test_prefix_tsquery():
+    """Test that free text becomes a prefix tsquery and punctuation never reaches to_tsquery"""
+    print("Testing prefix tsquery:")
+
+    assert build_prefix_tsquery("harry pot") == "harry:* & pot:*"
+    assert build_prefix_tsquery("  Harry   POTTER ") == "harry:* & potter:*"
+    # tsquery operators typed by the user are dropped rather than parsed
+    assert build_prefix_tsquery("o'brien & (tolkien | !lewis):*") == "o:* & brien:* & tolkien:* & lewis:*"
+    assert build_prefix_tsquery("Ngũgĩ wa Thiong'o") == "ngũgĩ:* & wa:* & thiong:* & o:*"
+    assert build_prefix_tsquery("") is None
+    assert build_prefix_tsquery("&|!:*()") is None
+
+    print("✅ tsquery tests passed!")
+
+def test_search_binds_query_terms():
+    """Test the values reaching the search statement, and that nothing runs for an empty query"""
+    print("Testing search statement:")
+
+    session = FakeSession()
+    assert asyncio.run(BookRepository(session).search_books("&&", TENANT, 20)) == []
+    assert session.compiled == []
+
+    session = FakeSession()
+    asyncio.run(BookRepository(session).search_books(" Harry pot ", TENANT, 20))
+    values = list(session.compiled[0].params.values())
+    assert "harry:* & pot:*" in values and "Harry pot" in values
+    assert TENANT in values and 21 in values
+    assert not any(isinstance(value, str) and value.endswith("%") for value in values)
+
+    # A query that looks like an ISBN also matches on its digits as a prefix
+    session = FakeSession()
+    asyncio.run(BookRepository(session).search_books("978-0-7475", TENANT, 20))
+    assert "97807475%" in session.compiled[0].params.values()
+
+    print("✅ Search statement tests passed!")
+
+def test_cursor_round_trip():
+    """Test that the next page starts after the last row's (rank, edition_id)"""
+    print("Testing search pagination:")
+
+    session = FakeSession(rows=[book_row(1, 1.5), book_row(2, 0.75), book_row(3, 0.75)])
+    result = asyncio.run(BookService(session).search_books("harry", TENANT, limit=2))
+    assert result.success, result.error
+    books = result.data["books"]
+    assert [book["edition_id"] for book in books] == [uuid.UUID(int=1), uuid.UUID(int=2)]
+    assert "rank" not in books[0]
+    cursor = result.data["next_cursor"]
+
+    session = FakeSession(rows=[book_row(3, 0.75)])
+    result = asyncio.run(BookService(session).search_books("harry", TENANT, limit=2, cursor=cursor))
+    assert result.success and result.data["next_cursor"] is None
+    values = list(session.compiled[0].params.values())
+    assert 0.75 in values and uuid.UUID(int=2) in values
+
+    # The last page has no cursor, and mangled cursors are rejected before any query
+    for bad in ("not-a-cursor", encode_cursor({"rank": "high", "edition_id": str(uuid.UUID(int=2))}),
+                encode_cursor({"rank": 0.75})):
+        session = FakeSession()
+        result = asyncio.run(BookService(session).search_books("harry", TENANT, limit=2, cursor=bad))
+        assert not result.success and result.error == "Invalid search cursor"
+        assert session.compiled == []
+
+    print("✅ Pagination tests passed!")
+
+if __name__ == "__main__":
+    test_prefix_tsquery()
+    test_search_binds_query_terms()
+    test_cursor_round_trip()
+    print("\n🎉 All tests passed!")
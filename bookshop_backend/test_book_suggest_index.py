@@ -0,0 +1,57 @@
+"""
+Quick test script to verify the type-ahead prefix index
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.books.book_suggest_index import PrefixIndex, SuggestEntry
+import uuid
+
+def entry(title, author, isbn):
+    return SuggestEntry(edition_id=uuid.uuid4(), title=title, author=author, isbn_number=isbn)
+
+def test_prefix_search():
+    """Test prefix matching across title, author and ISBN tokens"""
+    print("Testing prefix search:")
+
+    index = PrefixIndex()
+    index.build([
+        entry("The River and the Source", "Margaret Ogola", "9789966882059"),
+        entry("River Between", "Ngugi wa Thiong'o", "9780435905484"),
+        entry("Blossoms of the Savannah", "Henry Ole Kulet", "9789966253477"),
+    ])
+
+    titles = [e.title for e in index.search("riv")]
+    print(f"'riv': {titles}")
+    # Titles starting with the query rank first
+    assert titles == ["River Between", "The River and the Source"]
+
+    assert [e.title for e in index.search("ogo riv")] == ["The River and the Source"]
+    assert [e.title for e in index.search("978996625")] == ["Blossoms of the Savannah"]
+    assert index.search("xyz") == []
+    assert index.search("  ") == []
+
+    print("✅ Prefix search tests passed!")
+
+def test_incremental_add_and_bound():
+    """Test in-place inserts, duplicate skipping and the entry cap"""
+    print("\nTesting incremental add:")
+
+    index = PrefixIndex(max_entries=2)
+    first = entry("Kidagaa Kimemwozea", "Ken Walibora", "9789966343123")
+    index.build([first])
+    added = index.add([first, entry("Chozi la Heri", "Assumpta Matei", "9789966560506"), entry("Tumbo Lisiloshiba", "Said Mohamed", "9789966461681")])
+    print(f"Added {added}, size {len(index)}")
+    assert added == 1
+    assert len(index) == 2
+    assert [e.title for e in index.search("chozi")] == ["Chozi la Heri"]
+    assert index.search("tumbo") == []
+    assert index.tokens == sorted(index.tokens)
+
+    print("✅ Incremental add tests passed!")
+
+if __name__ == "__main__":
+    test_prefix_search()
+    test_incremental_add_and_bound()
+    print("\n🎉 All tests passed!")
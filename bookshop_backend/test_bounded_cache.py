@@ -0,0 +1,45 @@
+"""
+Quick test script to verify the in-process bounded cache
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.cache import BoundedCache
+import time
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    print("Testing LRU eviction:")
+
+    cache = BoundedCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    print(f"Entries after overflow: {len(cache)}")
+    assert "b" not in cache
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+    cache.pop("a")
+    assert cache.get("a", "missing") == "missing"
+
+    print("✅ LRU eviction tests passed!")
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL"""
+    print("\nTesting TTL expiry:")
+
+    cache = BoundedCache(maxsize=10, ttl=0.05)
+    cache.set("rate", 16)
+    assert cache.get("rate") == 16
+    time.sleep(0.06)
+    assert cache.get("rate") is None
+    assert len(cache) == 0
+
+    print("✅ TTL expiry tests passed!")
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_ttl_expiry()
+    print("\n🎉 All tests passed!")
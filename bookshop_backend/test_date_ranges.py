@@ -0,0 +1,90 @@
+"""
+Quick test script to verify tenant date range resolution
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.date_ranges import tenant_range, day_range, month_ranges, naive_local, utc_now
+from app.modules.sales.sales_model import SalesRequestBody
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+NAIROBI = ZoneInfo("Africa/Nairobi")
+UTC = timezone.utc
+
+def test_tenant_range():
+    """Test that date bounds become half-open UTC intervals in the tenant zone"""
+    print("Testing tenant date ranges:")
+
+    date_range = tenant_range("2026-10-01", "2026-10-19", NAIROBI)
+    print(f"Range: {date_range}")
+    assert date_range.start == datetime(2026, 9, 30, 21, 0, tzinfo=UTC)
+    # A date-only date_to includes the whole day
+    assert date_range.end == datetime(2026, 10, 19, 21, 0, tzinfo=UTC)
+
+    # Naive datetimes are tenant wall time; aware ones are kept as given
+    date_range = tenant_range("2026-10-19T08:00:00", "2026-10-19T10:00:00Z", NAIROBI)
+    assert date_range.start == datetime(2026, 10, 19, 5, 0, tzinfo=UTC)
+    assert date_range.end == datetime(2026, 10, 19, 10, 0, tzinfo=UTC)
+
+    open_range = tenant_range(None, "2026-10-19", NAIROBI)
+    assert open_range.start is None and open_range.end is not None
+
+    for bad in [("2026-10-20", "2026-10-19"), ("19/10/2026", None)]:
+        try:
+            tenant_range(*bad, NAIROBI)
+        except ValueError as e:
+            print(f"Rejected {bad}: {e}")
+        else:
+            raise AssertionError(f"{bad} should be rejected")
+
+    print("✅ Tenant date range tests passed!")
+
+def test_local_days_and_months():
+    """Test day and month boundaries across a DST change"""
+    print("\nTesting local days and months:")
+
+    london = ZoneInfo("Europe/London")
+    # Clocks go back on 2026-10-25, so that local day lasts 25 hours
+    day = day_range(date(2026, 10, 25), london)
+    assert (day.end - day.start).total_seconds() == 25 * 3600
+
+    months = month_ranges(date(2026, 9, 15), date(2026, 11, 2), NAIROBI)
+    assert [(year, month) for year, month, _, _ in months] == [(2026, 9), (2026, 10), (2026, 11)]
+    assert months[0][2] == datetime(2026, 9, 14, 21, 0, tzinfo=UTC)
+    assert months[1][2] == datetime(2026, 9, 30, 21, 0, tzinfo=UTC)
+    assert months[-1][3] == datetime(2026, 11, 2, 21, 0, tzinfo=UTC)
+
+    print("✅ Local day and month tests passed!")
+
+def test_server_time_defaults():
+    """Test that an omitted sale_date is an aware instant, not server wall-clock time"""
+    print("Testing sale date defaults:")
+
+    body = SalesRequestBody.model_validate({
+        "sale_items": [{
+            "edition_id": "00000000-0000-0000-0000-000000000002", "inventory_id": "00000000-0000-0000-0000-000000000003",
+            "isbn": "9780140449136", "title": "The Odyssey", "quantity_sold": 1,
+            "price_per_unit": "850.00", "total_price": "850.00"
+        }],
+        "payment": {"payment_method": "cash", "amount_received": "1000.00", "change_given": "150.00"},
+        "total_amount": "850.00"
+    })
+    # create_sale only applies the tenant zone to naive times sent by the till
+    assert body.sale_date.tzinfo is not None
+    assert abs((body.sale_date - utc_now()).total_seconds()) < 5
+
+    instant = datetime(2026, 10, 19, 9, 0, tzinfo=UTC)
+    local = naive_local(instant)
+    assert local.tzinfo is None
+    assert local.astimezone(UTC) == instant
+    assert naive_local(local) is local
+
+    print("✅ Default time tests passed!")
+
+if __name__ == "__main__":
+    test_tenant_range()
+    test_local_days_and_months()
+    test_server_time_defaults()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,183 @@
+"""
+Quick test script to verify idempotent replays of sale and payment creation
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.idempotency import KEY_REUSED_ERROR, IDEMPOTENCY_TTL_HOURS, request_hash, run_idempotent
+from app.db.models import IdempotencyKey, PaymentIntent
+from app.modules.payments.payment_service import PaymentService
+from app.utils.result import ServiceResult
+from app.modules.sales.sales_model import SalesRequestBody
+from fakes import FakeResult, FakeSession
+from datetime import timedelta
+import asyncio
+import time
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def key_session(stored=None):
+    """A session holding at most one stored key: the claim returns a row only when it is free"""
+    def respond(compiled):
+        if compiled.isinsert:
+            return FakeResult([] if stored else [("till-1",)])
+        return [stored]
+    return FakeSession(respond=respond)
+
+def test_first_request_runs_and_stores_result():
+    """Test that a new key runs the operation and saves its result in the same transaction"""
+    print("Testing first request:")
+
+    session = key_session()
+    calls = []
+
+    async def create_sale():
+        calls.append(1)
+        return ServiceResult(success=True, data={"sale_id": uuid.UUID(int=1)})
+
+    result = asyncio.run(run_idempotent(session, TENANT, "sales", "till-1-0042", {"total": 100}, create_sale))
+    assert result.success and result.message != "replayed"
+    assert len(calls) == 1
+
+    # The key is claimed with this request's hash, then given the result
+    claim, save = session.compiled
+    assert claim.isinsert and save.isupdate
+    print(f"Claim: {claim.params}")
+    assert claim.params["tenant_id"] == TENANT
+    assert claim.params["scope"] == "sales" and claim.params["key"] == "till-1-0042"
+    assert claim.params["request_hash"] == request_hash({"total": 100})
+    assert claim.params["expires_at"] - claim.params["created_at"] == timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+    # Only an expired key may be taken over
+    assert claim.params["expires_at_1"] == claim.params["created_at"]
+    assert save.params["response"] == {"sale_id": str(uuid.UUID(int=1))}
+    assert save.params["key_1"] == "till-1-0042"
+    assert session.commits == 1 and session.rollbacks == 0
+
+    print("✅ First request tests passed!")
+
+def test_retry_replays_without_running():
+    """Test that a retry with the same key and body returns the stored result and does not re-execute"""
+    print("Testing retries:")
+
+    body = {"total": 100}
+    stored = IdempotencyKey(
+        tenant_id=TENANT, scope="sales", key="till-1-0042", request_hash=request_hash(body),
+        response={"sale_id": str(uuid.UUID(int=1))}
+    )
+
+    async def create_sale():
+        raise AssertionError("a replayed request must not run again")
+
+    session = key_session(stored)
+    result = asyncio.run(run_idempotent(session, TENANT, "sales", "till-1-0042", body, create_sale))
+    assert result.success and result.message == "replayed"
+    assert result.data == {"sale_id": str(uuid.UUID(int=1))}
+    # Nothing is written for a replay
+    assert not any(compiled.isupdate for compiled in session.compiled)
+    assert session.commits == 1
+
+    session = key_session(stored)
+    result = asyncio.run(run_idempotent(session, TENANT, "sales", "till-1-0042", {"total": 200}, create_sale))
+    assert not result.success and result.error == KEY_REUSED_ERROR
+    assert session.rollbacks == 1 and session.commits == 0
+
+    print("✅ Retry tests passed!")
+
+def test_failures_are_not_kept():
+    """Test that a failed operation rolls its key back so a retry can run again"""
+    print("Testing failed requests:")
+
+    session = key_session()
+
+    async def create_sale():
+        return ServiceResult(success=False, error="Failed to create sale: out of stock")
+
+    result = asyncio.run(run_idempotent(session, TENANT, "sales", "till-1-0043", {"total": 100}, create_sale))
+    assert not result.success
+    assert session.rollbacks == 1 and session.commits == 0
+    # The claim is rolled back with the failed operation and no result is stored
+    assert len(session.compiled) == 1 and session.compiled[0].isinsert
+
+    print("✅ Failure tests passed!")
+
+def test_retry_without_sale_date_matches():
+    """Test that a retried sale body without sale_date hashes the same, though the default is now()"""
+    print("Testing retries without sale_date:")
+
+    body = {
+        "sale_items": [{
+            "edition_id": str(uuid.UUID(int=2)), "inventory_id": str(uuid.UUID(int=3)),
+            "isbn": "9780140449136", "title": "The Odyssey", "quantity_sold": 1,
+            "price_per_unit": "850.00", "total_price": "850.00"
+        }],
+        "payment": {"payment_method": "cash", "amount_received": "1000.00", "change_given": "150.00"},
+        "total_amount": "850.00"
+    }
+    first = SalesRequestBody.model_validate(body)
+    time.sleep(0.01)
+    retry = SalesRequestBody.model_validate(body)
+    assert first.sale_date != retry.sale_date
+    assert request_hash(first) == request_hash(retry)
+
+    stored = IdempotencyKey(
+        tenant_id=TENANT, scope="sales", key="till-1-0044", request_hash=request_hash(first),
+        response={"sale_id": str(uuid.UUID(int=1))}
+    )
+
+    async def create_sale():
+        raise AssertionError("a replayed request must not run again")
+
+    result = asyncio.run(run_idempotent(key_session(stored), TENANT, "sales", "till-1-0044", retry, create_sale))
+    assert result.success and result.message == "replayed"
+
+    # A body that differs in what the client sent is still a different request
+    changed = SalesRequestBody.model_validate({**body, "total_amount": "900.00"})
+    assert request_hash(changed) != request_hash(first)
+
+    print("✅ Retry without sale_date tests passed!")
+
+def test_payment_intent_replay():
+    """Test that a retried intent request returns the first intent and creates no second one"""
+    print("Testing payment intent retries:")
+
+    body = {"amount": 850.0, "phone_number": "0712345678"}
+
+    def create_intent(session):
+        service = PaymentService(session)
+        return run_idempotent(
+            session, TENANT, "payment_intents", "till-1-0045", body,
+            lambda: service.create_mpesa_qr_intent(tenant_id=TENANT, **body)
+        )
+
+    session = key_session()
+    first = asyncio.run(create_intent(session))
+    assert first.success and first.message != "replayed"
+    intent, = session.added
+    assert isinstance(intent, PaymentIntent) and intent.tenant_id == TENANT and intent.status == "pending"
+    assert first.data.intent_id == intent.id and str(first.data.amount) == "850.00"
+    claim, save = session.compiled
+    assert claim.params["scope"] == "payment_intents"
+    assert save.params["response"]["intent_id"] == str(intent.id)
+    assert session.commits == 1
+
+    stored = IdempotencyKey(
+        tenant_id=TENANT, scope="payment_intents", key="till-1-0045", request_hash=request_hash(body),
+        response=save.params["response"]
+    )
+    session = key_session(stored)
+    retry = asyncio.run(create_intent(session))
+    assert retry.success and retry.message == "replayed"
+    assert retry.data["intent_id"] == str(intent.id) and retry.data["status"] == "pending"
+    assert session.added == [] and len(session.compiled) == 2
+
+    print("✅ Payment intent retry tests passed!")
+
+if __name__ == "__main__":
+    test_first_request_runs_and_stores_result()
+    test_retry_replays_without_running()
+    test_failures_are_not_kept()
+    test_retry_without_sale_date_matches()
+    test_payment_intent_replay()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,110 @@
+"""
+Quick test script to verify margin rows and the margin report
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.analytics.analytics_model import MarginWindow
+from app.modules.analytics.analytics_repository import EXCLUDED_SALE_STATUSES, AnalyticsRepository
+from app.modules.analytics.analytics_service import AnalyticsService, to_breakdown
+from fakes import FakeSession, Row
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import asyncio
+import uuid
+
+def grouped_row(by_category, by_publisher, category, publisher, units, revenue, cost, list_revenue,
+                discounts="0", realised=None, listed=None):
+    """A row as the GROUPING SETS statement returns it"""
+    return Row(
+        by_category=by_category, by_publisher=by_publisher, category=category, publisher=publisher,
+        units_sold=units, revenue=Decimal(revenue), cost=Decimal(cost), list_revenue=Decimal(list_revenue),
+        recorded_discounts=Decimal(discounts), realised_margin=realised, list_margin=listed
+    )
+
+MARGIN_ROWS = [
+    grouped_row(1, 1, None, None, 10, "5000.00", "3000.00", "5500.00", "250.00", 0.4, 0.454545),
+    grouped_row(0, 1, "fiction", None, 6, "3200.00", "1800.00", "3300.00", "100.00", 0.4375, 0.454545),
+    # Books without a category still form their own category group
+    grouped_row(0, 1, None, None, 4, "1800.00", "1200.00", "2200.00", "150.00", 0.333333, 0.454545),
+    grouped_row(1, 0, None, "East African Educational Publishers", 10, "5000.00", "3000.00", "5500.00", "250.00", 0.4, 0.454545),
+]
+
+def test_grouping_sets_become_labelled_rows():
+    """Test that grouping() flags become total, category and publisher rows with their names"""
+    print("Testing margin rows:")
+
+    tenant_id = uuid.uuid4()
+    since = datetime(2026, 9, 19, tzinfo=timezone.utc)
+    session = FakeSession(rows=MARGIN_ROWS)
+    rows = asyncio.run(AnalyticsRepository(session).get_margin_rows(tenant_id, since))
+    assert [(row["grouping"], row["name"]) for row in rows] == [
+        ("total", None), ("category", "fiction"), ("category", None),
+        ("publisher", "East African Educational Publishers"),
+    ]
+    assert not {"by_category", "by_publisher", "category", "publisher"} & set(rows[0])
+    assert rows[1]["units_sold"] == 6 and rows[1]["revenue"] == Decimal("3200.00")
+
+    params = session.compiled[0].params.values()
+    assert tenant_id in params and since in params and EXCLUDED_SALE_STATUSES in params
+    assert "GROUP BY GROUPING SETS((), (category.name), (bookedition.publisher))" in session.statements[0]
+
+    print("✅ Margin row tests passed!")
+
+def test_breakdown_figures():
+    """Test rounding, gross profit and discount leakage derived from a row"""
+    print("Testing margin breakdowns:")
+
+    breakdown = to_breakdown({
+        "name": "fiction", "units_sold": 6, "revenue": Decimal("3200.004"), "cost": Decimal("1799.996"),
+        "list_revenue": Decimal("3300.1"), "recorded_discounts": 100, "realised_margin": 0.437501,
+        "list_margin": None
+    })
+    assert breakdown.revenue == Decimal("3200.00") and breakdown.cost == Decimal("1800.00")
+    assert breakdown.gross_profit == Decimal("1400.00")
+    assert breakdown.list_revenue == Decimal("3300.10") and breakdown.discount_leakage == Decimal("100.10")
+    assert breakdown.recorded_discounts == Decimal("100.00")
+    assert breakdown.realised_margin == 0.4375 and breakdown.list_margin is None
+
+    # Selling above list price is not negative leakage
+    above_list = to_breakdown({
+        "name": None, "units_sold": 1, "revenue": Decimal("600"), "cost": Decimal("400"),
+        "list_revenue": Decimal("500"), "recorded_discounts": 0, "realised_margin": 0.3333, "list_margin": 0.2
+    })
+    assert above_list.discount_leakage == Decimal("0.00") and above_list.gross_profit == Decimal("200.00")
+
+    print("✅ Breakdown tests passed!")
+
+def test_report_groups_and_cache():
+    """Test the report's sections, its empty totals and that it is cached per tenant and window"""
+    print("Testing margin report:")
+
+    tenant_id = uuid.uuid4()
+    session = FakeSession(rows=MARGIN_ROWS)
+    result = asyncio.run(AnalyticsService(session).get_margin_report(tenant_id, MarginWindow.MONTH))
+    assert result.success, result.error
+    report = result.data
+    assert report.days == 30 and report.generated_at - report.period_start == timedelta(days=30)
+    assert report.totals.units_sold == 10 and report.totals.gross_profit == Decimal("2000.00")
+    assert report.totals.discount_leakage == Decimal("500.00")
+    assert [row.name for row in report.by_category] == ["fiction", None]
+    assert [row.name for row in report.by_publisher] == ["East African Educational Publishers"]
+
+    # Served from the cache for the same window, recomputed for another
+    cached = asyncio.run(AnalyticsService(FakeSession()).get_margin_report(tenant_id, MarginWindow.MONTH))
+    assert cached.data is report
+    session = FakeSession()
+    empty = asyncio.run(AnalyticsService(session).get_margin_report(tenant_id, MarginWindow.QUARTER))
+    assert len(session.compiled) == 1
+    assert empty.data.totals.units_sold == 0 and empty.data.totals.revenue == Decimal("0.00")
+    assert empty.data.totals.realised_margin is None
+    assert empty.data.by_category == [] and empty.data.by_publisher == []
+
+    print("✅ Margin report tests passed!")
+
+if __name__ == "__main__":
+    test_grouping_sets_become_labelled_rows()
+    test_breakdown_figures()
+    test_report_groups_and_cache()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,101 @@
+"""
+Quick test script to verify batch onboarding and its conflict detection
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import models
+from app.modules.onboarding import onboarding_service
+from app.modules.onboarding.onboarding_model import TenantCreate
+from app.modules.onboarding.onboarding_service import DEFAULT_TAX_NAME, DEFAULT_TAX_RATE, OnboardingService
+from app.modules.tenants.tenants_model import TenantCreate as TenantDetails
+from app.modules.user.user_model import UserCreate
+from fakes import FakeSession
+import asyncio
+
+def entry(name, email):
+    return TenantCreate(
+        tenant=TenantDetails(name=name, contact_email=f"shop@{name.strip().lower().replace(' ', '')}.co.ke"),
+        admin=UserCreate(email=email, phone_number="0712345678", full_name="Admin", password=f"secret-{email}")
+    )
+
+def onboarding_session(taken_names=(), taken_emails=()):
+    """Answers the name and email lookups with what already exists"""
+    def respond(compiled):
+        table, = compiled.statement.get_final_froms()
+        return list(taken_names) if table.name == "tenant" else list(taken_emails)
+    return FakeSession(respond=respond)
+
+async def fake_hash_passwords(passwords):
+    # bcrypt is deliberately slow; the order of the results is what matters here
+    return [f"hashed:{password}" for password in passwords]
+
+def test_conflicts_reject_whole_batch():
+    """Test that duplicates in the batch and clashes with existing rows are all reported at once"""
+    print("Testing onboarding conflicts:")
+
+    entries = [
+        entry("Text Book Centre", "admin@tbc.co.ke"),
+        entry(" text book centre ", "owner@tbc.co.ke"),
+        entry("Prestige Books", "admin@tbc.co.ke"),
+        entry("Bookpoint", "admin@bookpoint.co.ke"),
+        entry("Savannis", "admin@savannis.co.ke"),
+    ]
+    session = onboarding_session(taken_names=["prestige books"], taken_emails=["admin@savannis.co.ke", "admin@bookpoint.co.ke"])
+    result = asyncio.run(OnboardingService(session).create_tenants_with_admins(entries))
+    assert not result.success
+    print(f"Error: {result.error}")
+    assert result.error.split("; ") == [
+        "Tenant name 'text book centre' appears more than once",
+        "Admin email 'admin@tbc.co.ke' appears more than once",
+        "Tenant with name 'Prestige Books' already exists",
+        "User with email 'admin@bookpoint.co.ke' already exists",
+        "User with email 'admin@savannis.co.ke' already exists",
+    ]
+
+    # One lookup per kind of key, whatever the batch size, and nothing staged
+    names, emails = session.compiled
+    assert list(names.params.values()) == [[
+        "text book centre", "text book centre", "prestige books", "bookpoint", "savannis"
+    ]]
+    assert list(emails.params.values()) == [[e.admin.email for e in entries]]
+    assert session.added == [] and session.rollbacks == 1 and session.commits == 0
+
+    print("✅ Conflict tests passed!")
+
+def test_batch_provisions_defaults():
+    """Test that every shop gets its admin, settings, default VAT and receipt template"""
+    print("Testing batch onboarding:")
+
+    original = onboarding_service.hash_passwords
+    onboarding_service.hash_passwords = fake_hash_passwords
+    try:
+        entries = [entry("Text Book Centre", "admin@tbc.co.ke"), entry("Bookpoint", "admin@bookpoint.co.ke")]
+        session = onboarding_session()
+        result = asyncio.run(OnboardingService(session).create_tenants_with_admins(entries))
+    finally:
+        onboarding_service.hash_passwords = original
+
+    assert result.success, result.error
+    assert result.message == "2 tenants created successfully"
+    assert session.commits == 1 and len(session.compiled) == 2
+
+    for (tenant, admin), data in zip(result.data, entries):
+        assert tenant.name == data.tenant.name
+        assert admin.tenant_id == tenant.id and admin.user_role == "admin"
+        assert admin.password == f"hashed:{data.admin.password}"
+        staged = [row for row in session.added if getattr(row, "tenant_id", None) == tenant.id or row is tenant]
+        assert [type(row) for row in staged] == [
+            models.Tenant, models.User, models.Settings, models.TaxRates, models.ReceiptTemplates
+        ]
+        tax_rate = staged[3]
+        assert tax_rate.default and tax_rate.name == DEFAULT_TAX_NAME and tax_rate.rate == DEFAULT_TAX_RATE
+    assert len(session.added) == 10
+
+    print("✅ Batch onboarding tests passed!")
+
+if __name__ == "__main__":
+    test_conflicts_reject_whole_batch()
+    test_batch_provisions_defaults()
+    print("\n🎉 All tests passed!")
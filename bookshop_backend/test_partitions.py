@@ -0,0 +1,190 @@
+"""
+Quick test script to verify monthly partition naming, retention and pruning
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.partitions import (
+    PARTITIONED_TABLES, SALE_DATE_LEEWAY, add_months, create_partition_sql, earliest_created_at,
+    expired_partitions, parse_partition_name, partition_name, partitions_for_range
+)
+from app.modules.analytics.analytics_repository import AnalyticsRepository
+from app.modules.replenishment.replenishment_model import ReorderPolicy
+from app.modules.replenishment.replenishment_repository import ReplenishmentRepository
+from app.modules.sales.sales_repository import SalesRepository
+from app.utils.date_ranges import tenant_range, utc_now
+from fakes import FakeSession
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import asyncio
+import re
+import uuid
+
+NAIROBI = ZoneInfo("Africa/Nairobi")
+TENANT_ID = "6e439a65-0e33-4181-8773-7a48df2bdfdf"
+
+def test_partition_names_and_bounds():
+    """Test partition names, month arithmetic and generated DDL"""
+    print("Testing partition names and bounds:")
+
+    assert add_months((2026, 11), 3) == (2027, 2)
+    assert add_months((2026, 1), -13) == (2024, 12)
+    assert partition_name("sales", (2026, 3)) == "sales_y2026m03"
+    assert parse_partition_name("saleitems_y2026m03") == ("saleitems", (2026, 3))
+    assert parse_partition_name("sales_default") is None
+
+    tables = {table.name: table for table in PARTITIONED_TABLES}
+    sql = create_partition_sql(tables["sales"], (2026, 12))
+    print(sql)
+    assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+    # auditlog.created_at is a naive timestamp, so its bounds are naive too
+    assert "+00" not in create_partition_sql(tables["auditlog"], (2026, 12))
+
+    print("✅ Partition name tests passed!")
+
+def test_audit_retention():
+    """Test which audit partitions fall outside the retention window"""
+    print("\nTesting audit retention:")
+
+    names = ["auditlog_default", "auditlog_y2025m09", "auditlog_y2025m10", "auditlog_y2026m10", "sales_y2024m01"]
+    expired = expired_partitions(names, "auditlog", retain_months=12, today=date(2026, 10, 19))
+    print(f"Expired: {expired}")
+    assert expired == ["auditlog_y2025m09"]
+
+    print("✅ Audit retention tests passed!")
+
+def test_dashboard_range_pruning():
+    """Test that dashboard date filters touch only the partitions they need"""
+    print("\nTesting dashboard partition pruning:")
+
+    # "This month so far" for a Nairobi shop starts at 21:00 UTC on the last day of
+    # September, so the September partition is scanned as well
+    month_to_date = tenant_range("2026-10-01", "2026-10-19", NAIROBI)
+    assert partitions_for_range("sales", month_to_date.start, month_to_date.end) == [
+        "sales_y2026m09", "sales_y2026m10"
+    ]
+
+    # A UTC-aligned month ends exactly at the next partition's lower bound
+    utc_month = tenant_range("2026-10-01", "2026-10-31", ZoneInfo("UTC"))
+    assert partitions_for_range("sales", utc_month.start, utc_month.end) == ["sales_y2026m10"]
+
+    today = tenant_range("2026-10-19", "2026-10-19", NAIROBI)
+    assert partitions_for_range("sales", today.start, today.end) == ["sales_y2026m10"]
+
+    print("✅ Partition pruning tests passed!")
+
+def pruned_partitions(compiled, now: datetime):
+    """
+    Partitions each partitioned table in a statement can be pruned to: those between the
+    lowest bound on its partition key and `now`. Unbounded tables come back as None.
+    """
+    bounds = {}
+    for table, column, param in re.findall(r"\b(sales|saleitems)\.(created_at|sale_created_at) >= %\((\w+)\)s", compiled.string):
+        bounds[table] = min(bounds.get(table, now), compiled.params[param])
+    return {table: partitions_for_range(table, bounds[table], now) if table in bounds else None for table in ("sales", "saleitems")}
+
+def test_sale_date_queries_prune_on_created_at():
+    """Test that reports filtered on sale_date also bound the partition key of sales and their lines"""
+    print("\nTesting sale_date report pruning:")
+
+    tenant_id = uuid.uuid4()
+    now = utc_now()
+    since = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    assert earliest_created_at(since) == since - SALE_DATE_LEEWAY
+
+    session = FakeSession()
+    asyncio.run(AnalyticsRepository(session).get_margin_rows(tenant_id, since))
+    margins = pruned_partitions(session.compiled[0], now)
+    assert margins["sales"] == partitions_for_range("sales", since, now)
+    assert margins["saleitems"] == partitions_for_range("saleitems", since, now)
+    assert margins["sales"][0] == "sales_y2026m10"
+
+    session = FakeSession()
+    policy = ReorderPolicy()
+    asyncio.run(ReplenishmentRepository(session).get_reorder_candidates(tenant_id, policy))
+    window = pruned_partitions(session.compiled[0], now)
+    window_start = now - timedelta(days=policy.window_days) - SALE_DATE_LEEWAY
+    assert window["sales"] == partitions_for_range("sales", window_start, now)
+    assert window["saleitems"] == partitions_for_range("saleitems", window_start, now)
+
+    async def export():
+        return [row async for row in SalesRepository(session).iter_sales_ledger(tenant_id, since, now)]
+
+    session = FakeSession()
+    asyncio.run(export())
+    ledger = pruned_partitions(session.compiled[0], now)
+    assert ledger["sales"] == partitions_for_range("sales", since, now)
+    assert ledger["saleitems"] == partitions_for_range("saleitems", since, now)
+
+    print("✅ sale_date report pruning tests passed!")
+
+def test_pruning_against_database():
+    """
+    Check real plans for the dashboard queries. Runs only when TEST_DATABASE_URL points
+    at a migrated database.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        print("\nSkipping plan check: TEST_DATABASE_URL is not set")
+        return
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    date_range = tenant_range("2026-10-01", "2026-10-19", NAIROBI)
+    start, end = date_range.start.isoformat(), date_range.end.isoformat()
+    queries = {
+        "sales": (
+            f"SELECT id FROM sales WHERE tenant_id = '{TENANT_ID}' "
+            f"AND created_at >= '{start}' AND created_at < '{end}' ORDER BY created_at DESC LIMIT 100"
+        ),
+        "auditlog": (
+            f"SELECT id FROM auditlog WHERE tenant_id = '{TENANT_ID}' "
+            f"AND created_at >= '2026-10-01' AND created_at < '2026-10-20'"
+        ),
+        # Reports filter on sale_date and bound created_at from below
+        "saleitems": (
+            f"SELECT saleitems.id FROM saleitems JOIN sales ON saleitems.sale_id = sales.id "
+            f"AND saleitems.sale_created_at = sales.created_at WHERE sales.tenant_id = '{TENANT_ID}' "
+            f"AND sales.sale_date >= '{start}' AND sales.created_at >= '{earliest_created_at(date_range.start).isoformat()}' "
+            f"AND saleitems.sale_created_at >= '{earliest_created_at(date_range.start).isoformat()}'"
+        ),
+    }
+    created_from = earliest_created_at(date_range.start)
+    first_month = (created_from.astimezone(timezone.utc).year, created_from.astimezone(timezone.utc).month)
+
+    def expected(table: str, name: str) -> bool:
+        if table == "auditlog":
+            return name == "auditlog_y2026m10"
+        if table == "sales":
+            return name in partitions_for_range("sales", date_range.start, date_range.end)
+        # Only a lower bound on created_at: later months and the default stay in the plan
+        parsed = parse_partition_name(name)
+        return parsed is None or parsed[1] >= first_month
+
+    async def explain():
+        engine = create_async_engine(url.replace("postgresql://", "postgresql+asyncpg://"))
+        async with engine.connect() as conn:
+            for table, query in queries.items():
+                # Without September's partition those rows would fall into the default
+                await conn.execute(text(create_partition_sql(
+                    next(t for t in PARTITIONED_TABLES if t.name == table), (2026, 9)
+                )))
+                plan = "\n".join(row[0] for row in await conn.execute(text(f"EXPLAIN {query}")))
+                print(plan)
+                scanned = {f"{name}_{suffix}" for name, suffix in re.findall(r"\b(sales|saleitems|auditlog)_(y\d{4}m\d{2}|default)\b", plan)}
+                assert scanned and all(expected(table, name) for name in scanned), scanned
+            await conn.rollback()
+        await engine.dispose()
+
+    asyncio.run(explain())
+    print("✅ Database plan checks passed!")
+
+if __name__ == "__main__":
+    test_partition_names_and_bounds()
+    test_audit_retention()
+    test_dashboard_range_pruning()
+    test_sale_date_queries_prune_on_created_at()
+    test_pruning_against_database()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,62 @@
+"""
+Quick test script to verify how a purchase order delivery is applied to inventory
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import models
+from app.db.audit import PENDING_KEY
+from app.modules.purchase_orders.purchase_order_repository import PurchaseOrderRepository
+from fakes import FakeSession
+from decimal import Decimal
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def test_oversold_stock_takes_received_cost():
+    """Test that the weighted-average cost only blends in stock that is actually on hand"""
+    print("Testing delivery cost blending:")
+
+    oversold, stocked = uuid.UUID(int=1), uuid.UUID(int=2)
+    oversold_inventory, stocked_inventory = uuid.uuid4(), uuid.uuid4()
+
+    def respond(compiled):
+        if not compiled.isinsert:
+            # Stock before the delivery: two copies oversold, four on hand at 500
+            return [(oversold, -2, Decimal("450.00")), (stocked, 4, Decimal("500.00"))]
+        return [(oversold_inventory, oversold, 8, Decimal("600.00")), (stocked_inventory, stocked, 14, Decimal("570.00"))]
+
+    session = FakeSession(respond=respond)
+    po = models.PurchaseOrder(tenant_id=TENANT, supplier_id=uuid.uuid4(), order_number="A0001")
+    lines = [
+        models.PurchaseOrderItems(po_id=po.id, edition_id=edition_id, quantity_ordered=10, unit_cost=Decimal("600.00"))
+        for edition_id in (oversold, stocked)
+    ]
+    asyncio.run(PurchaseOrderRepository(session).receive_purchase_order(
+        po, lines, {line.id: 10 for line in lines},
+        {oversold: (10, Decimal("600.00")), stocked: (10, Decimal("600.00"))}, "received"
+    ))
+
+    upsert = session.compiled[1]
+    sql = upsert.string
+    print(f"SQL: {sql}")
+    # Stock at or below zero takes the delivery's cost; only positive stock is blended
+    assert "cost_price = CASE WHEN (inventory.quantity_on_hand <= %(quantity_on_hand_1)s" in sql
+    assert upsert.params["quantity_on_hand_1"] == 0
+    assert ("THEN excluded.cost_price ELSE round((inventory.quantity_on_hand * inventory.cost_price"
+            " + excluded.quantity_on_hand * excluded.cost_price) / ") in sql
+
+    changes = {entry["record_id"]: entry["changed_data"] for entry in session.info[PENDING_KEY]}
+    assert changes[oversold_inventory] == {
+        "quantity_on_hand": {"old": -2, "new": 8}, "cost_price": {"old": "450.00", "new": "600.00"}
+    }
+    assert all(line.quantity_received == 10 for line in lines)
+    assert po.status == "received" and po.first_received_at == po.received_at
+
+    print("✅ Delivery cost tests passed!")
+
+if __name__ == "__main__":
+    test_oversold_stock_takes_received_cost()
+    print("\n🎉 All tests passed!")
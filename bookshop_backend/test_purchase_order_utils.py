@@ -5,8 +5,11 @@ import sys
 import os
 sys.path.append('/home/tindi/bookshop-flow/bookshop_backend')
 
-from app.modules.purchase_orders.purchase_order_utils import generate_order_number, calculate_expected_delivery_date
+from app.modules.purchase_orders.purchase_order_utils import generate_order_number, calculate_expected_delivery_date, summarise_receipt
 from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+import uuid
 
 def test_order_number_generation():
     """Test order number generation logic"""
@@ -45,7 +48,39 @@ def test_delivery_date_calculation():
     
     print("✅ Delivery date calculation tests passed!")
 
+def test_receipt_summary():
+    """Test receipt validation, edition merging and resulting status"""
+    print("\nTesting receipt summary:")
+
+    edition_id = uuid.uuid4()
+    first = SimpleNamespace(id=uuid.uuid4(), edition_id=edition_id, quantity_ordered=10, quantity_received=0, unit_cost=Decimal("10.00"))
+    second = SimpleNamespace(id=uuid.uuid4(), edition_id=edition_id, quantity_ordered=10, quantity_received=0, unit_cost=Decimal("20.00"))
+    other = SimpleNamespace(id=uuid.uuid4(), edition_id=uuid.uuid4(), quantity_ordered=5, quantity_received=2, unit_cost=Decimal("7.50"))
+    lines = [first, second, other]
+
+    # Partial delivery: same edition on two lines is merged at a blended cost
+    stock, status = summarise_receipt(lines, {first.id: 10, second.id: 5})
+    print(f"Partial delivery: {stock}, status={status}")
+    assert status == "partial"
+    assert stock == {edition_id: (15, Decimal("40") / Decimal("3"))}
+
+    # Receiving everything outstanding completes the order
+    stock, status = summarise_receipt(lines, {first.id: 10, second.id: 10, other.id: 3})
+    assert status == "received"
+    assert stock[other.edition_id] == (3, Decimal("7.50"))
+
+    # Over-receiving and unknown lines are rejected
+    for bad in ({other.id: 4}, {uuid.uuid4(): 1}):
+        try:
+            summarise_receipt(lines, bad)
+            assert False, "Expected ValueError"
+        except ValueError as e:
+            print(f"Rejected: {e}")
+
+    print("✅ Receipt summary tests passed!")
+
 if __name__ == "__main__":
     test_order_number_generation()
     test_delivery_date_calculation()
+    test_receipt_summary()
     print("\n🎉 All tests passed!")
@@ -0,0 +1,112 @@
+"""
+Quick test script to verify receipt template compilation and rendering
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.sales.receipts import compile_template, default_template, group_receipts, render_receipts
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from decimal import Decimal
+import uuid
+
+SALE_ID = uuid.UUID("3f2b8c1e-0000-4000-8000-000000000001")
+
+def sale_rows():
+    base = {
+        "sale_id": SALE_ID,
+        "sale_date": datetime(2026, 10, 19, 14, 30),
+        "payment_method": "cash",
+        "customer_name": None,
+        "total_amount": Decimal("1700.00"),
+        "amount_received": Decimal("2000.00"),
+        "change_given": Decimal("300.00"),
+        "shop_name": "KICD Bookshop",
+        "author": None,
+        "isbn": "9789966000000",
+    }
+    return [
+        {**base, "line_id": uuid.uuid4(), "title": "River and the Source", "quantity_sold": 2,
+         "price_per_unit": Decimal("600.00"), "total_price": Decimal("1200.00"),
+         "tax_amount": Decimal("165.52"), "discount_amount": None},
+        {**base, "line_id": uuid.uuid4(), "title": "Blossoms of the Savannah", "quantity_sold": 1,
+         "price_per_unit": Decimal("550.00"), "total_price": Decimal("500.00"),
+         "tax_amount": Decimal("68.97"), "discount_amount": Decimal("50.00")},
+    ]
+
+def test_compile_and_render():
+    """Test a tenant template with an items block"""
+    print("Testing template rendering:")
+
+    template = compile_template(
+        "{shop_name}\n{#items}\n{quantity_sold} x {title}\n{/items}\nTotal {total_amount:.2f} ({item_count} books)\n"
+    )
+    receipts = group_receipts(sale_rows())
+    assert len(receipts) == 1
+    assert receipts[0]["total_tax"] == Decimal("234.49")
+    assert receipts[0]["total_discount"] == Decimal("50.00")
+
+    text = render_receipts(template, receipts, "text").decode()
+    print(text)
+    assert text == (
+        "KICD Bookshop\n"
+        "2 x River and the Source\n"
+        "1 x Blossoms of the Savannah\n"
+        "Total 1700.00 (3 books)\n"
+    )
+
+    print("✅ Template rendering tests passed!")
+
+def test_invalid_templates():
+    """Test that bad templates are rejected at compile time"""
+    print("\nTesting invalid templates:")
+
+    for text in ["{shop_nmae}", "{title}", "{#items}{title}", "{/items}{#items}"]:
+        try:
+            compile_template(text)
+        except ValueError as e:
+            print(f"Rejected {text!r}: {e}")
+        else:
+            raise AssertionError(f"{text!r} should not compile")
+
+    print("✅ Invalid template tests passed!")
+
+def test_output_formats():
+    """Test ESC/POS and HTML output for a batch of receipts"""
+    print("\nTesting output formats:")
+
+    rows = sale_rows()
+    other = uuid.UUID("3f2b8c1e-0000-4000-8000-000000000002")
+    rows.append({**rows[0], "sale_id": other, "title": "<b>Kidagaa</b>"})
+    receipts = group_receipts(rows)
+    assert len(receipts) == 2
+
+    escpos = render_receipts(default_template, receipts, "escpos")
+    assert escpos.startswith(b"\x1b@")
+    assert escpos.count(b"\x1dV\x01") == 2
+
+    html = render_receipts(default_template, receipts, "html").decode()
+    assert html.count('class="receipt"') == 2
+    assert "&lt;b&gt;Kidagaa&lt;/b&gt;" in html
+
+    print("✅ Output format tests passed!")
+
+def test_tenant_formatting():
+    """Test currency and time zone from the tenant context"""
+    print("\nTesting tenant currency and time zone:")
+
+    rows = [{**row, "sale_date": datetime(2026, 10, 19, 21, 30, tzinfo=timezone.utc)} for row in sale_rows()]
+    receipts = group_receipts(rows, currency="KES", time_zone=ZoneInfo("Africa/Nairobi"))
+    text = render_receipts(compile_template("{sale_date:%d/%m %H:%M} {currency} {total_amount}"), receipts, "text").decode()
+    print(text)
+    assert text == "20/10 00:30 KES 1700.00"
+
+    print("✅ Tenant formatting tests passed!")
+
+if __name__ == "__main__":
+    test_compile_and_render()
+    test_invalid_templates()
+    test_output_formats()
+    test_tenant_formatting()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,136 @@
+"""
+Quick test script to verify reorder suggestion maths and draft purchase orders
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.replenishment.replenishment_model import ReorderPolicy
+from app.modules.replenishment.replenishment_repository import (
+    MIN_LEAD_TIME_SAMPLES, RECENT_WEIGHT, ReplenishmentRepository
+)
+from app.modules.replenishment.replenishment_service import ReplenishmentService
+from fakes import FakeSession, Row
+from datetime import date, timedelta
+from decimal import Decimal
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+SUPPLIER = uuid.UUID(int=100)
+
+def candidate(n, supplier_id=SUPPLIER, available=4, velocity=0.5, suggested=20, unit_cost="250.00"):
+    return Row(
+        edition_id=uuid.UUID(int=n), title=f"Book {n}", isbn=f"978000000000{n}", reorder_level=5,
+        available=available, on_order=0, daily_velocity=velocity, supplier_id=supplier_id,
+        unit_cost=Decimal(unit_cost), lead_time_days=12.34,
+        supplier_name="Longhorn" if supplier_id else None,
+        days_of_cover=available / velocity if velocity else None,
+        suggested_quantity=suggested
+    )
+
+def test_velocity_and_horizon_parameters():
+    """Test that the policy reaches the velocity, lead time and order horizon terms"""
+    print("Testing reorder candidate parameters:")
+
+    policy = ReorderPolicy(lead_time_days=4, cover_days=21, window_days=14, history_months=2)
+    session = FakeSession()
+    asyncio.run(ReplenishmentRepository(session).get_reorder_candidates(TENANT, policy))
+    compiled, = session.compiled
+    values = list(compiled.params.values())
+
+    # Units per day over the recent window and over the summary months
+    assert 14.0 in values and 60.0 in values
+    # The two rates are blended with weights that add up to one
+    assert RECENT_WEIGHT in values
+    assert any(isinstance(value, float) and abs(value - (1 - RECENT_WEIGHT)) < 1e-9 for value in values)
+    # Observed lead times need enough deliveries, otherwise the policy's applies
+    assert MIN_LEAD_TIME_SAMPLES in values and 4.0 in values
+    # Orders cover the lead time plus cover_days
+    assert policy.cover_days in values
+
+    # Without supplier lead times the policy's is used as is
+    session = FakeSession()
+    asyncio.run(ReplenishmentRepository(session).get_reorder_candidates(
+        TENANT, policy.model_copy(update={"use_supplier_lead_times": False})
+    ))
+    assert "percentile_cont" not in session.statements[0]
+    assert MIN_LEAD_TIME_SAMPLES not in session.compiled[0].params.values()
+
+    print("✅ Parameter tests passed!")
+
+def test_suggestions_grouped_by_supplier():
+    """Test cover, stockout dates and per-supplier estimated cost"""
+    print("Testing reorder suggestions:")
+
+    session = FakeSession(rows=[
+        candidate(1, available=4, velocity=0.5, suggested=20, unit_cost="250.00"),
+        candidate(2, available=0, velocity=1.0, suggested=36, unit_cost="99.50"),
+        candidate(3, supplier_id=None, available=2, velocity=0.0, suggested=3, unit_cost="400.00"),
+    ])
+    result = asyncio.run(ReplenishmentService(session).get_reorder_suggestions(TENANT, ReorderPolicy()))
+    assert result.success, result.error
+    supplied, unsupplied = result.data
+
+    assert supplied.supplier_id == SUPPLIER and supplied.supplier_name == "Longhorn"
+    assert supplied.estimated_cost == Decimal("250.00") * 20 + Decimal("99.50") * 36
+    first, second = supplied.items
+    assert first.days_of_cover == 8.0 and first.projected_stockout_date == date.today() + timedelta(days=8)
+    assert second.days_of_cover == 0.0 and second.projected_stockout_date == date.today()
+    assert first.lead_time_days == 12.3
+
+    # No sales: no cover figure or stockout date, but still below the reorder level
+    assert unsupplied.supplier_id is None and unsupplied.estimated_cost == Decimal("1200.00")
+    item, = unsupplied.items
+    assert item.days_of_cover is None and item.projected_stockout_date is None
+
+    print("✅ Suggestion tests passed!")
+
+class PurchaseOrders:
+    """Records the orders a service asks for"""
+    def __init__(self):
+        self.orders = []
+
+    async def create_purchase_orders_bulk(self, tenant_id, orders):
+        self.orders = orders
+        return [
+            Row(id=uuid.UUID(int=200 + i), order_number=f"PO-{i:04d}", supplier_id=po.supplier_id)
+            for i, (po, items) in enumerate(orders, start=1)
+        ]
+
+def test_draft_orders_skip_editions_without_supplier():
+    """Test that one draft is made per supplier and editions never purchased are left out"""
+    print("Testing draft purchase orders:")
+
+    session = FakeSession(rows=[
+        candidate(1, suggested=20, unit_cost="250.00"),
+        candidate(2, suggested=36, unit_cost="99.50"),
+        candidate(3, supplier_id=None, suggested=3),
+    ])
+    service = ReplenishmentService(session)
+    service.purchase_orders = PurchaseOrders()
+    result = asyncio.run(service.create_draft_orders(TENANT, ReorderPolicy()))
+    assert result.success, result.error
+    assert result.data == [{"id": uuid.UUID(int=201), "poNumber": "PO-0001", "supplier_id": SUPPLIER}]
+
+    (order, items), = service.purchase_orders.orders
+    assert order.status == "draft" and order.supplier_id == SUPPLIER
+    assert order.total_amount == Decimal("8582.00")
+    assert [(item.edition_id, item.quantity_ordered, item.unit_cost) for item in items] == [
+        (uuid.UUID(int=1), 20, Decimal("250.00")), (uuid.UUID(int=2), 36, Decimal("99.50"))
+    ]
+    assert session.commits == 1
+
+    # Nothing to order from a known supplier
+    service = ReplenishmentService(FakeSession(rows=[candidate(3, supplier_id=None)]))
+    service.purchase_orders = PurchaseOrders()
+    result = asyncio.run(service.create_draft_orders(TENANT, ReorderPolicy()))
+    assert result.success and result.data == [] and service.purchase_orders.orders == []
+
+    print("✅ Draft order tests passed!")
+
+if __name__ == "__main__":
+    test_velocity_and_horizon_parameters()
+    test_suggestions_grouped_by_supplier()
+    test_draft_orders_skip_editions_without_supplier()
+    print("\n🎉 All tests passed!")
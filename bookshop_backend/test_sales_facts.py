@@ -0,0 +1,112 @@
+"""
+Quick test script to verify the month-partitioned sales facts export
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.sales import sales_facts
+from app.modules.sales.sales_facts import write_month, stream_partitioned_zip
+from app.utils.date_ranges import month_ranges
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+import pyarrow.parquet as pq
+import pyarrow as pa
+import asyncio
+import io
+import uuid
+import zipfile
+
+NAIROBI = ZoneInfo("Africa/Nairobi")
+UTC = timezone.utc
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def sale_line(n, line=True):
+    return {
+        "sale_id": uuid.UUID(int=n // 2), "line_id": uuid.UUID(int=1000 + n) if line else None,
+        "sale_date": datetime(2026, 10, 1 + n % 28, 9, 30, tzinfo=UTC), "sale_status": "completed",
+        "payment_method": "mpesa", "edition_id": uuid.UUID(int=500 + n % 3), "isbn": "9780140449136",
+        "title": "The Odyssey", "quantity_sold": 1 + n % 4, "price_per_unit": Decimal("850.00"),
+        "total_price": Decimal("850.00") * (1 + n % 4), "tax_amount": None if n % 5 else Decimal("117.24"),
+        "discount_amount": Decimal("0.00"),
+    }
+
+async def rows_of(lines):
+    for line in lines:
+        yield line
+
+def test_month_ranges():
+    """Test that a local date range splits into contiguous, clipped calendar months"""
+    print("Testing month ranges:")
+
+    months = month_ranges(date(2026, 12, 20), date(2027, 2, 3), NAIROBI)
+    assert [(year, month) for year, month, _, _ in months] == [(2026, 12), (2027, 1), (2027, 2)]
+    # Clipped to the requested days, in the tenant's zone
+    assert months[0][2] == datetime(2026, 12, 19, 21, 0, tzinfo=UTC)
+    assert months[-1][3] == datetime(2027, 2, 3, 21, 0, tzinfo=UTC)
+    # Each month starts where the previous one ended
+    for (_, _, _, end), (_, _, start, _) in zip(months, months[1:]):
+        assert end == start
+    assert months[1][2] == datetime(2026, 12, 31, 21, 0, tzinfo=UTC)
+
+    single = month_ranges(date(2028, 2, 29), date(2028, 2, 29))
+    assert single == [(2028, 2, datetime(2028, 2, 29, tzinfo=UTC), datetime(2028, 3, 1, tzinfo=UTC))]
+
+    print("✅ Month range tests passed!")
+
+def test_write_month_round_trip():
+    """Test that lines come back intact, across several batches, in both formats"""
+    print("Testing write_month:")
+
+    lines = [sale_line(n) for n in range(25)] + [sale_line(99, line=False)]
+    batch_size = sales_facts.BATCH_SIZE
+    sales_facts.BATCH_SIZE = 10
+    try:
+        parquet = asyncio.run(write_month(rows_of(lines), TENANT, 2026, 10, "parquet"))
+        arrow = asyncio.run(write_month(rows_of(lines), TENANT, 2026, 10, "arrow"))
+    finally:
+        sales_facts.BATCH_SIZE = batch_size
+
+    table = pq.read_table(io.BytesIO(parquet))
+    assert table.schema == sales_facts.fact_schema()
+    # Sales without lines (the outer join's empty side) are skipped
+    assert table.num_rows == 25
+    assert pq.ParquetFile(io.BytesIO(parquet)).metadata.num_row_groups == 3
+    facts = table.to_pylist()
+    assert facts[0]["tenant_id"] == str(TENANT) and facts[0]["year"] == 2026 and facts[0]["month"] == 10
+    assert facts[3]["line_id"] == str(uuid.UUID(int=1003))
+    assert facts[3]["total_price"] == Decimal("3400.00")
+    assert facts[5]["tax_amount"] == Decimal("117.24") and facts[6]["tax_amount"] is None
+    assert facts[7]["sale_date"] == datetime(2026, 10, 8, 9, 30, tzinfo=UTC)
+
+    with pa.ipc.open_file(io.BytesIO(arrow)) as reader:
+        assert reader.read_all().to_pylist() == facts
+
+    # A month with no lines produces no file
+    assert asyncio.run(write_month(rows_of([sale_line(1, line=False)]), TENANT, 2026, 10, "parquet")) == b""
+
+    print("✅ write_month tests passed!")
+
+def test_partitioned_zip():
+    """Test that month files are zipped under their Hive-style paths"""
+    print("Testing partitioned zip:")
+
+    async def months():
+        yield "year=2026/month=10/part-0.parquet", b"october"
+        yield "year=2026/month=11/part-0.parquet", b"november"
+
+    async def collect():
+        return b"".join([chunk async for chunk in stream_partitioned_zip(months())])
+
+    archive = zipfile.ZipFile(io.BytesIO(asyncio.run(collect())))
+    assert archive.namelist() == ["year=2026/month=10/part-0.parquet", "year=2026/month=11/part-0.parquet"]
+    assert archive.read("year=2026/month=11/part-0.parquet") == b"november"
+
+    print("✅ Zip tests passed!")
+
+if __name__ == "__main__":
+    test_month_ranges()
+    test_write_month_round_trip()
+    test_partitioned_zip()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,107 @@
+"""
+Quick test script to verify keyset chunking of the sales ledger export
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.sales.sales_repository import SalesRepository
+from app.modules.sales.sales_service import SALES_LEDGER_COLUMNS
+from app.utils.streaming import csv_stream, gzip_stream
+from fakes import FakeSession, Row
+from datetime import datetime, timedelta, timezone
+import asyncio
+import csv
+import io
+import uuid
+import zlib
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+START = datetime(2026, 10, 1, tzinfo=timezone.utc)
+END = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+def sale(n, hours, lines):
+    """A sale and its joined ledger rows; a sale with no lines still gives one row"""
+    sale_date = START + timedelta(hours=hours)
+    return [
+        Row(sale_id=uuid.UUID(int=n), sale_date=sale_date, line_id=uuid.UUID(int=n * 100 + line) if lines else None)
+        for line in range(max(lines, 1))
+    ]
+
+def ledger_session(sales):
+    """Answers each chunk query from `sales` like the database would: after the key, up to the limit"""
+    def respond(compiled):
+        values = list(compiled.params.values())
+        limit, = [value for value in values if isinstance(value, int)]
+        after = None
+        for i, value in enumerate(values):
+            if isinstance(value, uuid.UUID) and value != TENANT:
+                after = (values[i - 1], value)
+        keys = sorted({(rows[0].sale_date, rows[0].sale_id) for rows in sales})
+        page = [key for key in keys if after is None or key > after][:limit]
+        rows = [row for rows in sales for row in rows if (row.sale_date, row.sale_id) in page]
+        return sorted(rows, key=lambda row: (row.sale_date, row.sale_id, row.line_id or uuid.UUID(int=0)))
+    return FakeSession(respond=respond)
+
+def read_ledger(session, chunk_size):
+    async def read():
+        return [row async for row in SalesRepository(session).iter_sales_ledger(TENANT, START, END, chunk_size)]
+    return asyncio.run(read())
+
+def test_chunks_cover_every_line_once():
+    """Test that chunks count sales rather than lines and continue after the last sale seen"""
+    print("Testing ledger chunks:")
+
+    # Two sales share a sale_date across a chunk boundary; one sale has no lines
+    sales = [sale(1, 1, 1), sale(2, 2, 3), sale(4, 3, 2), sale(3, 3, 1), sale(5, 4, 0)]
+    session = ledger_session(sales)
+    rows = read_ledger(session, chunk_size=2)
+    assert [(row["sale_id"].int, row["line_id"]) for row in rows] == [
+        (1, uuid.UUID(int=100)),
+        (2, uuid.UUID(int=200)), (2, uuid.UUID(int=201)), (2, uuid.UUID(int=202)),
+        (3, uuid.UUID(int=300)),
+        (4, uuid.UUID(int=400)), (4, uuid.UUID(int=401)),
+        (5, None),
+    ]
+    # 2 + 2 + 1 sales: the short last chunk ends the export without another query
+    assert len(session.compiled) == 3
+    first, second, third = session.compiled
+    assert uuid.UUID(int=2) not in first.params.values()
+    assert START + timedelta(hours=2) in second.params.values() and uuid.UUID(int=2) in second.params.values()
+    assert START + timedelta(hours=3) in third.params.values() and uuid.UUID(int=4) in third.params.values()
+
+    # A full last chunk needs one more, empty, query to know it was the last
+    session = ledger_session(sales[:4])
+    assert len(read_ledger(session, chunk_size=2)) == 7
+    assert len(session.compiled) == 3
+
+    session = ledger_session([])
+    assert read_ledger(session, chunk_size=2) == [] and len(session.compiled) == 1
+
+    print("✅ Ledger chunk tests passed!")
+
+def test_gzipped_csv_round_trip():
+    """Test that the CSV stream survives sync-flushed gzip chunking intact"""
+    print("Testing compressed ledger stream:")
+
+    async def rows():
+        for n in range(2500):
+            yield [n, f"line {n}"] + [""] * (len(SALES_LEDGER_COLUMNS) - 2)
+
+    async def collect():
+        return [chunk async for chunk in gzip_stream(csv_stream(SALES_LEDGER_COLUMNS, rows()))]
+
+    chunks = asyncio.run(collect())
+    # Header, three flushes of rows, then the end of the gzip member
+    assert len(chunks) == 5
+    text = zlib.decompress(b"".join(chunks), wbits=31).decode()
+    records = list(csv.reader(io.StringIO(text)))
+    assert records[0] == SALES_LEDGER_COLUMNS
+    assert len(records) == 2501 and records[-1][:2] == ["2499", "line 2499"]
+
+    print("✅ Compressed stream tests passed!")
+
+if __name__ == "__main__":
+    test_chunks_cover_every_line_once()
+    test_gzipped_csv_round_trip()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,66 @@
+"""
+Quick test script to verify the supplier dashboard query and totals
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.suppliers.supplier_service import SupplierService, supplier_dashboard_cache
+from fakes import FakeSession, Row
+from decimal import Decimal
+import asyncio
+import uuid
+
+def supplier_row(name, status, open_value, delivered, lead_days, titles, timed=None):
+    return Row(
+        id=uuid.uuid4(), name=name, contact_person=None, contact_info=f"orders@{name.lower()}.co.ke",
+        phone_number=None, address=None, status=status, open_orders=1 if open_value else 0,
+        open_po_value=Decimal(open_value), delivered_orders=delivered,
+        lead_time_orders=delivered if timed is None else timed,
+        avg_lead_time_days=Decimal(lead_days) if lead_days is not None else None,
+        titles_supplied=titles, total_titles=5
+    )
+
+def test_dashboard_from_one_query():
+    """Test that the dashboard is one statement over the link table, cached per tenant"""
+    print("Testing supplier dashboard:")
+
+    tenant_id = uuid.uuid4()
+    session = FakeSession([
+        # One of Longhorn's delivered orders was closed by hand without receiving anything
+        supplier_row("Longhorn", "active", "12000.00", 4, "4.0", 4, timed=3),
+        supplier_row("Moran", "active", "0", 1, "8.0", 2),
+        supplier_row("Storymoja", "inactive", "0", 0, None, 0),
+        # Only hand-closed orders: delivered, but no lead time at all
+        supplier_row("Jomo Kenyatta Foundation", "active", "0", 2, None, 0, timed=0),
+    ])
+    result = asyncio.run(SupplierService(session).get_supplier_dashboard(tenant_id))
+    assert result.success, result.error
+    dashboard = result.data
+    print(f"Dashboard: {dashboard.total_suppliers} suppliers, lead time {dashboard.avg_lead_time_days}")
+
+    assert len(session.statements) == 1
+    sql = session.statements[0]
+    assert "FROM tenantsupplier JOIN supplier" in sql
+    assert "count(purchaseorder.first_received_at) FILTER" in sql
+    assert " supplier.tenant_id" not in sql
+
+    assert dashboard.total_suppliers == 4
+    assert dashboard.total_active_suppliers == 3
+    assert dashboard.total_books == 5
+    assert dashboard.open_po_value == Decimal("12000.00")
+    # Weighted by orders that received stock: (3 * 4 + 1 * 8) / 4
+    assert dashboard.avg_lead_time_days == 5.0
+    assert dashboard.supplier_list[2].avg_lead_time_days is None
+    assert dashboard.supplier_list[3].delivered_orders == 2 and dashboard.supplier_list[3].avg_lead_time_days is None
+
+    # Served from the cache until a write invalidates it
+    asyncio.run(SupplierService(session).get_supplier_dashboard(tenant_id))
+    assert len(session.statements) == 1
+    supplier_dashboard_cache.pop(tenant_id)
+
+    print("✅ Dashboard tests passed!")
+
+if __name__ == "__main__":
+    test_dashboard_from_one_query()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,122 @@
+"""
+Quick test script to verify the supplier performance query and reorder lead times
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.analytics.analytics_service import AnalyticsService, supplier_performance_cache
+from app.modules.analytics.analytics_model import MarginWindow
+from app.modules.replenishment.replenishment_repository import MIN_LEAD_TIME_SAMPLES, ReplenishmentRepository
+from app.modules.replenishment.replenishment_model import ReorderPolicy
+from app.modules.purchase_orders.purchase_order_service import PurchaseOrderService
+from app.db import models
+from fakes import FakeSession, Row
+from datetime import datetime
+import asyncio
+import uuid
+
+def test_performance_from_one_query():
+    """Test that lead times, on-time and fill rates come from one statement with SQL percentiles"""
+    print("Testing supplier performance:")
+
+    tenant_id = uuid.uuid4()
+    session = FakeSession([Row(
+        supplier_id=uuid.uuid4(), supplier_name="Longhorn", delivered_orders=4, on_time_orders=3,
+        avg_lead_time_days=5.25, min_lead_time_days=3.0, max_lead_time_days=9.0,
+        p50_lead_time_days=4.5, p90_lead_time_days=7.8, due_orders=4,
+        units_ordered=200, units_received=180, line_fill_rate=0.75
+    )])
+    result = asyncio.run(AnalyticsService(session).get_supplier_performance(tenant_id, MarginWindow.QUARTER))
+    assert result.success, result.error
+
+    assert len(session.statements) == 1
+    sql = session.statements[0]
+    print(f"SQL: {sql}")
+    assert "WITHIN GROUP (ORDER BY" in sql and "FULL OUTER JOIN" in sql
+    params = session.compiled[0].params
+    assert 0.5 in params.values() and 0.9 in params.values()
+    # Orders placed in the last 90 days, compared as naive local times like order_date
+    since = [value for name, value in params.items() if name.startswith("order_date")]
+    assert since and all(value.tzinfo is None for value in since)
+    assert {(datetime.now() - value).days for value in since} == {90}
+
+    supplier = result.data.suppliers[0]
+    assert supplier.on_time_rate == 0.75
+    assert supplier.fill_rate == 0.9
+    assert supplier.p90_lead_time_days == 7.8
+
+    # Served from the cache for the same window
+    asyncio.run(AnalyticsService(session).get_supplier_performance(tenant_id, MarginWindow.QUARTER))
+    assert len(session.statements) == 1
+    supplier_performance_cache.pop((tenant_id, 90))
+
+    print("✅ Performance tests passed!")
+
+def test_reorder_horizon_uses_observed_lead_time():
+    """Test that reorder planning takes the supplier's p90 lead time when there is enough history"""
+    print("Testing reorder lead times:")
+
+    session = FakeSession()
+    asyncio.run(ReplenishmentRepository(session).get_reorder_candidates(uuid.uuid4(), ReorderPolicy()))
+    sql = session.statements[0]
+    assert "percentile_cont" in sql and "delivered_orders >= " in sql
+    assert MIN_LEAD_TIME_SAMPLES in session.compiled[0].params.values()
+
+    session = FakeSession()
+    asyncio.run(ReplenishmentRepository(session).get_reorder_candidates(
+        uuid.uuid4(), ReorderPolicy(use_supplier_lead_times=False)
+    ))
+    assert "percentile_cont" not in session.statements[0]
+
+    print("✅ Reorder lead time tests passed!")
+
+class OrderRepository:
+    """One purchase order and its lines, kept in memory"""
+    def __init__(self, po, lines):
+        self.po = po
+        self.lines = lines
+
+    async def get_purchase_order_by_id(self, po_id, tenant_id, for_update=False):
+        return self.po
+
+    async def get_purchase_order_lines(self, po_id):
+        return self.lines
+
+    async def save(self, po):
+        return po
+
+def close_by_hand(quantities_received):
+    po = models.PurchaseOrder(
+        tenant_id=uuid.uuid4(), supplier_id=uuid.uuid4(), order_number="PO-0001", status="approved"
+    )
+    lines = [
+        models.PurchaseOrderItems(po_id=po.id, edition_id=uuid.uuid4(), quantity_ordered=10,
+                                  quantity_received=quantity, unit_cost=100)
+        for quantity in quantities_received
+    ]
+    service = PurchaseOrderService(FakeSession())
+    service.repository = OrderRepository(po, lines)
+    result = asyncio.run(service.update_purchase_order_status(po.id, po.tenant_id, "completed"))
+    assert result.success, result.error
+    return po
+
+def test_manual_close_stamps_receipts_only_for_delivered_stock():
+    """Test that closing an order by hand records a receipt time only if stock arrived"""
+    print("Testing manual close:")
+
+    undelivered = close_by_hand([0, 0])
+    assert undelivered.status == "completed"
+    assert undelivered.received_at is None and undelivered.first_received_at is None
+
+    delivered = close_by_hand([0, 4])
+    assert delivered.received_at is not None
+    assert delivered.first_received_at == delivered.received_at == delivered.updated_at
+
+    print("✅ Manual close tests passed!")
+
+if __name__ == "__main__":
+    test_performance_from_one_query()
+    test_reorder_horizon_uses_observed_lead_time()
+    test_manual_close_stamps_receipts_only_for_delivered_stock()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,144 @@
+"""
+Quick test script to verify the single-statement default tax rate switch
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import models
+from app.modules.tax.tax_engine import TaxTable
+from app.modules.tax.tax_model import UpdateTaxModel
+from app.modules.tax.tax_repository import TaxRepository
+from app.modules.tax.tax_service import TaxService, tax_table_cache
+from fakes import FakeSession, Row
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from datetime import datetime
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def test_switch_statement():
+    """Test that one UPDATE rewrites all of the tenant's rates, guarded on the target being theirs"""
+    print("Testing default switch statement:")
+
+    target = uuid.uuid4()
+    compiled = TaxRepository(FakeSession())._switch_default_stmt(target, TENANT).compile(dialect=postgresql.dialect())
+    print(f"Statement: {compiled}")
+    assert compiled.isupdate
+    values = list(compiled.params.values())
+    # Tenant scope for the rows and for the guard; the target decides each row's new flag
+    # and must exist in the tenant for anything to change
+    assert values.count(TENANT) == 2 and values.count(target) == 2
+    assert not any(value is True or value is False for value in values)
+    assert [column.name for column in compiled.statement._returning] == ["id", "default"]
+
+    # The constraint is only checked at commit, once the single UPDATE has moved the flag
+    constraint, = [c for c in models.TaxRates.__table__.constraints if isinstance(c, ExcludeConstraint)]
+    assert constraint.name == "taxrates_one_default_per_tenant"
+    assert constraint.deferrable and constraint.initially == "DEFERRED"
+
+    print("✅ Switch statement tests passed!")
+
+def test_service_switch():
+    """Test results, transaction outcome and cache invalidation of the service calls"""
+    print("Testing default switch service:")
+
+    target, previous = uuid.uuid4(), uuid.uuid4()
+
+    tax_table_cache.set(TENANT, TaxTable())
+    session = FakeSession(rows=[Row(id=target, default=False), Row(id=previous, default=True)])
+    result = asyncio.run(TaxService(session).set_default_tax_rate(target, TENANT))
+    assert result.success and result.data == target
+    assert session.commits == 1 and len(session.compiled) == 1
+    assert tax_table_cache.get(TENANT) is None
+
+    # Another tenant's rate: the guard matches nothing and the transaction is rolled back
+    tax_table_cache.set(TENANT, TaxTable())
+    session = FakeSession()
+    result = asyncio.run(TaxService(session).set_default_tax_rate(target, TENANT))
+    assert not result.success and result.error == "Tax rate not found"
+    assert session.rollbacks == 1 and session.commits == 0
+    assert tax_table_cache.get(TENANT) is not None
+
+    # isDefault on an update goes through the switch first; clearing it does not
+    rate = models.TaxRates(id=target, tenant_id=TENANT, name="vat", rate=0.16, default=True, effective_date=datetime.now())
+
+    def respond(compiled):
+        # The switch comes first, then the update of the remaining columns
+        return [Row(id=target, default=False)] if len(session.compiled) == 1 else [(rate,)]
+
+    session = FakeSession(respond=respond)
+    result = asyncio.run(TaxService(session).update_tax_rate(target, UpdateTaxModel(isDefault=True), TENANT))
+    assert result.success and result.data.isDefault
+    switch, update = session.compiled
+    assert target in switch.params.values() and "default" not in update.params
+
+    session = FakeSession(rows=[(models.TaxRates(id=target, tenant_id=TENANT, name="vat", rate=0.16, default=False, effective_date=datetime.now()), True)])
+    result = asyncio.run(TaxService(session).update_tax_rate(target, UpdateTaxModel(isDefault=False), TENANT))
+    assert result.success and not result.data.isDefault
+    update, = session.compiled
+    assert update.params["default"] is False
+
+    print("✅ Switch service tests passed!")
+
+def test_switch_against_database():
+    """
+    Run the switch on real rows and check the one-default constraint. Runs only when
+    TEST_DATABASE_URL points at a migrated database; nothing is committed.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        print("Skipping database switch check: TEST_DATABASE_URL is not set")
+        return
+
+    from sqlalchemy import insert, select, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async def switch():
+        engine = create_async_engine(url.replace("postgresql://", "postgresql+asyncpg://"))
+        async with engine.connect() as conn:
+            tenants = [uuid.uuid4(), uuid.uuid4()]
+            await conn.execute(insert(models.Tenant.__table__), [
+                {"id": tenant_id, "name": f"Switch test {tenant_id}", "contact_email": "switch@example.com",
+                 "created_at": datetime.now(), "updated_at": datetime.now()}
+                for tenant_id in tenants
+            ])
+            # Three rates for the first tenant, the first of them the default, and one for the second
+            rates = [uuid.uuid4() for _ in range(3)]
+            foreign = uuid.uuid4()
+            owners = [(rate_id, tenants[0]) for rate_id in rates] + [(foreign, tenants[1])]
+            await conn.execute(insert(models.TaxRates.__table__), [
+                {"id": rate_id, "tenant_id": tenant_id, "name": f"rate {n}", "rate": 0.16, "description": "",
+                 "default": rate_id in (rates[0], foreign), "effective_date": datetime.now(),
+                 "created_at": datetime.now(), "updated_at": datetime.now()}
+                for n, (rate_id, tenant_id) in enumerate(owners)
+            ])
+            repository = TaxRepository(None)
+
+            async def defaults():
+                result = await conn.execute(
+                    select(models.TaxRates.id).where(models.TaxRates.tenant_id == tenants[0], models.TaxRates.default)
+                )
+                return [row.id for row in result]
+
+            returned = (await conn.execute(repository._switch_default_stmt(rates[2], tenants[0]))).all()
+            assert sorted(returned) == sorted([(rates[0], True), (rates[1], False), (rates[2], False)])
+            await conn.execute(text("SET CONSTRAINTS taxrates_one_default_per_tenant IMMEDIATE"))
+            assert await defaults() == [rates[2]]
+
+            # Another tenant's rate changes nothing
+            assert (await conn.execute(repository._switch_default_stmt(foreign, tenants[0]))).all() == []
+            assert await defaults() == [rates[2]]
+            await conn.rollback()
+        await engine.dispose()
+
+    asyncio.run(switch())
+    print("✅ Database switch checks passed!")
+
+if __name__ == "__main__":
+    test_switch_statement()
+    test_service_switch()
+    test_switch_against_database()
+    print("\n🎉 All tests passed!")
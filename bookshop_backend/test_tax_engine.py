@@ -0,0 +1,81 @@
+"""
+Quick test script to verify basket tax computation
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.tax.tax_engine import EffectiveRate, TaxTable, compute_basket_tax
+from app.modules.tax.tax_service import TaxService, tax_table_cache
+from fakes import FakeSession
+from datetime import datetime, timedelta
+from decimal import Decimal
+import asyncio
+import uuid
+
+def test_basket_tax():
+    """Test tax extraction from VAT-inclusive lines"""
+    print("Testing basket tax:")
+
+    basket = compute_basket_tax([
+        (Decimal("1160.00"), 1, Decimal("0")),
+        (Decimal("499.99"), 3, Decimal("100.00")),
+        (Decimal("50.00"), 1, Decimal("50.00")),
+    ], Decimal("0.16"))
+    print(f"Lines: {basket.lines}")
+    assert basket.lines[0].tax_amount == Decimal("160.00")
+    # (1499.97 - 100.00) * 0.16 / 1.16 = 193.099... -> 193.10
+    assert basket.lines[1].net_amount == Decimal("1399.97")
+    assert basket.lines[1].tax_amount == Decimal("193.10")
+    assert basket.lines[2].tax_amount == Decimal("0.00")
+    assert basket.total_tax == Decimal("353.10")
+    assert basket.total_amount == Decimal("2559.97")
+
+    print("✅ Basket tax tests passed!")
+
+def test_effective_dates():
+    """Test that rates only apply once effective"""
+    print("\nTesting effective dates:")
+
+    now = datetime.now()
+    current = EffectiveRate(uuid.uuid4(), "vat", Decimal("0.16"), True, now - timedelta(days=30))
+    scheduled = EffectiveRate(uuid.uuid4(), "vat 2027", Decimal("0.18"), False, now + timedelta(days=30))
+    table = TaxTable(rates=[current, scheduled])
+
+    assert table.default_rate(now) == current
+    assert table.get(scheduled.id, now) is None
+    assert table.get(scheduled.id, now + timedelta(days=31)) == scheduled
+    assert TaxTable(rates=[scheduled]).default_rate(now) is None
+
+    print("✅ Effective date tests passed!")
+
+def test_default_rate_matches_sales():
+    """Test that the default reported to clients is the one sales are taxed at"""
+    print("\nTesting the reported default rate:")
+
+    now = datetime.now()
+    tenant_id = uuid.uuid4()
+    scheduled = EffectiveRate(uuid.uuid4(), "vat 2027", Decimal("0.18"), True, now + timedelta(days=30))
+    tax_table_cache.set(tenant_id, TaxTable(rates=[scheduled]))
+    service = TaxService(FakeSession())
+
+    result = asyncio.run(service.get_default_tax_rate(tenant_id))
+    assert not result.success and result.error == "No default tax rate found"
+    basket = asyncio.run(service.compute_basket_tax(tenant_id, [(Decimal("1160.00"), 1, Decimal("0"))]))
+    assert basket.success and basket.data is None
+
+    current = EffectiveRate(uuid.uuid4(), "vat", Decimal("0.16"), True, now - timedelta(days=30))
+    tax_table_cache.set(tenant_id, TaxTable(rates=[scheduled, current]))
+    result = asyncio.run(service.get_default_tax_rate(tenant_id))
+    assert result.success and result.data.id == current.id and result.data.taxRate == 0.16
+    basket = asyncio.run(service.compute_basket_tax(tenant_id, [(Decimal("1160.00"), 1, Decimal("0"))]))
+    assert basket.data.total_tax == Decimal("160.00")
+    assert service.db.compiled == []
+
+    print("✅ Default rate tests passed!")
+
+if __name__ == "__main__":
+    test_basket_tax()
+    test_effective_dates()
+    test_default_rate_matches_sales()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,134 @@
+"""
+Quick test script to verify the tenant metrics statements
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.tenants.tenant_metrics_repository import TenantMetricsRepository
+from app.modules.tenants.tenants_model import TenantMetricsSortField
+from app.modules.tenants.tenants_service import TenantService
+from app.modules.books.book_model import SortOrder
+from fakes import FakeSession, Row
+from datetime import datetime, timezone
+from decimal import Decimal
+import asyncio
+import uuid
+
+TENANT = uuid.UUID("6e439a65-0e33-4181-8773-7a48df2bdfdf")
+
+def metrics_row(n, revenue, last_sale_at=None):
+    tenant_id = uuid.UUID(int=n)
+    return Row(
+        tenant_id=tenant_id, name=f"Shop {n}", contact_email=f"shop{n}@example.com", sku_count=10,
+        stock_value=Decimal("1000.00"), revenue_30d=revenue, active_users=2, last_sale_at=last_sale_at,
+        reconciled_at=None, sort_key=revenue if last_sale_at is None else last_sale_at
+    )
+
+def test_write_paths_append_deltas():
+    """Test that sales and stock moves append a delta row instead of updating the tenant's row"""
+    print("Testing metric deltas:")
+
+    session = FakeSession()
+    repository = TenantMetricsRepository(session)
+    sold_at = datetime.now(timezone.utc)
+    asyncio.run(repository.add_stock(TENANT, -2, Decimal("450.00")))
+    asyncio.run(repository.record_sale(TENANT, Decimal("1200.00"), "paid", sold_at))
+    asyncio.run(repository.record_sale(TENANT, Decimal("300.00"), "cancelled", sold_at))
+
+    stock, sale, cancelled = session.compiled
+    print(f"Stock: {stock}")
+    for compiled in session.compiled:
+        assert compiled.string.startswith("INSERT INTO tenantmetricsdelta")
+        assert "ON CONFLICT" not in compiled.string and "tenantmetrics " not in compiled.string
+    assert stock.params["tenant_id"] == TENANT
+    assert stock.params["stock_value"] == Decimal("-900.00") and stock.params["sku_count"] is None
+    assert sale.params["revenue_30d"] == Decimal("1200.00") and sale.params["last_sale_at"] == sold_at
+    assert cancelled.params["revenue_30d"] == 0
+
+    print("✅ Delta tests passed!")
+
+def test_fold_moves_deltas_in_one_statement():
+    """Test that folding deletes the deltas and adds their per-tenant sums to the rows"""
+    print("Testing delta fold:")
+
+    session = FakeSession()
+    asyncio.run(TenantMetricsRepository(session).fold_deltas())
+    assert len(session.statements) == 1
+    sql = session.statements[0]
+    print(f"SQL: {sql}")
+    assert sql.startswith("WITH folded AS \n(DELETE FROM tenantmetricsdelta RETURNING")
+    assert "INSERT INTO tenantmetrics " in sql and "FROM folded GROUP BY folded.tenant_id" in sql
+    assert "stock_value = (tenantmetrics.stock_value + excluded.stock_value)" in sql
+    assert "revenue_30d = (tenantmetrics.revenue_30d + excluded.revenue_30d)" in sql
+    assert "greatest(tenantmetrics.last_sale_at, excluded.last_sale_at)" in sql
+
+    print("✅ Fold tests passed!")
+
+def test_reconcile_is_one_statement():
+    """Test that reconcile recomputes every tenant in one INSERT ... SELECT"""
+    print("Testing reconcile:")
+
+    session = FakeSession()
+    asyncio.run(TenantMetricsRepository(session).reconcile())
+    assert len(session.statements) == 1
+    sql = session.statements[0]
+    # Deltas are discarded by the same statement, so under the same snapshot
+    assert sql.startswith("WITH discarded AS \n(DELETE FROM tenantmetricsdelta RETURNING")
+    assert "INSERT INTO tenantmetrics " in sql
+    assert "FROM tenant LEFT OUTER JOIN" in sql
+    # Bounded on the partition key so only recent partitions are scanned
+    assert "sales.created_at >= " in sql
+    assert TENANT not in session.compiled[0].params.values()
+
+    session = FakeSession()
+    asyncio.run(TenantMetricsRepository(session).reconcile(TENANT))
+    assert "DELETE FROM tenantmetricsdelta WHERE tenantmetricsdelta.tenant_id = " in session.statements[0]
+    assert TENANT in session.compiled[0].params.values()
+
+    print("✅ Reconcile tests passed!")
+
+def test_cursor_round_trip():
+    """Test that the next page continues after the last row's (sort key, tenant id)"""
+    print("Testing metrics pagination:")
+
+    first_page = [metrics_row(3, Decimal("900.00")), metrics_row(2, Decimal("500.00")), metrics_row(1, Decimal("100.00"))]
+    session = FakeSession(rows=first_page)
+    result = asyncio.run(TenantService(session).get_tenant_metrics(limit=2))
+    assert result.success, result.error
+    assert [tenant.name for tenant in result.data["tenants"]] == ["Shop 3", "Shop 2"]
+    cursor = result.data["next_cursor"]
+    assert cursor is not None
+
+    session = FakeSession(rows=[metrics_row(1, Decimal("100.00"))])
+    result = asyncio.run(TenantService(session).get_tenant_metrics(limit=2, cursor=cursor))
+    assert result.success and result.data["next_cursor"] is None
+    params = session.compiled[0].params
+    print(f"Params: {params}")
+    # The keyset comparison is bound to the decoded sort key and tenant id
+    assert Decimal("500.00") in params.values() and uuid.UUID(int=2) in params.values()
+    assert 3 in params.values()
+
+    sold_at = datetime(2026, 10, 18, 17, 45, tzinfo=timezone.utc)
+    session = FakeSession(rows=[metrics_row(5, Decimal("0"), sold_at), metrics_row(4, Decimal("0"), sold_at)])
+    result = asyncio.run(TenantService(session).get_tenant_metrics(limit=1, sort_by=TenantMetricsSortField.LAST_SALE_AT))
+    session = FakeSession()
+    asyncio.run(TenantService(session).get_tenant_metrics(
+        limit=1, cursor=result.data["next_cursor"], sort_by=TenantMetricsSortField.LAST_SALE_AT
+    ))
+    assert sold_at in session.compiled[0].params.values()
+
+    # A cursor from another sort order is rejected
+    result = asyncio.run(TenantService(FakeSession()).get_tenant_metrics(
+        limit=2, cursor=cursor, sort_by=TenantMetricsSortField.NAME, order=SortOrder.ASC
+    ))
+    assert not result.success and result.error == "Invalid pagination cursor"
+
+    print("✅ Pagination tests passed!")
+
+if __name__ == "__main__":
+    test_write_paths_append_deltas()
+    test_fold_moves_deltas_in_one_statement()
+    test_reconcile_is_one_statement()
+    test_cursor_round_trip()
+    print("\n🎉 All tests passed!")
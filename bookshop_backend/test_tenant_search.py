@@ -0,0 +1,81 @@
+"""
+Quick test script to verify the tenant search queries
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.modules.tenants.tenants_repository import TenantRepository, like_pattern
+from app.modules.tenants.tenants_service import TenantService
+from fakes import FakeSession, Row
+import asyncio
+import uuid
+
+def tenant_row(n, match, score):
+    return Row(
+        id=uuid.UUID(int=n), name=f"Text Book Centre {n}", contact_email=f"branch{n}@tbc.co.ke",
+        contact_phone=None, address=None, match=match, score=score
+    )
+
+def test_like_pattern():
+    """Test that LIKE wildcards typed by the user match literally"""
+    print("Testing LIKE patterns:")
+
+    assert like_pattern("mall") == "%mall%"
+    assert like_pattern("100%_books") == "%100\\%\\_books%"
+    assert like_pattern("a\\b") == "%a\\\\b%"
+
+    print("✅ Pattern tests passed!")
+
+def test_search_uses_indexed_expressions():
+    """Test that filters and the name check go through lower(...), which is indexed"""
+    print("Testing search SQL:")
+
+    session = FakeSession()
+    repository = TenantRepository(session)
+    asyncio.run(repository.search("Text Book", 20))
+    sql = session.statements[0]
+    print(f"SQL: {sql}")
+    assert "lower(tenant.name) LIKE " in sql
+    assert "lower(tenant.contact_email) LIKE " in sql
+    assert "lower(tenant.name) %% " in sql
+    assert "ORDER BY CASE" in sql and "tenant.id DESC" in sql
+    assert {"%text book%", "text book"} <= set(session.compiled[0].params.values())
+
+    session = FakeSession(rows=[True])
+    assert asyncio.run(TenantRepository(session).name_exists("  Text Book Centre "))
+    assert "EXISTS" in session.statements[0] and "lower(tenant.name) = " in session.statements[0]
+    assert "text book centre" in session.compiled[0].params.values()
+
+    print("✅ Search tests passed!")
+
+def test_cursor_round_trip():
+    """Test that the next page continues after the last row's (match, score, id) for the same query"""
+    print("Testing search pagination:")
+
+    session = FakeSession(rows=[tenant_row(3, 2, 1.0), tenant_row(2, 1, 0.75), tenant_row(1, 0, 0.4)])
+    result = asyncio.run(TenantService(session).search_tenants("Text Book", limit=2))
+    assert result.success, result.error
+    assert [tenant.id for tenant in result.data["tenants"]] == [uuid.UUID(int=3), uuid.UUID(int=2)]
+    assert result.data["tenants"][1].score == 0.75
+    cursor = result.data["next_cursor"]
+
+    session = FakeSession(rows=[tenant_row(1, 0, 0.4)])
+    result = asyncio.run(TenantService(session).search_tenants(" text book ", limit=2, cursor=cursor))
+    assert result.success and result.data["next_cursor"] is None
+    params = session.compiled[0].params
+    print(f"Params: {params}")
+    assert 0.75 in params.values() and uuid.UUID(int=2) in params.values()
+
+    # A cursor from a different search, or a mangled one, is rejected
+    for bad in (cursor, "not-a-cursor"):
+        result = asyncio.run(TenantService(FakeSession()).search_tenants("Moran", limit=2, cursor=bad))
+        assert not result.success and result.error == "Invalid pagination cursor"
+
+    print("✅ Pagination tests passed!")
+
+if __name__ == "__main__":
+    test_like_pattern()
+    test_search_uses_indexed_expressions()
+    test_cursor_round_trip()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,110 @@
+"""
+Quick test script to verify unit-of-work commit boundaries
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.unit_of_work import UnitOfWork, after_commit, transactional
+from app.db import models
+from app.modules.books.book_repository import BookRepository, category_cache
+from app.utils.result import ServiceResult
+from fakes import FakeSession
+import asyncio
+
+class InventoryService:
+    def __init__(self, db):
+        self.db = db
+
+    @transactional
+    async def adjust(self, ok: bool) -> ServiceResult:
+        after_commit(self.db, lambda: self.db.calls.append("invalidate"))
+        return ServiceResult(success=ok, error=None if ok else "Insufficient stock")
+
+class SalesService:
+    def __init__(self, db):
+        self.db = db
+        self.inventory = InventoryService(db)
+
+    @transactional
+    async def create_sale(self, stock_ok: bool = True) -> ServiceResult:
+        result = await self.inventory.adjust(stock_ok)
+        if not result.success:
+            return ServiceResult(success=False, error=result.error)
+        return ServiceResult(success=True, data={"sale_id": 1})
+
+    @transactional
+    async def explode(self):
+        raise RuntimeError("boom")
+
+def test_nested_operations_commit_once():
+    """Test that a nested service call joins the outer transaction"""
+    print("Testing nested units of work:")
+
+    session = FakeSession()
+    result = asyncio.run(SalesService(session).create_sale())
+    print(f"Calls: {session.calls}")
+    assert result.success
+    # One commit at the outer boundary, then the deferred cache work
+    assert session.calls == ["commit", "invalidate"]
+    assert session.info["uow_depth"] == 0
+
+    print("✅ Nested unit of work tests passed!")
+
+def test_failures_roll_back():
+    """Test that failed results and exceptions roll back and drop after-commit work"""
+    print("\nTesting rollbacks:")
+
+    session = FakeSession()
+    result = asyncio.run(SalesService(session).create_sale(stock_ok=False))
+    assert not result.success
+    assert session.calls == ["rollback"]
+
+    session = FakeSession()
+    try:
+        asyncio.run(SalesService(session).explode())
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("The exception should propagate")
+    assert session.calls == ["rollback"]
+
+    # Outside a unit of work the callback runs straight away
+    session = FakeSession()
+    after_commit(session, lambda: session.calls.append("invalidate"))
+    assert session.calls == ["invalidate"]
+
+    print("✅ Rollback tests passed!")
+
+def test_rolled_back_lookups_are_not_cached():
+    """Test that ids found during an import are only cached once the import commits"""
+    print("\nTesting catalogue cache on rollback:")
+
+    category = models.Category(name="Rollback Poetry")
+    # Every lookup finds the category, as if flushed earlier in the transaction
+    session = FakeSession(rows=[category])
+
+    async def failed_import():
+        async with UnitOfWork(session) as uow:
+            await BookRepository(session).create_book_category("Rollback Poetry")
+            uow.rollback_on_exit()
+
+    asyncio.run(failed_import())
+    assert session.calls == ["rollback"]
+    assert "Rollback Poetry" not in category_cache
+
+    async def committed_import():
+        async with UnitOfWork(session):
+            await BookRepository(session).create_book_category("Rollback Poetry")
+
+    asyncio.run(committed_import())
+    assert category_cache.get("Rollback Poetry") == category.category_id
+    category_cache.pop("Rollback Poetry")
+
+    print("✅ Catalogue cache tests passed!")
+
+if __name__ == "__main__":
+    test_nested_operations_commit_once()
+    test_failures_roll_back()
+    test_rolled_back_lookups_are_not_cached()
+    print("\n🎉 All tests passed!")